@@ -0,0 +1,4 @@
+# core/__main__.py
+from .cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,186 @@
+# core/aio.py
+"""
+asyncio wrappers around the parsers and savers.
+
+Every file read/write runs in one bounded thread pool, so an event loop (a bot,
+a web handler) stays responsive while files load and save:
+
+  structs = await aio.load_rengoku("rengoku_data.bin")
+  parsed = await aio.load_mhfdat("mhfdat.bin")
+  parsed["monster_rows"][0].base_points = 120
+  await aio.save_mhfdat("mhfdat.bin", "out/mhfdat.bin", parsed)
+
+  async for index, group in aio.spawn_groups("rengoku_data.bin"):
+      ...
+
+  # many files, at most 'limit' in flight
+  async for path, structs in aio.load_many(paths, aio.load_rengoku, limit=8):
+      ...
+
+The pool defaults to DEFAULT_WORKERS threads; configure(max_workers=...) changes
+it (call before the first load, or after shutdown()). The wrapped functions are
+the same ones the editors use, so results are identical to the blocking API.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+DEFAULT_LIMIT = 8
+
+_executor: ThreadPoolExecutor | None = None
+_max_workers = DEFAULT_WORKERS
+_executor_lock = threading.Lock()
+
+
+def configure(*, max_workers: int) -> None:
+    """Set the thread pool size; takes effect when the pool is (re)created."""
+    global _max_workers
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    _max_workers = max_workers
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_max_workers, thread_name_prefix="road-io")
+        return _executor
+
+
+def shutdown(wait: bool = True) -> None:
+    """Stop the pool (it is recreated on the next call)."""
+    global _executor
+    with _executor_lock:
+        pool, _executor = _executor, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
+
+
+async def run_io(fn: Callable, *args, **kwargs):
+    """Run a blocking call in the shared pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_pool(), functools.partial(fn, *args, **kwargs))
+
+
+# ----------------------------
+# Loads
+# ----------------------------
+
+async def load_rengoku(path):
+    """parse_rengoku_data(): [spawn_tables, floor_stats, multi_def, spawn_tables_solo, floor_stats_solo, solo_def]."""
+    from .io import parse_rengoku_data
+    structs = await run_io(parse_rengoku_data, path)
+    if not structs:
+        raise FileNotFoundError(f"{path}: not found")
+    return structs
+
+
+async def load_mhfdat(path) -> dict:
+    from .mhfdat_io import parse_mhfdat
+    return await run_io(parse_mhfdat, path)
+
+
+async def load_catshop(path):
+    from .catshop_io import parse_catshop
+    return await run_io(parse_catshop, path)
+
+
+async def load_medal_shop(path):
+    from .medalshop_io import parse_medal_shop
+    return await run_io(parse_medal_shop, path)
+
+
+async def load_bundle(rengoku_path=None, mhfdat_path=None):
+    """Every editable section of the given files as a json_io.RoadBundle."""
+    from .json_io import bundle_from_files
+    return await run_io(bundle_from_files, rengoku_path, mhfdat_path)
+
+
+# ----------------------------
+# Saves
+# ----------------------------
+
+async def save_rengoku(template_path, output_path, structs) -> None:
+    from .io import save_structs_to_bin
+    await run_io(save_structs_to_bin, template_path, output_path, structs)
+
+
+async def save_mhfdat(template_path, output_path, parsed: dict, **kwargs) -> None:
+    from .mhfdat_io import save_mhfdat as _save
+    await run_io(_save, template_path, output_path, parsed, **kwargs)
+
+
+async def save_catshop(mhfdat_in, mhfdat_out, parsed, *, counters, counter_items_count: int, **kwargs) -> None:
+    from .catshop_io import save_catshop as _save
+    await run_io(_save, mhfdat_in, mhfdat_out, parsed, counters=counters,
+                 counter_items_count=counter_items_count, **kwargs)
+
+
+async def save_medal_shop(mhfdat_in, mhfdat_out, parsed, **kwargs) -> None:
+    from .medalshop_io import save_medal_shop as _save
+    await run_io(_save, mhfdat_in, mhfdat_out, parsed, **kwargs)
+
+
+async def apply_bundle(bundle, **paths) -> None:
+    """json_io.apply_bundle (rengoku_template/out, mhfdat_template/out keywords)."""
+    from .json_io import apply_bundle as _apply
+    await run_io(_apply, bundle, **paths)
+
+
+# ----------------------------
+# Iteration / fan-out
+# ----------------------------
+
+async def spawn_groups(source, *, mode: str = "multi") -> AsyncIterator[tuple[int, list]]:
+    """
+    Yield (group index, [SpawnTable, ...]) for 'multi' or 'solo'. 'source' is a
+    path (loaded off the loop) or parse_rengoku_data() output. Control returns to
+    the loop between groups, so long walks do not starve other tasks.
+    """
+    if mode not in ("multi", "solo"):
+        raise ValueError(f"mode must be 'multi' or 'solo', not {mode!r}")
+    structs = await load_rengoku(source) if isinstance(source, (str, os.PathLike)) else source
+    for index, group in enumerate(structs[0] if mode == "multi" else structs[3]):
+        yield index, group
+        await asyncio.sleep(0)
+
+
+async def load_many(
+    paths: Iterable,
+    loader: Callable[[object], Awaitable] = load_rengoku,
+    *,
+    limit: int = DEFAULT_LIMIT,
+    return_exceptions: bool = False,
+) -> AsyncIterator[tuple[object, object]]:
+    """
+    Load many files with at most 'limit' in flight, yielding (path, result) as each
+    finishes. With return_exceptions=True a failed load yields (path, exception)
+    instead of raising; otherwise the first failure cancels the rest.
+    """
+    if limit < 1:
+        raise ValueError("limit must be >= 1")
+    sem = asyncio.Semaphore(limit)
+
+    async def one(path):
+        async with sem:
+            try:
+                return path, await loader(path)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return path, e
+
+    tasks = [asyncio.ensure_future(one(p)) for p in paths]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            yield await fut
+    finally:
+        for t in tasks:
+            t.cancel()
@@ -0,0 +1,224 @@
+# core/batch.py
+"""
+Batch Excel <-> BIN conversion.
+
+Jobs come from a JSON manifest or a directory scan and run in a process pool:
+  - export: rengoku_data.bin -> .xlsx   (create_excel_from_bin)
+  - import: .xlsx + template.bin -> .bin (export_excel_to_bin)
+
+Manifest layout (paths are relative to the manifest file):
+  {
+    "jobs": [
+      {"bin": "event_a/rengoku_data.bin", "output": "out/event_a.xlsx"},
+      {"workbook": "event_b.xlsx", "template": "base/rengoku_data.bin", "output": "out/event_b.bin"}
+    ]
+  }
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+EXPORT = "export"
+IMPORT = "import"
+
+
+@dataclass
+class BatchJob:
+    kind: str                  # EXPORT or IMPORT
+    source: str                # .bin for export, .xlsx for import
+    output: str
+    template: str | None = None  # required for IMPORT
+
+
+@dataclass
+class BatchResult:
+    job: BatchJob
+    ok: bool
+    seconds: float
+    error: str = ""
+
+
+@dataclass
+class BatchReport:
+    results: list[BatchResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def failed(self) -> list[BatchResult]:
+        return [r for r in self.results if not r.ok]
+
+    def todict(self):
+        return {
+            "seconds": round(self.seconds, 4),
+            "ok": sum(1 for r in self.results if r.ok),
+            "failed": len(self.failed),
+            "jobs": [
+                {
+                    "kind": r.job.kind, "source": r.job.source, "template": r.job.template,
+                    "output": r.job.output, "ok": r.ok, "seconds": round(r.seconds, 4), "error": r.error,
+                }
+                for r in self.results
+            ],
+        }
+
+
+# ----------------------------
+# Job discovery
+# ----------------------------
+
+def load_manifest(manifest_path: str | os.PathLike[str]) -> list[BatchJob]:
+    """Read a JSON manifest into BatchJobs (relative paths resolve against the manifest)."""
+    base = Path(manifest_path).resolve().parent
+    obj = json.loads(Path(manifest_path).read_text(encoding="utf-8"))
+
+    def _p(v):
+        return str((base / v).resolve()) if v else None
+
+    jobs = []
+    for i, e in enumerate(obj.get("jobs", [])):
+        if "bin" in e:
+            out = e.get("output") or str(Path(e["bin"]).with_suffix(".xlsx"))
+            jobs.append(BatchJob(EXPORT, _p(e["bin"]), _p(out)))
+        elif "workbook" in e:
+            if not e.get("template") or not e.get("output"):
+                raise ValueError(f"Manifest job {i}: import needs 'template' and 'output'")
+            jobs.append(BatchJob(IMPORT, _p(e["workbook"]), _p(e["output"]), _p(e["template"])))
+        else:
+            raise ValueError(f"Manifest job {i}: expected a 'bin' or 'workbook' key")
+    return jobs
+
+
+def jobs_from_directory(
+    directory: str | os.PathLike[str],
+    *,
+    template: str | os.PathLike[str] | None = None,
+    out_dir: str | os.PathLike[str] | None = None,
+    on_skip: Callable[[Path, str], None] | None = None,
+) -> list[BatchJob]:
+    """
+    Scan a directory (non-recursive):
+      - every rengoku_data *.bin becomes an export to <out_dir>/<stem>.xlsx
+      - every *.xlsx becomes an import to <out_dir>/<stem>.bin when a template is given
+    Other *.bin files (mhfdat.bin, unknown data) are skipped; on_skip(path, reason) is called for each.
+    """
+    from .bininfo import RENGOKU, detect_file_kind
+
+    src = Path(directory)
+    dst = Path(out_dir) if out_dir else src
+    template_path = Path(template).resolve() if template else None
+    jobs = []
+    for p in sorted(src.iterdir()):
+        if not p.is_file():
+            continue
+        suffix = p.suffix.lower()
+        if suffix == ".bin" and (template_path is None or p.resolve() != template_path):
+            kind = detect_file_kind(p)
+            if kind != RENGOKU:
+                if on_skip:
+                    on_skip(p, f"{kind} file, not rengoku_data" if kind else "not a rengoku_data file")
+                continue
+            jobs.append(BatchJob(EXPORT, str(p), str(dst / f"{p.stem}.xlsx")))
+        elif suffix == ".xlsx" and template_path is not None and not p.name.startswith("~$"):
+            jobs.append(BatchJob(IMPORT, str(p), str(dst / f"{p.stem}.bin"), str(template_path)))
+    return jobs
+
+
+# ----------------------------
+# Execution
+# ----------------------------
+
+def run_job(job: BatchJob) -> BatchResult:
+    """Run one conversion; errors are captured in the result, never raised."""
+    start = time.perf_counter()
+    try:
+        from .excel import create_excel_from_bin, export_excel_to_bin
+        Path(job.output).parent.mkdir(parents=True, exist_ok=True)
+        if job.kind == EXPORT:
+            from .io import parse_rengoku_data
+            structs = parse_rengoku_data(job.source)
+            if not structs:
+                raise ValueError("Failed to parse Rengoku data")
+            create_excel_from_bin(structs, job.output)
+        elif job.kind == IMPORT:
+            export_excel_to_bin(job.source, job.output, job.template)
+        else:
+            raise ValueError(f"Unknown job kind {job.kind!r}")
+    except Exception as e:
+        return BatchResult(job, False, time.perf_counter() - start, f"{type(e).__name__}: {e}")
+    return BatchResult(job, True, time.perf_counter() - start)
+
+
+def run_batch(
+    jobs: Iterable[BatchJob],
+    *,
+    workers: int | None = None,
+    on_result: Callable[[BatchResult], None] | None = None,
+) -> BatchReport:
+    """
+    Run jobs in a process pool (workers=None -> os.cpu_count(); workers=1 runs inline).
+    Results keep the input order; on_result is called as each job finishes.
+    """
+    jobs = list(jobs)
+    start = time.perf_counter()
+    results: list[BatchResult | None] = [None] * len(jobs)
+
+    if workers == 1 or len(jobs) <= 1:
+        for i, job in enumerate(jobs):
+            results[i] = run_job(job)
+            if on_result:
+                on_result(results[i])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(run_job, job): i for i, job in enumerate(jobs)}
+            for fut in as_completed(futures):
+                i = futures[fut]
+                try:
+                    res = fut.result()
+                except Exception as e:  # worker crashed / unpicklable result
+                    res = BatchResult(jobs[i], False, 0.0, f"{type(e).__name__}: {e}")
+                results[i] = res
+                if on_result:
+                    on_result(res)
+
+    return BatchReport(results=results, seconds=time.perf_counter() - start)
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m core.batch", description="Batch Excel <-> BIN conversion")
+    src = ap.add_mutually_exclusive_group(required=True)
+    src.add_argument("--manifest", help="JSON manifest of jobs")
+    src.add_argument("--dir", help="directory of .bin (export) and/or .xlsx (import) files")
+    ap.add_argument("--template", help="template rengoku_data.bin for .xlsx imports (with --dir)")
+    ap.add_argument("--out-dir", help="output directory (with --dir; default: alongside sources)")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--report", help="write the JSON report here")
+    args = ap.parse_args(argv)
+
+    if args.manifest:
+        jobs = load_manifest(args.manifest)
+    else:
+        jobs = jobs_from_directory(args.dir, template=args.template, out_dir=args.out_dir,
+                                   on_skip=lambda p, reason: print(f"[skip]             {p}: {reason}"))
+
+    def _print(r: BatchResult):
+        status = "ok  " if r.ok else "FAIL"
+        print(f"[{status}] {r.seconds:7.3f}s  {r.job.kind:6}  {r.job.source} -> {r.job.output}"
+              + (f"\n        {r.error}" if r.error else ""))
+
+    report = run_batch(jobs, workers=args.workers, on_result=_print)
+    print(f"{len(report.results) - len(report.failed)}/{len(report.results)} succeeded in {report.seconds:.2f}s")
+    if args.report:
+        Path(args.report).write_text(json.dumps(report.todict(), indent=2), encoding="utf-8")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
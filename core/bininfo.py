@@ -0,0 +1,207 @@
+# core/bininfo.py
+"""
+File type detection and structural summaries for rengoku_data.bin / mhfdat.bin.
+
+Works on raw bytes only (no parsing into dataclasses), so it is cheap enough to
+run over whole archives. Each inspect_* returns a plain dict:
+  {"kind": ..., "size": ..., <section counts / pointers>, "problems": [...], "warnings": [...]}
+"problems" are structural faults (bad signature, pointer out of bounds) that make
+the editors' parsers fail or read garbage; "warnings" are inconsistencies the
+game may tolerate (e.g. a counter that disagrees with its table).
+"""
+from __future__ import annotations
+
+import os
+import struct
+
+from .mhfdat_io import PTR_MONSTER_DATA, PTR_COUNTERS, MONSTER_BLOCK_SIZE
+from .catshop_io import POINTER_OFFSET_B10, ENTRY_PACK as CATSHOP_PACK, ENTRY_SIZE as CATSHOP_SIZE, SENTINEL
+from .medalshop_io import POINTER_OFFSET_MEDAL, EXTRA_POINTER_OFFSET, TOWER_SIZE
+
+RENGOKU = "rengoku"
+MHFDAT = "mhfdat"
+
+MHFDAT_SIGNATURE = ((0x0, 0x1A66686D), (0x4, 0x59), (0xC, 0xBC8))
+ROAD_HEADERS = (("multi", 0x14), ("solo", 0x2C))
+SPAWN_SIZE = 32
+FLOOR_SIZE = 24
+MONSTER_ROW_SIZE = 16
+MEDAL_COUNTER_INDEX = 7   # u16 index of MedalShopEntries in the extra counters block
+
+# sanity limits for sniffing (real files are far below these)
+MAX_ROAD_COUNT = 0x10000
+# leading bytes detect_kind() looks at: the mhfdat signature words and both road headers
+DETECT_BYTES = 0x44
+
+
+def _u32(data, off: int) -> int:
+    return struct.unpack_from("<I", data, off)[0]
+
+
+def _in_bounds(size: int, off: int, length: int) -> bool:
+    return 0 <= off and off + length <= size
+
+
+def _has_mhfdat_signature(data) -> bool:
+    return len(data) >= 0x10 and all(_u32(data, off) == v for off, v in MHFDAT_SIGNATURE)
+
+
+def _looks_like_rengoku(data, size: int) -> bool:
+    if size < DETECT_BYTES or len(data) < DETECT_BYTES:
+        return False
+    for _mode, off in ROAD_HEADERS:
+        floors, _spawn_count, tables, floor_ptr, table_ptrs, count_ptrs = struct.unpack_from("<6I", data, off)
+        if floors > MAX_ROAD_COUNT or tables > MAX_ROAD_COUNT:
+            return False
+        if not (_in_bounds(size, floor_ptr, floors * FLOOR_SIZE)
+                and _in_bounds(size, table_ptrs, tables * 4)
+                and _in_bounds(size, count_ptrs, tables * 4)):
+            return False
+    return True
+
+
+def detect_kind(data, size: int | None = None) -> str | None:
+    """RENGOKU, MHFDAT or None. mhfdat is recognised by its signature, rengoku by a consistent header.
+
+    `data` may be just the first DETECT_BYTES of the file when `size` gives the full file size
+    (the rengoku header pointers are bounds-checked against it).
+    """
+    if _has_mhfdat_signature(data):
+        return MHFDAT
+    if _looks_like_rengoku(data, len(data) if size is None else size):
+        return RENGOKU
+    return None
+
+
+def detect_file_kind(path) -> str | None:
+    """detect_kind() for a file on disk, reading only its first DETECT_BYTES."""
+    with open(path, "rb") as f:
+        return detect_kind(f.read(DETECT_BYTES), os.fstat(f.fileno()).st_size)
+
+
+# ----------------------------
+# rengoku_data.bin
+# ----------------------------
+
+def inspect_rengoku(data) -> dict:
+    size = len(data)
+    info = {"kind": RENGOKU, "size": size, "problems": [], "warnings": []}
+    if size < 0x44:
+        info["problems"].append(f"file too small for road headers ({size} bytes)")
+        return info
+    for mode, off in ROAD_HEADERS:
+        floors, spawn_count, tables, floor_ptr, table_ptrs, count_ptrs = struct.unpack_from("<6I", data, off)
+        sec = {"header": off, "floors": floors, "groups": tables, "entries": 0,
+               "floor_ptr": floor_ptr, "table_ptrs": table_ptrs, "count_ptrs": count_ptrs}
+        info[mode] = sec
+        where = f"{mode} header @0x{off:X}"
+        if spawn_count != tables:
+            info["warnings"].append(f"{where}: SpawnCountCount {spawn_count} != SpawnTablePointersCount {tables}")
+        if not _in_bounds(size, floor_ptr, floors * FLOOR_SIZE):
+            info["problems"].append(f"{where}: floor stats 0x{floor_ptr:X} (+{floors}x{FLOOR_SIZE}) out of bounds")
+        if not _in_bounds(size, table_ptrs, tables * 4) or not _in_bounds(size, count_ptrs, tables * 4):
+            info["problems"].append(f"{where}: spawn table pointer/count arrays out of bounds")
+            continue
+        for g in range(tables):
+            ptr = _u32(data, table_ptrs + g * 4)
+            count = _u32(data, count_ptrs + g * 4)
+            sec["entries"] += count
+            if not _in_bounds(size, ptr, count * SPAWN_SIZE):
+                info["problems"].append(f"{mode} group {g}: table 0x{ptr:X} (+{count}x{SPAWN_SIZE}) out of bounds")
+    return info
+
+
+# ----------------------------
+# mhfdat.bin
+# ----------------------------
+
+def inspect_mhfdat(data) -> dict:
+    size = len(data)
+    info = {"kind": MHFDAT, "size": size, "problems": [], "warnings": []}
+    problems, warnings = info["problems"], info["warnings"]
+    if not _has_mhfdat_signature(data):
+        problems.append("bad mhfdat signature")
+        return info
+    if size < POINTER_OFFSET_MEDAL + 4 or size < PTR_MONSTER_DATA + 4:
+        problems.append(f"file too small for the pointer table ({size} bytes)")
+        return info
+
+    ptrs = {"monster": _u32(data, PTR_MONSTER_DATA), "counters": _u32(data, PTR_COUNTERS),
+            "catshop": _u32(data, POINTER_OFFSET_B10), "medalshop": _u32(data, POINTER_OFFSET_MEDAL),
+            "extra_counters": _u32(data, EXTRA_POINTER_OFFSET)}
+    info["pointers"] = ptrs
+
+    # Monster points: rows until id == 0 or > 176, at most one 4 KiB block (as parse_mhfdat)
+    rows = 0
+    if not _in_bounds(size, ptrs["monster"], MONSTER_ROW_SIZE):
+        problems.append(f"monster data pointer 0x{ptrs['monster']:X} out of bounds")
+    else:
+        pos, end = ptrs["monster"], min(size, ptrs["monster"] + MONSTER_BLOCK_SIZE)
+        while pos + MONSTER_ROW_SIZE <= end:
+            em = struct.unpack_from("<H", data, pos)[0]
+            if em == 0 or em > 176:
+                break
+            rows += 1
+            pos += MONSTER_ROW_SIZE
+    info["monster_rows"] = rows
+
+    counters = None
+    if not _in_bounds(size, ptrs["counters"], 10):
+        problems.append(f"counters pointer 0x{ptrs['counters']:X} out of bounds")
+    else:
+        counters = struct.unpack_from("<5H", data, ptrs["counters"])
+        info["counters"] = dict(zip(("unk1", "unk2", "unk3", "unk4", "RoadEntries"), counters))
+        if counters[4] != rows:
+            warnings.append(f"RoadEntries {counters[4]} != {rows} monster rows")
+
+    # Cat shop: rows while unk1 == SENTINEL
+    cat_rows = cat_items = 0
+    if ptrs["catshop"] and not _in_bounds(size, ptrs["catshop"], CATSHOP_SIZE):
+        problems.append(f"cat shop pointer 0x{ptrs['catshop']:X} out of bounds")
+    elif ptrs["catshop"]:
+        pos = ptrs["catshop"]
+        while pos + CATSHOP_SIZE <= size:
+            item, unk1, _p1, item2, _unk2, _p2 = struct.unpack_from(CATSHOP_PACK, data, pos)
+            if unk1 != SENTINEL:
+                break
+            cat_rows += 1
+            cat_items += (item != 0) + (item2 != 0)
+            pos += CATSHOP_SIZE
+        if counters is not None and counters[2] != cat_items:
+            warnings.append(f"CatShopItemCounter {counters[2]} != {cat_items} items")
+    info["catshop_rows"] = cat_rows
+
+    # Medal shop: rows until item == 0
+    medal_rows = 0
+    if ptrs["medalshop"] and not _in_bounds(size, ptrs["medalshop"], TOWER_SIZE):
+        problems.append(f"medal shop pointer 0x{ptrs['medalshop']:X} out of bounds")
+    elif ptrs["medalshop"]:
+        pos = ptrs["medalshop"]
+        while pos + TOWER_SIZE <= size and struct.unpack_from("<H", data, pos)[0] != 0:
+            medal_rows += 1
+            pos += TOWER_SIZE
+    info["medalshop_rows"] = medal_rows
+    cnt_off = ptrs["extra_counters"] + MEDAL_COUNTER_INDEX * 2
+    if ptrs["extra_counters"] and _in_bounds(size, cnt_off, 2):
+        medal_count = struct.unpack_from("<H", data, cnt_off)[0]
+        info["medalshop_counter"] = medal_count
+        if ptrs["medalshop"] and medal_count != medal_rows:
+            warnings.append(f"MedalShopEntries {medal_count} != {medal_rows} medal rows")
+    elif ptrs["extra_counters"]:
+        problems.append(f"extra counters pointer 0x{ptrs['extra_counters']:X} out of bounds")
+    return info
+
+
+def inspect_bytes(data) -> dict:
+    kind = detect_kind(data)
+    if kind == MHFDAT:
+        return inspect_mhfdat(data)
+    if kind == RENGOKU:
+        return inspect_rengoku(data)
+    return {"kind": None, "size": len(data), "problems": ["unrecognised file (neither mhfdat nor rengoku_data)"],
+            "warnings": []}
+
+
+def inspect_file(path) -> dict:
+    with open(path, "rb") as f:
+        return inspect_bytes(f.read())
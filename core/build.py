@@ -0,0 +1,368 @@
+# core/build.py
+"""
+Incremental builds of road variants from a declarative manifest.
+
+  python -m core.build roads.json [-j 8] [--force] [--dry-run]
+
+Manifest (paths are relative to the manifest file):
+  {
+    "targets": [
+      {"output": "out/event_a/rengoku_data.bin", "template": "base/rengoku_data.bin",
+       "inputs": ["event_a.xlsx", "event_a.edits.json"]},
+      {"output": "out/event_b/rengoku_data.bin", "template": "out/event_a/rengoku_data.bin",
+       "inputs": ["event_b.bhrp"]},
+      {"output": "out/mhfdat.bin", "template": "base/mhfdat.bin", "inputs": ["shops.xlsx"]}
+    ]
+  }
+
+Each target starts from its template and applies its inputs in order. Input types
+are recognised by content: workbook (.xlsx), bundle or edits JSON, binary patch
+(core.patch) or text dump. A target whose template or input is another target's
+output is built after it.
+
+Content hashes of every template/input/output are kept in a state file next to
+the manifest (.<manifest>.state.json). Hashes are cached by (mtime, size), so an
+up-to-date tree is checked without reading any file. Stale targets are rebuilt
+level by level in a process pool, and an output whose bytes did not change is
+not rewritten (its mtime stays put, so nothing downstream looks stale).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+STATE_VERSION = 1
+
+
+@dataclass
+class BuildTarget:
+    output: str
+    template: str
+    inputs: list[str] = field(default_factory=list)
+
+    def sources(self) -> list[str]:
+        return [self.template, *self.inputs]
+
+    def recipe(self) -> str:
+        """Identity of the build steps (paths and order), independent of file contents."""
+        return json.dumps([self.template, self.inputs])
+
+
+@dataclass
+class TargetResult:
+    output: str
+    status: str                    # "built", "unchanged" (rebuilt, same bytes), "fresh", "stale" (dry run), "failed", "skipped"
+    seconds: float = 0.0
+    sha256: str = ""
+    error: str = ""
+
+
+class BuildError(ValueError):
+    pass
+
+
+# ----------------------------
+# Manifest / state
+# ----------------------------
+
+def load_manifest(path) -> list[BuildTarget]:
+    base = Path(path).resolve().parent
+    obj = json.loads(Path(path).read_text(encoding="utf-8"))
+    targets = []
+    for i, t in enumerate(obj.get("targets", [])):
+        try:
+            targets.append(BuildTarget(output=str(base / t["output"]), template=str(base / t["template"]),
+                                       inputs=[str(base / p) for p in t.get("inputs", [])]))
+        except KeyError as ke:
+            raise BuildError(f"Manifest target {i}: missing {ke}") from None
+    outputs = [t.output for t in targets]
+    dupes = sorted({o for o in outputs if outputs.count(o) > 1})
+    if dupes:
+        raise BuildError(f"Several targets write {', '.join(dupes)}")
+    return targets
+
+
+def state_path(manifest) -> Path:
+    p = Path(manifest).resolve()
+    return p.with_name(f".{p.name}.state.json")
+
+
+class HashCache:
+    """sha256 per file, trusted while (mtime_ns, size) is unchanged."""
+
+    def __init__(self, entries: dict | None = None):
+        self.entries: dict[str, list] = entries or {}
+
+    def sha256(self, path: str) -> str | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        cached = self.entries.get(path)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        digest = _sha256_file(path)
+        self.entries[path] = [st.st_mtime_ns, st.st_size, digest]
+        return digest
+
+    def record(self, path: str, digest: str) -> None:
+        st = os.stat(path)
+        self.entries[path] = [st.st_mtime_ns, st.st_size, digest]
+
+
+def _sha256_file(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_state(path: Path) -> dict:
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"version": STATE_VERSION, "files": {}, "targets": {}}
+    if state.get("version") != STATE_VERSION:
+        return {"version": STATE_VERSION, "files": {}, "targets": {}}
+    return state
+
+
+def _save_state(path: Path, state: dict) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(state, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# ----------------------------
+# Dependency order
+# ----------------------------
+
+def build_levels(targets: list[BuildTarget]) -> list[list[BuildTarget]]:
+    """Group targets into levels; every target comes after the targets whose outputs it reads."""
+    by_output = {t.output: t for t in targets}
+    deps = {t.output: {s for s in t.sources() if s in by_output and s != t.output} for t in targets}
+    levels, done = [], set()
+    while len(done) < len(targets):
+        ready = [t for t in targets if t.output not in done and deps[t.output] <= done]
+        if not ready:
+            cycle = sorted(o for o in by_output if o not in done)
+            raise BuildError(f"Dependency cycle between targets: {', '.join(cycle)}")
+        levels.append(ready)
+        done.update(t.output for t in ready)
+    return levels
+
+
+# ----------------------------
+# Building one target (runs in a worker process)
+# ----------------------------
+
+def _input_type(path: str) -> str:
+    from .patch import PATCH_MAGIC
+
+    with open(path, "rb") as f:
+        head = f.read(4)
+    if head == PATCH_MAGIC:
+        return "patch"
+    if head.startswith(b"PK"):
+        return "workbook"
+    if path.lower().endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            fmt = json.load(f).get("format")
+        from .semantic_patch import EDITS_FORMAT
+        return "edits" if fmt == EDITS_FORMAT else "bundle"
+    return "dump"
+
+
+def _apply_input(path: str, kind: str, src: str, dst: str) -> None:
+    """Write src + one input -> dst (kind is the BIN kind: rengoku or mhfdat)."""
+    from .bininfo import RENGOKU
+
+    rengoku = kind == RENGOKU
+    io_args = dict(rengoku_template=src, rengoku_out=dst) if rengoku else dict(mhfdat_template=src, mhfdat_out=dst)
+    itype = _input_type(path)
+    if itype == "patch":
+        from .patch import apply_patch_file, read_patch
+        apply_patch_file(read_patch(path), src, dst)
+    elif itype == "workbook":
+        if rengoku:
+            from .excel import export_excel_to_bin
+            export_excel_to_bin(path, dst, src)
+        else:
+            from .mhfdat_excel import export_excel_to_mhfdat
+            export_excel_to_mhfdat(path, dst, src)
+    elif itype == "edits":
+        from .semantic_patch import replay_files
+        report = replay_files(path, strict=True, **io_args)
+        if not report.ok:
+            raise BuildError(f"{os.path.basename(path)}: {report.format()}")
+    elif itype == "bundle":
+        from .json_io import read_bundle, apply_bundle
+        apply_bundle(read_bundle(path), **io_args)
+    else:
+        from .text_dump import apply_dump
+        apply_dump(path, **io_args)
+    if not os.path.exists(dst):   # the input had nothing for this file
+        shutil.copyfile(src, dst)
+
+
+def build_target(target: BuildTarget) -> TargetResult:
+    """Build one target; the output is only replaced when its bytes change."""
+    from .bininfo import detect_file_kind, RENGOKU, MHFDAT
+
+    start = time.perf_counter()
+    try:
+        kind = detect_file_kind(target.template)
+        if kind not in (RENGOKU, MHFDAT):
+            raise BuildError(f"{target.template}: not a rengoku_data.bin or mhfdat.bin")
+        out_dir = os.path.dirname(target.output) or "."
+        os.makedirs(out_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=out_dir, prefix=".build-") as td:
+            current = target.template
+            for n, inp in enumerate(target.inputs):
+                step = os.path.join(td, f"step{n}.bin")
+                _apply_input(inp, kind, current, step)
+                current = step
+            data = Path(current).read_bytes()
+            digest = hashlib.sha256(data).hexdigest()
+            if os.path.exists(target.output) and _sha256_file(target.output) == digest:
+                return TargetResult(target.output, "unchanged", time.perf_counter() - start, digest)
+            tmp = os.path.join(td, "out.bin")
+            Path(tmp).write_bytes(data)
+            os.replace(tmp, target.output)
+        return TargetResult(target.output, "built", time.perf_counter() - start, digest)
+    except Exception as e:
+        return TargetResult(target.output, "failed", time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+
+
+# ----------------------------
+# Build driver
+# ----------------------------
+
+def _source_hashes(target: BuildTarget, cache: HashCache) -> dict[str, str | None]:
+    return {s: cache.sha256(s) for s in target.sources()}
+
+
+def _is_stale(target: BuildTarget, record: dict | None, hashes: dict, cache: HashCache) -> bool:
+    if record is None or record.get("recipe") != target.recipe() or record.get("sources") != hashes:
+        return True
+    return cache.sha256(target.output) != record.get("output")
+
+
+def build(
+    manifest,
+    *,
+    workers: int | None = None,
+    force: bool = False,
+    dry_run: bool = False,
+    on_result: Callable[[TargetResult], None] | None = None,
+) -> list[TargetResult]:
+    """
+    Bring every target of the manifest up to date. workers=None -> os.cpu_count();
+    workers=1 builds inline. A failed target's dependents are skipped. With dry_run
+    nothing is built; a target is reported "stale" when it, or any target it reads,
+    would be rebuilt.
+    """
+    targets = load_manifest(manifest)
+    spath = state_path(manifest)
+    state = _load_state(spath)
+    cache = HashCache(state["files"])
+    records: dict = state["targets"]
+    failed: set[str] = set()
+    planned: set[str] = set()      # dry_run: outputs that would be rebuilt
+    results: list[TargetResult] = []
+
+    def report(res: TargetResult):
+        results.append(res)
+        if on_result:
+            on_result(res)
+
+    pool = None
+    try:
+        for level in build_levels(targets):
+            stale, hashes = [], {}
+            for t in level:
+                if any(s in failed for s in t.sources()):
+                    failed.add(t.output)
+                    report(TargetResult(t.output, "skipped", error="a target it depends on failed"))
+                    continue
+                if dry_run and any(s in planned for s in t.sources()):
+                    stale.append(t)     # its template/input is about to change (or does not exist yet)
+                    continue
+                missing = [s for s in t.sources() if cache.sha256(s) is None]
+                if missing:
+                    failed.add(t.output)
+                    report(TargetResult(t.output, "failed", error=f"missing {', '.join(missing)}"))
+                    continue
+                hashes[t.output] = _source_hashes(t, cache)
+                if force or _is_stale(t, records.get(t.output), hashes[t.output], cache):
+                    stale.append(t)
+                else:
+                    report(TargetResult(t.output, "fresh", sha256=records[t.output]["output"]))
+            if dry_run:
+                for t in stale:
+                    planned.add(t.output)
+                    report(TargetResult(t.output, "stale"))
+                continue
+            if len(stale) > 1 and workers != 1:
+                pool = pool or ProcessPoolExecutor(max_workers=workers)
+                built = list(pool.map(build_target, stale))
+            else:
+                built = [build_target(t) for t in stale]
+            for t, res in zip(stale, built):
+                if res.status == "failed":
+                    failed.add(t.output)
+                    records.pop(t.output, None)
+                else:
+                    cache.record(t.output, res.sha256)
+                    records[t.output] = {"recipe": t.recipe(), "sources": hashes[t.output], "output": res.sha256}
+                report(res)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if not dry_run:
+            known = {t.output for t in targets}
+            state["targets"] = {k: v for k, v in records.items() if k in known}
+            _save_state(spath, state)
+    return results
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m core.build", description="Incremental road variant builds")
+    ap.add_argument("manifest", help='JSON {"targets": [{"output", "template", "inputs"}, ...]}')
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--force", action="store_true", help="rebuild every target")
+    ap.add_argument("--dry-run", action="store_true", help="only list stale targets")
+    ap.add_argument("-q", "--quiet", action="store_true", help="do not list up-to-date targets")
+    args = ap.parse_args(argv)
+
+    start = time.perf_counter()
+    base = os.path.dirname(os.path.abspath(args.manifest))
+
+    def _print(res: TargetResult):
+        if args.quiet and res.status == "fresh":
+            return
+        name = os.path.relpath(res.output, base)
+        extra = f" ({res.seconds:.2f}s)" if res.seconds else ""
+        print(f"[{res.status:9}] {name}{extra}" + (f": {res.error}" if res.error else ""), flush=True)
+
+    results = build(args.manifest, workers=args.workers, force=args.force, dry_run=args.dry_run, on_result=_print)
+    counts: dict[str, int] = {}
+    for r in results:
+        counts[r.status] = counts.get(r.status, 0) + 1
+    print(", ".join(f"{n} {s}" for s, n in sorted(counts.items())) + f" in {time.perf_counter() - start:.2f}s")
+    return 1 if counts.get("failed") or counts.get("skipped") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,404 @@
+# core/cli.py
+"""
+Headless command line: python -m core <command> ...
+
+  inspect      FILE...                               type, section counts, pointer checks
+  export-xlsx  BIN -o OUT.xlsx                       rengoku or mhfdat (detected) -> workbook
+  import-xlsx  WORKBOOK --template BIN -o OUT.bin    workbook -> BIN (kind follows the template)
+  validate     WORKBOOK [--template BIN]             cell-level report, exit 1 on errors
+  dump         [--rengoku R] [--mhfdat M] -o OUT.txt  canonical text dump
+               --apply DUMP.txt ...                   write a (edited) dump back onto the BINs
+  patch        make BASE EDITED OUT | apply PATCH BASE [-o OUT] | replay EDITS --rengoku/--mhfdat ...
+  compact      MHFDAT --base ORIGINAL -o OUT         drop dead blocks left by repeated saves
+  scan         DIR [--report OUT.json]               parallel integrity scan of a BIN archive
+  watch        SOURCE --template BIN -o OUT | --manifest WATCH.json   rebuild BINs as sources are saved
+  serve        [--rengoku R] [--mhfdat M] --socket PATH | --port N    resident JSON-RPC edit server
+  build        MANIFEST.json [-j N] [--force]        rebuild stale road variants
+  sweep        SPEC.json [-j N]                      one variant BIN per parameter-grid combination
+  tui          [--rengoku R] [--mhfdat M]            terminal editor (curses)
+  items        [QUERY] [--rebuild]                   item ID/name lookup (compiled Items.xlsx catalog)
+
+Only core/ is imported and every command loads its own dependencies (openpyxl,
+numpy) when it runs, so 'inspect' or 'dump' start without them. Qt is never imported.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+
+
+def _kind_of(path) -> str | None:
+    from .bininfo import detect_file_kind
+    return detect_file_kind(path)
+
+
+def _require_kind(path, *kinds) -> str:
+    kind = _kind_of(path)
+    if kind not in kinds:
+        raise SystemExit(f"{path}: not a {' or '.join(kinds)} file")
+    return kind
+
+
+def _fail(msg: str) -> int:
+    print(msg, file=sys.stderr)
+    return 1
+
+
+# ----------------------------
+# Commands
+# ----------------------------
+
+def cmd_inspect(args) -> int:
+    from .bininfo import inspect_file
+
+    results = {p: inspect_file(p) for p in args.files}
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for path, info in results.items():
+            print(f"{path}: {info['kind'] or 'unknown'}, {info['size']} bytes")
+            for mode in ("multi", "solo"):
+                if mode in info:
+                    s = info[mode]
+                    print(f"  {mode:5} {s['floors']} floors, {s['groups']} groups, {s['entries']} spawn entries")
+            if "monster_rows" in info:
+                print(f"  monster points {info['monster_rows']} rows, cat shop {info['catshop_rows']} rows, "
+                      f"medal shop {info['medalshop_rows']} rows")
+            if "counters" in info:
+                print("  counters " + " ".join(f"{k}={v}" for k, v in info["counters"].items()))
+            for p in info["problems"]:
+                print(f"  ERROR   {p}")
+            for w in info["warnings"]:
+                print(f"  warning {w}")
+    return 1 if any(i["problems"] for i in results.values()) else 0
+
+
+def cmd_export_xlsx(args) -> int:
+    from .bininfo import RENGOKU, MHFDAT
+
+    kind = _require_kind(args.bin, RENGOKU, MHFDAT)
+    out = args.output or os.path.splitext(args.bin)[0] + ".xlsx"
+    if kind == RENGOKU:
+        from .io import parse_rengoku_data
+        from .excel import create_excel_from_bin
+        create_excel_from_bin(parse_rengoku_data(args.bin), out)
+    else:
+        from .mhfdat_excel import create_excel_from_mhfdat
+        create_excel_from_mhfdat(args.bin, out)
+    print(f"{args.bin} -> {out}")
+    return 0
+
+
+def cmd_import_xlsx(args) -> int:
+    from .bininfo import RENGOKU, MHFDAT
+    from .validation import WorkbookValidationError
+
+    kind = _require_kind(args.template, RENGOKU, MHFDAT)
+    try:
+        if kind == RENGOKU:
+            from .excel import export_excel_to_bin
+            export_excel_to_bin(args.workbook, args.output, args.template, validate=not args.no_validate)
+        else:
+            from .mhfdat_excel import export_excel_to_mhfdat
+            export_excel_to_mhfdat(args.workbook, args.output, args.template)
+    except WorkbookValidationError as e:
+        return _fail(e.report.format())
+    print(f"{args.workbook} + {args.template} -> {args.output}")
+    return 0
+
+
+def cmd_validate(args) -> int:
+    import openpyxl
+    from .validation import validate_workbook, WorkbookValidationError, ValidationReport
+
+    wb = openpyxl.load_workbook(args.workbook, read_only=True)
+    sheets = set(wb.sheetnames)
+    wb.close()
+
+    from .mhfdat_excel import MONSTER_SHEET, CATSHOP_SHEET, MEDAL_SHEET, read_excel_mhfdat
+    if sheets & {MONSTER_SHEET, CATSHOP_SHEET, MEDAL_SHEET}:
+        try:
+            read_excel_mhfdat(args.workbook)
+            report = ValidationReport()
+        except WorkbookValidationError as e:
+            report = e.report
+    else:
+        report = validate_workbook(args.workbook, args.template)
+
+    if args.json:
+        print(json.dumps(report.todict(), indent=2))
+    else:
+        print(report.format() if report.issues else "OK: no issues")
+    return 0 if report.ok else 1
+
+
+def cmd_dump(args) -> int:
+    from .text_dump import dump_files, apply_dump, DumpParseError
+
+    if args.apply:
+        if not (args.rengoku or args.mhfdat):
+            return _fail("--apply needs --rengoku and/or --mhfdat templates")
+        try:
+            apply_dump(args.apply,
+                       rengoku_template=args.rengoku,
+                       rengoku_out=args.rengoku_out or args.rengoku,
+                       mhfdat_template=args.mhfdat,
+                       mhfdat_out=args.mhfdat_out or args.mhfdat)
+        except DumpParseError as e:
+            return _fail(str(e))
+        return 0
+    if not (args.rengoku or args.mhfdat):
+        return _fail("give --rengoku and/or --mhfdat")
+    dump_files(args.output or sys.stdout, args.rengoku, args.mhfdat)
+    return 0
+
+
+def cmd_patch(args) -> int:
+    if args.patch_cmd == "make":
+        from .patch import make_patch_files, write_patch
+        patch = make_patch_files(args.base, args.edited)
+        size = write_patch(patch, args.output)
+        print(f"{len(patch.ops)} op(s), {patch.changed_bytes} byte(s) changed, patch is {size} bytes")
+        return 0
+    if args.patch_cmd == "apply":
+        from .patch import apply_patch_file, read_patch, PatchMismatchError
+        try:
+            apply_patch_file(read_patch(args.patch), args.base, args.output)
+        except PatchMismatchError as e:
+            return _fail(str(e))
+        return 0
+    from .semantic_patch import replay_files
+    report = replay_files(args.edits,
+                          rengoku_template=args.rengoku, rengoku_out=args.rengoku_out or args.rengoku,
+                          mhfdat_template=args.mhfdat, mhfdat_out=args.mhfdat_out or args.mhfdat,
+                          force=args.force, strict=args.strict)
+    print(report.format())
+    return 0 if report.ok else 1
+
+
+def compact_mhfdat(path, base, output) -> tuple[int, int]:
+    """
+    Rewrite 'path' as base + each changed section appended once. save_mhfdat /
+    save_catshop / save_medal_shop append a fresh block on every save, so a file saved
+    many times carries dead copies; 'base' is the unmodified client file.
+    Returns (old size, new size).
+    """
+    from .json_io import bundle_from_files, apply_bundle
+
+    before = os.path.getsize(path)
+    bundle = bundle_from_files(mhfdat_path=path)
+    tmp = f"{output}.tmp"
+    try:
+        apply_bundle(bundle, mhfdat_template=base, mhfdat_out=tmp)
+        os.replace(tmp, output)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return before, os.path.getsize(output)
+
+
+def cmd_compact(args) -> int:
+    from .bininfo import RENGOKU, MHFDAT
+
+    kind = _require_kind(args.file, RENGOKU, MHFDAT)
+    if kind == RENGOKU:
+        print(f"{args.file}: rengoku_data.bin is saved in place; nothing to compact")
+        return 0
+    _require_kind(args.base, MHFDAT)
+    before, after = compact_mhfdat(args.file, args.base, args.output or args.file)
+    print(f"{args.file}: {before} -> {after} bytes")
+    return 0
+
+
+def cmd_scan(args) -> int:
+    from .fleet import main as fleet_main
+
+    argv = [args.root] + [a for p in (args.pattern or []) for a in ("--pattern", p)]
+    if args.workers is not None:
+        argv += ["-j", str(args.workers)]
+    if args.report:
+        argv += ["--report", args.report]
+    return fleet_main(argv)
+
+
+def cmd_watch(args) -> int:
+    from .watch import main as watch_main
+
+    argv = [args.source] if args.source else []
+    for flag, value in (("--template", args.template), ("-o", args.output), ("--manifest", args.manifest),
+                        ("--debounce", args.debounce), ("--budget", args.budget)):
+        if value is not None:
+            argv += [flag, str(value)]
+    if args.poll:
+        argv.append("--poll")
+    return watch_main(argv)
+
+
+def cmd_serve(args) -> int:
+    from .server import main as server_main
+
+    argv = []
+    for flag, value in (("--rengoku", args.rengoku), ("--mhfdat", args.mhfdat), ("--socket", args.socket),
+                        ("--port", args.port)):
+        if value is not None:
+            argv += [flag, str(value)]
+    return server_main(argv)
+
+
+def cmd_build(args) -> int:
+    from .build import main as build_main
+
+    argv = [args.manifest] + (["-j", str(args.workers)] if args.workers is not None else [])
+    argv += [flag for flag, on in (("--force", args.force), ("--dry-run", args.dry_run), ("-q", args.quiet)) if on]
+    return build_main(argv)
+
+
+def cmd_sweep(args) -> int:
+    from .sweep import main as sweep_main
+
+    return sweep_main([args.spec] + (["-j", str(args.workers)] if args.workers is not None else []))
+
+
+def cmd_tui(args) -> int:
+    from .tui import main as tui_main
+
+    argv = []
+    for flag, value in (("--rengoku", args.rengoku), ("--mhfdat", args.mhfdat)):
+        if value is not None:
+            argv += [flag, value]
+    return tui_main(argv)
+
+
+def cmd_items(args) -> int:
+    from .items import main as items_main
+
+    return items_main(args.query + (["--rebuild"] if args.rebuild else []))
+
+
+# ----------------------------
+# Parser
+# ----------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m core", description="Blaze Road Editor (headless)")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("inspect", help="file type, section counts and pointer checks")
+    p.add_argument("files", nargs="+")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_inspect)
+
+    p = sub.add_parser("export-xlsx", help="BIN -> Excel workbook")
+    p.add_argument("bin")
+    p.add_argument("-o", "--output")
+    p.set_defaults(func=cmd_export_xlsx)
+
+    p = sub.add_parser("import-xlsx", help="Excel workbook + template BIN -> new BIN")
+    p.add_argument("workbook")
+    p.add_argument("--template", required=True)
+    p.add_argument("-o", "--output", required=True)
+    p.add_argument("--no-validate", action="store_true", help="skip workbook validation (rengoku only)")
+    p.set_defaults(func=cmd_import_xlsx)
+
+    p = sub.add_parser("validate", help="check a workbook before import")
+    p.add_argument("workbook")
+    p.add_argument("--template", help="template rengoku_data.bin (enables table-size checks)")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("dump", help="canonical text dump (or apply one with --apply)")
+    p.add_argument("--rengoku")
+    p.add_argument("--mhfdat")
+    p.add_argument("-o", "--output", help="dump file (default: stdout)")
+    p.add_argument("--apply", metavar="DUMP", help="write this dump onto --rengoku/--mhfdat")
+    p.add_argument("--rengoku-out", help="with --apply (default: overwrite --rengoku)")
+    p.add_argument("--mhfdat-out", help="with --apply (default: overwrite --mhfdat)")
+    p.set_defaults(func=cmd_dump)
+
+    p = sub.add_parser("patch", help="binary patches and semantic edit replay")
+    psub = p.add_subparsers(dest="patch_cmd", required=True)
+    pm = psub.add_parser("make")
+    pm.add_argument("base")
+    pm.add_argument("edited")
+    pm.add_argument("output")
+    pa = psub.add_parser("apply")
+    pa.add_argument("patch")
+    pa.add_argument("base")
+    pa.add_argument("-o", "--output")
+    pr = psub.add_parser("replay", help="replay an edits file exported from the editors")
+    pr.add_argument("edits")
+    pr.add_argument("--rengoku")
+    pr.add_argument("--mhfdat")
+    pr.add_argument("--rengoku-out")
+    pr.add_argument("--mhfdat-out")
+    pr.add_argument("--force", action="store_true")
+    pr.add_argument("--strict", action="store_true")
+    p.set_defaults(func=cmd_patch)
+
+    p = sub.add_parser("compact", help="drop dead blocks from a repeatedly saved mhfdat.bin")
+    p.add_argument("file")
+    p.add_argument("--base", required=True, help="unmodified mhfdat.bin the file was derived from")
+    p.add_argument("-o", "--output", help="default: rewrite FILE")
+    p.set_defaults(func=cmd_compact)
+
+    p = sub.add_parser("scan", help="integrity scan of a directory tree of BINs")
+    p.add_argument("root")
+    p.add_argument("--pattern", action="append", help="glob (default: *.bin; repeatable)")
+    p.add_argument("-j", "--workers", type=int)
+    p.add_argument("--report", help="JSON report path (default: stdout)")
+    p.set_defaults(func=cmd_scan)
+
+    p = sub.add_parser("watch", help="rebuild BINs whenever their workbook / bundle / dump is saved")
+    p.add_argument("source", nargs="?")
+    p.add_argument("--template")
+    p.add_argument("-o", "--output")
+    p.add_argument("--manifest", help='JSON {"watch": [{"source", "template", "output"}, ...]}')
+    p.add_argument("--debounce", type=float)
+    p.add_argument("--budget", type=float, help="warn when a rebuild lands later than this (s)")
+    p.add_argument("--poll", action="store_true", help="poll instead of inotify")
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("serve", help="keep BINs open and serve reads/edits over JSON-RPC")
+    p.add_argument("--rengoku")
+    p.add_argument("--mhfdat")
+    p.add_argument("--socket", help="Unix socket path")
+    p.add_argument("--port", type=int, help="TCP port on 127.0.0.1")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("build", help="incrementally build the targets of a variant manifest")
+    p.add_argument("manifest")
+    p.add_argument("-j", "--workers", type=int)
+    p.add_argument("--force", action="store_true")
+    p.add_argument("--dry-run", action="store_true")
+    p.add_argument("-q", "--quiet", action="store_true")
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser("sweep", help="generate parameter-sweep variants from a grid")
+    p.add_argument("spec")
+    p.add_argument("-j", "--workers", type=int)
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("tui", help="terminal editor for headless machines")
+    p.add_argument("--rengoku")
+    p.add_argument("--mhfdat")
+    p.set_defaults(func=cmd_tui)
+
+    p = sub.add_parser("items", help="look up item IDs / names")
+    p.add_argument("query", nargs="*")
+    p.add_argument("--rebuild", action="store_true")
+    p.set_defaults(func=cmd_items)
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        return _fail(f"error: {e}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,7 @@
 
+import difflib
+import re
+
 from .paths import ROOTDIR
 
 # Optional extra sheet on export: environment variable can override
@@ -28,6 +31,61 @@ MONSTERS = [
     "Costumed_Uruki","Musou_Zerureusu","PSO2_Rappy","King_Shakalaka"
 ]
 
+# ----------------------------
+# Monster registry (name -> EM ID)
+# ----------------------------
+
+_MONSTER_KEY_STRIP = re.compile(r"[\s_\-]+")
+
+
+def monster_key(name: str) -> str:
+    """Normalize a monster name for alias lookups ("yian kut-ku" -> "yiankutku")."""
+    return _MONSTER_KEY_STRIP.sub("", name).lower()
+
+
+# Exact names, first occurrence wins (matches the old MONSTERS.index behaviour)
+MONSTER_IDS: dict[str, int] = {}
+# Case-, space-, dash- and underscore-insensitive aliases
+MONSTER_ALIASES: dict[str, int] = {}
+for _em_id, _name in enumerate(MONSTERS):
+    MONSTER_IDS.setdefault(_name, _em_id)
+    MONSTER_ALIASES.setdefault(monster_key(_name), _em_id)
+del _em_id, _name
+_MONSTERS_LOWER = {name.lower(): name for name in MONSTERS}
+
+
+def monster_id(value) -> int:
+    """
+    Resolve a monster reference to its EM ID.
+    Accepts ints, digit strings, exact names and loose aliases ("rathalos", "Yian Kut-Ku").
+    Raises ValueError listing the nearest names when nothing matches.
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)  # numeric cells come back from openpyxl as floats
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid monster reference {value!r}")
+    text = value.strip()
+    if text.isdigit():
+        return int(text)
+    em_id = MONSTER_IDS.get(text)
+    if em_id is not None:
+        return em_id
+    em_id = MONSTER_ALIASES.get(monster_key(text))
+    if em_id is not None:
+        return em_id
+    close = difflib.get_close_matches(text.lower(), _MONSTERS_LOWER, n=3, cutoff=0.6)
+    hint = f" Did you mean: {', '.join(_MONSTERS_LOWER[c] for c in close)}?" if close else ""
+    raise ValueError(f"Unknown monster name {text!r}.{hint}")
+
+
+# Known SpawnTable.MapZoneOverride ("Bonus Spawns") values; 0xFFFFFFFF = stage default
+MAP_ZONE_OVERRIDES = (0xFFFFFFFF, 0, 1, 2, 3, 4, 5)
+# Known SpawnTable.AdditionalFlag values
+ADDITIONAL_FLAGS = (0, 2, 4, 6, 8)
+
+
 NOTES_TEXT = (
     "Musou Variants\n"
     "--------------\n"
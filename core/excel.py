@@ -2,11 +2,14 @@
 
 import os
 import re
+from dataclasses import dataclass
+
 import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 
 from .constants import MONSTERS, DETAILS_XLSX_DEFAULT
+from .models import whole_number
 
 
 # ----------------------------
@@ -58,8 +61,49 @@ GROUP_HINTS = {
 RE_GROUP = re.compile(r"^\s*--\s*Group\s+(\d+)\s*--(?:\s+.*)?$", re.IGNORECASE)
 
 
+# Named styles registered once per workbook and applied by name, so openpyxl stores
+# one shared style record instead of de-duplicating per-cell copies on save. The
+# row helpers register them on first use in a workbook; data rows are left unstyled.
+# Benchmark: python -m src.excel_bench
+STYLE_HEADER = "road_header"
+STYLE_GROUP  = "road_group"
+
+_NAMED_STYLES = {
+    STYLE_HEADER: dict(font=WHITE_FONT, fill=HEADER_FILL, alignment=CENTER, border=THIN_BORDER),
+    STYLE_GROUP:  dict(font=WHITE_FONT, fill=GROUP_FILL, alignment=LEFT, border=THIN_BORDER),
+}
+
+
+def register_named_styles(wb):
+    """Add the road named styles to a workbook (idempotent). Returns the workbook."""
+    existing = set(wb.named_styles)
+    for name, attrs in _NAMED_STYLES.items():
+        if name not in existing:
+            wb.add_named_style(NamedStyle(name=name, **attrs))
+    wb._road_styles = True
+    return wb
+
+
+def _ensure_named_styles(wb) -> None:
+    """register_named_styles() unless this workbook already went through it (one attribute check per row)."""
+    if not getattr(wb, "_road_styles", False):
+        register_named_styles(wb)
+
+
+def _style_row(ws, row_idx: int, style: str, max_col: int | None = None):
+    """Apply a registered named style to every cell of a row."""
+    if max_col is None:
+        max_col = ws.max_column
+    for col in range(1, max_col + 1):
+        ws.cell(row=row_idx, column=col).style = style
+
+
 def _style_header_row(ws, row_idx: int, bold=True, center=True):
     """Apply a consistent header style to a single row."""
+    if bold and center:
+        _ensure_named_styles(ws.parent)
+        _style_row(ws, row_idx, STYLE_HEADER)
+        return
     max_col = ws.max_column
     for col in range(1, max_col + 1):
         c = ws.cell(row=row_idx, column=col)
@@ -71,16 +115,13 @@ def _style_header_row(ws, row_idx: int, bold=True, center=True):
 
 def _style_group_header(ws, row_idx: int):
     """Style a group header row (the '-- Group N -- ...' row)."""
+    _ensure_named_styles(ws.parent)
     max_col = max(1, ws.max_column)
     for col in range(1, max_col + 1):
         c = ws.cell(row=row_idx, column=col)
-        if col == 1:
-            c.alignment = LEFT
-            c.font = WHITE_FONT
-        else:
+        if col > 1:
             c.value = None  # keep single banner in col A
-        c.fill = GROUP_FILL
-        c.border = THIN_BORDER
+        c.style = STYLE_GROUP
 
 
 def _autosize_columns(ws, min_width=10, padding=2):
@@ -173,7 +214,7 @@ def create_excel_from_bin(rengoku_data, output_file):
       - Optional Details sheet (copied from external xlsx)
     """
     spawn_tables, floor_stats, _, _, _, _ = rengoku_data
-    wb = openpyxl.Workbook()
+    wb = register_named_styles(openpyxl.Workbook())
 
     # ---- Floor Stats
     ws_fs = wb.active
@@ -312,27 +353,31 @@ def create_excel_from_bin(rengoku_data, output_file):
 # Import
 # ----------------------------
 
-def export_excel_to_bin(excel_file, output_file, template_file):
-    """
-    Read a workbook that was exported by create_excel_from_bin()
-    and write changes back into a new BIN, using the template_file as base.
-    """
-    wb = openpyxl.load_workbook(excel_file, data_only=True)
+@dataclass
+class SheetRow:
+    """One data row read back from a sheet, keeping its coordinates for error reports."""
+    row: int                 # 1-based worksheet row
+    values: dict             # header -> cell value
+    columns: dict            # header -> 1-based column (shared by every row of a group)
+
 
-    # ---- Parse Spawn Table sheet (robust group header detection)
-    sp_ws = wb["Spawn Table"]
+def read_spawn_sheet(ws) -> list[list[SheetRow]]:
+    """Parse the 'Spawn Table' sheet into groups of rows (robust group header detection)."""
     tables = []
     spawn_group = []
     expecting_headers = False
     headers = []
+    columns = {}
 
-    for row in sp_ws.iter_rows(values_only=True):
+    for row_idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
+        if not row:
+            continue
         first = row[0]
 
         # Detect group banner regardless of extra text after "-- Group N --"
         if isinstance(first, str) and RE_GROUP.match(first.strip()):
             # close previous group
-            if spawn_group:
+            if spawn_group or headers:
                 tables.append(spawn_group)
                 spawn_group = []
             expecting_headers = True
@@ -345,6 +390,7 @@ def export_excel_to_bin(excel_file, output_file, template_file):
             if first is None or (isinstance(first, str) and not first.strip()):
                 continue
             headers = [cell for cell in row]
+            columns = {h: ci for ci, h in enumerate(headers, start=1) if h is not None}
             expecting_headers = False
             continue
 
@@ -354,59 +400,88 @@ def export_excel_to_bin(excel_file, output_file, template_file):
                 continue
             # Build dict for the row using headers
             item = {k: v for k, v in zip(headers, row)}
-            spawn_group.append(item)
+            spawn_group.append(SheetRow(row_idx, item, columns))
 
-    if spawn_group:
+    if spawn_group or headers:
         tables.append(spawn_group)
+    return tables
+
 
-    # ---- Parse Floor Stats
-    fs_ws = wb["Floor Stats"]
+def read_floor_sheet(ws) -> list[SheetRow]:
+    """Parse the 'Floor Stats' sheet (first row is the header)."""
     stats = []
     headers = []
-    for i, row in enumerate(fs_ws.iter_rows(values_only=True)):
-        if i == 0:
+    columns = {}
+    for row_idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
+        if row_idx == 1:
             headers = [cell for cell in row]
+            columns = {h: ci for ci, h in enumerate(headers, start=1) if h is not None}
             continue
         if all(cell is None for cell in row):
             continue
-        stat = {k: v for k, v in zip(headers, row)}
-        stats.append(stat)
+        stats.append(SheetRow(row_idx, {k: v for k, v in zip(headers, row)}, columns))
+    return stats
 
-    # ---- Load template & apply changes
-    from .io import parse_rengoku_data
-    structs = parse_rengoku_data(template_file)
-    with open(template_file, "rb") as f:
-        data = bytearray(f.read())
 
-    # Update spawn tables
-    rengoku_tables = structs[0]
+def apply_spawn_rows(rengoku_tables, tables: list[list[SheetRow]], data: bytearray) -> None:
+    """Copy 'Spawn Table' rows onto the template's spawn structs and into 'data'."""
     # Zip will stop at the shortest; this prevents index errors if user adds/removes groups
     for table, group in zip(rengoku_tables, tables):
         for i, spawn in enumerate(table):
             if i >= len(group):
                 break
             # Let the Spawn object read values from the row dict (names must match the exported headers)
-            spawn.reset_values_from_row(MONSTERS, group[i])
+            spawn.reset_values_from_row(MONSTERS, group[i].values)
             data[spawn.offset:spawn.offset + 32] = spawn.serialize()
 
-    # Update floor stats
-    floor_stats = structs[1]
-    for i, stat in enumerate(stats):
+
+def apply_floor_rows(floor_stats, stats: list[SheetRow], data: bytearray) -> None:
+    """Copy 'Floor Stats' rows onto the template's floor structs and into 'data'."""
+    for i, sheet_row in enumerate(stats):
         if i >= len(floor_stats):
             break
+        stat = sheet_row.values
         fs = floor_stats[i]
         try:
-            fs.FloorNumber   = int(stat.get("FloorNumber", fs.FloorNumber))
-            fs.SpawnTableUsed= int(stat.get("SpawnTableUsed", fs.SpawnTableUsed))
-            fs.Unk0          = int(stat.get("Unk0", fs.Unk0))
+            fs.FloorNumber   = whole_number(stat.get("FloorNumber", fs.FloorNumber))
+            fs.SpawnTableUsed= whole_number(stat.get("SpawnTableUsed", fs.SpawnTableUsed))
+            fs.Unk0          = whole_number(stat.get("Unk0", fs.Unk0))
             fs.PointMulti1   = float(stat.get("PointMulti1", fs.PointMulti1))
             fs.PointMulti2   = float(stat.get("PointMulti2", fs.PointMulti2))
-            fs.FinalLoop     = int(stat.get("FinalLoop", fs.FinalLoop))
+            fs.FinalLoop     = whole_number(stat.get("FinalLoop", fs.FinalLoop))
         except Exception:
             # If any conversion fails, keep original values for that row
             pass
         data[fs.offset:fs.offset + 24] = fs.serialize()
 
+
+def export_excel_to_bin(excel_file, output_file, template_file, *, validate: bool = True):
+    """
+    Read a workbook that was exported by create_excel_from_bin()
+    and write changes back into a new BIN, using the template_file as base.
+    With validate=True every cell is checked first and a WorkbookValidationError
+    listing all problems is raised before anything is written.
+    """
+    wb = openpyxl.load_workbook(excel_file, data_only=True)
+    tables = read_spawn_sheet(wb["Spawn Table"])
+    stats = read_floor_sheet(wb["Floor Stats"])
+
+    # ---- Load template & apply changes
+    from .io import parse_rengoku_data
+    structs = parse_rengoku_data(template_file)
+
+    if validate:
+        from .validation import validate_rows, WorkbookValidationError
+        report = validate_rows(tables, stats, structs)
+        if report.errors:
+            raise WorkbookValidationError(report)
+
+    with open(template_file, "rb") as f:
+        data = bytearray(f.read())
+
+    apply_spawn_rows(structs[0], tables, data)
+    apply_floor_rows(structs[1], stats, data)
+
     # ---- Write out the new BIN
     with open(output_file, "wb") as out_f:
         out_f.write(data)
@@ -0,0 +1,188 @@
+# core/fleet.py
+"""
+Integrity scan for directory trees of rengoku_data.bin / mhfdat.bin copies.
+
+Each file is read once in a worker process: SHA-256, type sniffing and the
+structural checks from core.bininfo (signature, pointer bounds, counters vs
+tables). The report groups files with identical content:
+
+  {
+    "root": "...", "seconds": 1.2, "files": 412, "bytes": 1234567,
+    "kinds": {"mhfdat": 300, "rengoku": 110, "unknown": 2},
+    "groups": [
+      {"sha256": "...", "kind": "mhfdat", "version": "0x59/0xBC8", "size": 5928,
+       "paths": ["env_a/mhfdat.bin", "env_b/mhfdat.bin"], "problems": [], "warnings": []}
+    ],
+    "errors": [{"path": "...", "error": "PermissionError: ..."}]
+  }
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .bininfo import MHFDAT, RENGOKU, inspect_bytes
+
+DEFAULT_PATTERNS = ("*.bin",)
+
+
+@dataclass
+class FileScan:
+    path: str
+    size: int = 0
+    sha256: str = ""
+    kind: str | None = None
+    version: str = ""
+    problems: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    error: str = ""
+
+
+def _version(kind: str | None, data) -> str:
+    """Header words that identify the file build (mhfdat: signature words 2/3; rengoku: leading tag)."""
+    if kind == MHFDAT:
+        return "0x{:X}/0x{:X}".format(*struct.unpack_from("<I", data, 0x4), *struct.unpack_from("<I", data, 0xC))
+    if kind == RENGOKU and len(data) >= 4:
+        tag = bytes(data[:4])
+        return tag.decode("ascii") if tag.isascii() and tag.decode("ascii").isprintable() else tag.hex()
+    return ""
+
+
+def scan_file(path: str) -> FileScan:
+    """Hash and check one file; I/O errors are captured, never raised."""
+    res = FileScan(path)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        res.error = f"{type(e).__name__}: {e}"
+        return res
+    res.size = len(data)
+    res.sha256 = hashlib.sha256(data).hexdigest()
+    info = inspect_bytes(data)
+    res.kind = info["kind"]
+    res.version = _version(res.kind, data)
+    res.problems = info["problems"]
+    res.warnings = info["warnings"]
+    return res
+
+
+def find_files(root, patterns: Iterable[str] = DEFAULT_PATTERNS) -> list[str]:
+    """Every file under root matching any pattern (recursive, sorted, symlinked dirs not followed)."""
+    root = Path(root)
+    found = set()
+    for pattern in patterns:
+        found.update(str(p) for p in root.rglob(pattern) if p.is_file())
+    return sorted(found)
+
+
+@dataclass
+class FleetReport:
+    root: str
+    scans: list[FileScan]
+    seconds: float = 0.0
+
+    def groups(self) -> list[dict]:
+        by_hash: dict[str, list[FileScan]] = {}
+        for s in self.scans:
+            if not s.error:
+                by_hash.setdefault(s.sha256, []).append(s)
+        groups = []
+        for digest, members in by_hash.items():
+            first = members[0]
+            groups.append({"sha256": digest, "kind": first.kind or "unknown", "version": first.version,
+                           "size": first.size, "paths": [self._rel(s.path) for s in members],
+                           "problems": first.problems, "warnings": first.warnings})
+        # largest groups first, then by kind/path for a stable report
+        groups.sort(key=lambda g: (-len(g["paths"]), g["kind"], g["paths"][0]))
+        return groups
+
+    def _rel(self, path: str) -> str:
+        try:
+            return os.path.relpath(path, self.root)
+        except ValueError:   # different drive on Windows
+            return path
+
+    @property
+    def broken(self) -> list[FileScan]:
+        return [s for s in self.scans if s.problems or s.error]
+
+    def todict(self) -> dict:
+        kinds: dict[str, int] = {}
+        for s in self.scans:
+            if not s.error:
+                kinds[s.kind or "unknown"] = kinds.get(s.kind or "unknown", 0) + 1
+        return {
+            "root": self.root,
+            "seconds": round(self.seconds, 4),
+            "files": len(self.scans),
+            "bytes": sum(s.size for s in self.scans),
+            "kinds": kinds,
+            "groups": self.groups(),
+            "errors": [{"path": self._rel(s.path), "error": s.error} for s in self.scans if s.error],
+        }
+
+
+def scan_tree(
+    root,
+    *,
+    patterns: Iterable[str] = DEFAULT_PATTERNS,
+    workers: int | None = None,
+    on_result: Callable[[FileScan], None] | None = None,
+) -> FleetReport:
+    """
+    Scan every matching file under root. workers=None -> os.cpu_count(); workers=1 runs inline.
+    Results keep path order; on_result is called as each file finishes.
+    """
+    start = time.perf_counter()
+    paths = find_files(root, patterns)
+    if workers == 1 or len(paths) <= 1:
+        scans = []
+        for p in paths:
+            scans.append(scan_file(p))
+            if on_result:
+                on_result(scans[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # small files: batch them so per-task IPC does not dominate
+            chunk = max(1, min(32, len(paths) // ((workers or os.cpu_count() or 1) * 4)))
+            scans = []
+            for res in pool.map(scan_file, paths, chunksize=chunk):
+                scans.append(res)
+                if on_result:
+                    on_result(res)
+    return FleetReport(root=str(root), scans=scans, seconds=time.perf_counter() - start)
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m core.fleet", description="Integrity scan of BIN archives")
+    ap.add_argument("root", help="directory to scan recursively")
+    ap.add_argument("--pattern", action="append", help="glob for files to scan (default: *.bin; repeatable)")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--report", help="write the JSON report here (default: stdout)")
+    args = ap.parse_args(argv)
+
+    report = scan_tree(args.root, patterns=args.pattern or DEFAULT_PATTERNS, workers=args.workers)
+    doc = report.todict()
+    if args.report:
+        Path(args.report).write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        mb = doc["bytes"] / (1 << 20)
+        print(f"{doc['files']} files, {mb:.1f} MiB in {report.seconds:.2f}s "
+              f"({mb / max(report.seconds, 1e-9):.0f} MiB/s), {len(doc['groups'])} distinct, "
+              f"{len(report.broken)} with problems")
+    else:
+        print(json.dumps(doc, indent=2))
+    return 1 if report.broken else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
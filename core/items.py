@@ -0,0 +1,295 @@
+# core/items.py
+"""
+Item ID -> name catalog from asset/Items.xlsx.
+
+  from core.items import load_item_names, item_catalog
+  names = load_item_names()                   # {item_id: name}, shared by the whole process
+  item_catalog().search("great sword")        # [(item_id, name), ...] by word prefix
+
+Parsing Items.xlsx with openpyxl takes most of a second, so it is compiled once
+into a small binary file next to it (.Items.xlsx.catalog, or the temp directory
+when the asset folder is read-only) and recompiled automatically when the xlsx
+changes (size/mtime, then SHA-256 so a touched-but-identical file is not
+re-parsed). The compiled catalog is loaded once per process.
+
+  python -m core.items [QUERY] [--rebuild]
+"""
+from __future__ import annotations
+
+import bisect
+import hashlib
+import os
+import re
+import struct
+import tempfile
+import threading
+from array import array
+from pathlib import Path
+
+from .paths import resource_path
+
+CATALOG_MAGIC = b"RITM"
+CATALOG_VERSION = 1
+# magic, version, xlsx size, xlsx mtime_ns, xlsx sha256, item count
+_HEADER = struct.Struct("<4sHQQ32sI")
+
+_WORD = re.compile(r"[^\W_]+")
+
+_lock = threading.Lock()
+_catalog: ItemCatalog | None = None
+_catalog_key: tuple | None = None
+
+
+class ItemCatalog:
+    """Item names plus a word-prefix search index (built on first search)."""
+
+    def __init__(self, names: dict[int, str]):
+        self.names = names
+        self._words: list[str] | None = None
+        self._word_ids: list[int] = []
+        self._by_name: dict[str, int] | None = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def name(self, item_id: int, default: str = "") -> str:
+        return self.names.get(item_id, default)
+
+    def id_of(self, name: str) -> int | None:
+        """Case-insensitive exact name -> lowest item ID."""
+        if self._by_name is None:
+            self._by_name = item_ids_by_name(self.names)
+        return self._by_name.get(name.strip().lower())
+
+    def _index(self) -> None:
+        pairs = sorted((w, iid) for iid, n in self.names.items() for w in set(_WORD.findall(n.lower())))
+        self._words = [w for w, _ in pairs]
+        self._word_ids = [iid for _, iid in pairs]
+
+    def _prefixed(self, token: str) -> set[int]:
+        lo = bisect.bisect_left(self._words, token)
+        hi = bisect.bisect_left(self._words, token + "\uffff", lo)
+        return set(self._word_ids[lo:hi])
+
+    def search(self, query: str, limit: int | None = 50) -> list[tuple[int, str]]:
+        """
+        Items whose name has a word starting with every word of `query` (case-insensitive),
+        or the item with that ID when `query` is a number. Sorted by ID.
+        """
+        query = query.strip()
+        if not query:
+            return []
+        if query.isdigit():
+            iid = int(query)
+            return [(iid, self.names[iid])] if iid in self.names else []
+        if self._words is None:
+            self._index()
+        tokens = _WORD.findall(query.lower())
+        if not tokens:
+            return []
+        ids = self._prefixed(tokens[0])
+        for t in tokens[1:]:
+            ids &= self._prefixed(t)
+        hits = sorted(ids)[:limit] if limit else sorted(ids)
+        return [(i, self.names[i]) for i in hits]
+
+
+# ----------------------------
+# Items.xlsx
+# ----------------------------
+
+def items_xlsx() -> Path | None:
+    p = Path(resource_path("asset", "Items.xlsx"))
+    if not p.exists():
+        p = Path("asset/Items.xlsx")
+        if not p.exists():
+            return None
+    return p
+
+
+def read_items_xlsx(path) -> dict[int, str]:
+    """
+    Parse item ID -> name from the first sheet of an Items.xlsx.
+    Expected headers include: ID (or ItemID), Name (or ItemName).
+    """
+    try:
+        from openpyxl import load_workbook
+    except Exception:
+        return {}
+
+    try:
+        wb = load_workbook(str(path), read_only=True, data_only=True)
+        ws = wb[wb.sheetnames[0]]
+        headers = { (c.value or "").strip().lower(): idx
+                    for idx, c in enumerate(next(ws.iter_rows(min_row=1, max_row=1))[0:]) }
+        id_idx = None
+        name_idx = None
+        for key, idx in headers.items():
+            if key in ("id", "itemid", "item_id"):
+                id_idx = idx
+            if key in ("name", "itemname", "item_name"):
+                name_idx = idx
+        if id_idx is None or name_idx is None:
+            id_idx, name_idx = 0, 1
+
+        mapping: dict[int, str] = {}
+        for row in ws.iter_rows(min_row=2):
+            try:
+                rid = row[id_idx].value
+                rname = row[name_idx].value
+                if rid is None or rname is None:
+                    continue
+                mapping[int(rid)] = str(rname)
+            except Exception:
+                continue
+        return mapping
+    except Exception:
+        return {}
+
+
+# ----------------------------
+# Compiled catalog
+# ----------------------------
+
+def catalog_paths(xlsx: Path) -> list[Path]:
+    """Where the compiled catalog may live: beside the xlsx, else in the temp directory."""
+    tag = hashlib.sha1(os.fsencode(xlsx.resolve())).hexdigest()[:12]
+    return [xlsx.with_name(f".{xlsx.name}.catalog"), Path(tempfile.gettempdir()) / f"rengoku-items-{tag}.catalog"]
+
+
+def _sha256(path: Path) -> bytes:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def encode_catalog(names: dict[int, str], size: int, mtime_ns: int, sha256: bytes) -> bytes:
+    """Header, then u32 IDs, u16 name lengths and the UTF-8 names back to back."""
+    ids = sorted(names)
+    encoded = [names[i].encode("utf-8")[:0xFFFF] for i in ids]
+    return b"".join((
+        _HEADER.pack(CATALOG_MAGIC, CATALOG_VERSION, size, mtime_ns, sha256, len(ids)),
+        array("I", ids).tobytes(), array("H", map(len, encoded)).tobytes(), *encoded,
+    ))
+
+
+def decode_catalog(data: bytes) -> tuple[dict, dict[int, str]] | None:
+    """({"size", "mtime_ns", "sha256"}, names), or None if `data` is not a catalog of this version."""
+    if len(data) < _HEADER.size:
+        return None
+    magic, version, size, mtime_ns, sha, count = _HEADER.unpack_from(data)
+    if magic != CATALOG_MAGIC or version != CATALOG_VERSION:
+        return None
+    pos = _HEADER.size
+    ids, lens = array("I"), array("H")
+    ids.frombytes(data[pos:pos + 4 * count]); pos += 4 * count
+    lens.frombytes(data[pos:pos + 2 * count]); pos += 2 * count
+    if len(ids) != count or len(lens) != count or pos + sum(lens) != len(data):
+        return None
+    names = {}
+    for iid, n in zip(ids, lens):
+        names[iid] = data[pos:pos + n].decode("utf-8")
+        pos += n
+    return {"size": size, "mtime_ns": mtime_ns, "sha256": sha}, names
+
+
+def _write_catalog(xlsx: Path, data: bytes) -> Path | None:
+    for path in catalog_paths(xlsx):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            return path
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+    return None
+
+
+def compile_catalog(xlsx, *, force: bool = False) -> dict[int, str]:
+    """Names from the compiled catalog of `xlsx`, recompiling it if the xlsx changed (or force)."""
+    xlsx = Path(xlsx)
+    st = xlsx.stat()
+    sha = None
+    if not force:
+        for path in catalog_paths(xlsx):
+            try:
+                decoded = decode_catalog(path.read_bytes())
+            except OSError:
+                continue
+            if decoded is None:
+                continue
+            meta, names = decoded
+            if meta["size"] == st.st_size and meta["mtime_ns"] == st.st_mtime_ns:
+                return names
+            if meta["size"] == st.st_size:
+                sha = sha or _sha256(xlsx)
+                if meta["sha256"] == sha:   # touched, not changed: refresh the stamp only
+                    _write_catalog(xlsx, encode_catalog(names, st.st_size, st.st_mtime_ns, sha))
+                    return names
+    names = read_items_xlsx(xlsx)
+    if names:
+        _write_catalog(xlsx, encode_catalog(names, st.st_size, st.st_mtime_ns, sha or _sha256(xlsx)))
+    return names
+
+
+def item_catalog(*, rebuild: bool = False) -> ItemCatalog:
+    """The process-wide catalog (reloaded if Items.xlsx changed since it was loaded)."""
+    global _catalog, _catalog_key
+    xlsx = items_xlsx()
+    try:
+        st = xlsx.stat() if xlsx else None
+    except OSError:
+        st = None
+    key = (str(xlsx), st.st_size, st.st_mtime_ns) if st else None
+    with _lock:
+        if _catalog is None or key != _catalog_key or rebuild:
+            _catalog = ItemCatalog(compile_catalog(xlsx, force=rebuild) if key else {})
+            _catalog_key = key
+        return _catalog
+
+
+def load_item_names() -> dict[int, str]:
+    """
+    Item ID -> name from asset/Items.xlsx (via the compiled catalog).
+    The dict is shared by every caller in the process: read it, don't modify it.
+    """
+    return item_catalog().names
+
+
+def item_ids_by_name(id_to_name: dict[int, str]) -> dict[str, int]:
+    """Reverse lookup (case-insensitive name -> lowest item ID)."""
+    out: dict[str, int] = {}
+    for iid in sorted(id_to_name):
+        out.setdefault(id_to_name[iid].strip().lower(), iid)
+    return out
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m core.items", description="Item catalog lookup")
+    ap.add_argument("query", nargs="*", help="item ID or words of the name (prefix match)")
+    ap.add_argument("--rebuild", action="store_true", help="recompile the catalog from Items.xlsx")
+    ap.add_argument("--limit", type=int, default=50)
+    args = ap.parse_args(argv)
+
+    catalog = item_catalog(rebuild=args.rebuild)
+    if not catalog:
+        print("Items.xlsx not found or unreadable")
+        return 1
+    if not args.query:
+        print(f"{len(catalog)} items")
+        return 0
+    hits = catalog.search(" ".join(args.query), limit=args.limit)
+    for iid, name in hits:
+        print(f"{iid:6d}  {name}")
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,13 @@
 import json
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any, Dict
 from core.catshop_io import CatShopParsed, CatShopItem, parse_catshop, save_catshop
 from core.medalshop_io import MedalParsed, MedalItem, parse_medal_shop, save_medal_shop
+from core.mhfdat_io import MonsterPoints, DataCounters, parse_mhfdat, save_mhfdat
+from core.models import FloorStats, SpawnTable
 
 def catshop_to_json(parsed: CatShopParsed) -> str:
     data = {
@@ -16,10 +22,9 @@ def catshop_from_json(json_str: str) -> CatShopParsed:
     obj = json.loads(json_str)
     ent = obj.get("entries", [])
     rows = []
-    for i, e in enumerate(ent):
+    for e in ent:
         item_id = e.get("item_id", 0)
         item_id2 = e.get("item_id2", 0)
-        print(f"[DEBUG json_io] entry {i}: item_id={item_id}, item_id2={item_id2}")
         rows.append(CatShopItem(item_id=item_id, item_id2=item_id2))
     return CatShopParsed(rows=rows)
 
@@ -49,3 +54,411 @@ def medalshop_from_json(json_str: str) -> MedalParsed:
         price = e.get("price", 0)
         rows.append(MedalItem(item=item, random=rand, quantity=qty, price=price))
     return MedalParsed(rows=rows)
+
+
+# ----------------------------
+# Project bundle (every editable section in one file)
+# ----------------------------
+#
+# {
+#   "format": "blaze-road-bundle", "version": 1,
+#   "fields": {<section>: [column names]},          # row layout, for readers
+#   "rengoku": {"multi": {"floor_stats": [[...], ...], "spawn_tables": [[[...], ...], ...]},
+#               "solo":  {...}},
+#   "mhfdat":  {"counters": {...}, "monster_points": [[...], ...],
+#               "catshop": [[...], ...], "medalshop": [[...], ...]}
+# }
+#
+# Rows are positional arrays in the order given by BUNDLE_FIELDS. Either top-level
+# section may be missing. Rows are written one at a time to the output stream.
+
+BUNDLE_FORMAT = "blaze-road-bundle"
+BUNDLE_VERSION = 1
+
+BUNDLE_FIELDS = {
+    "floor_stats": ["FloorNumber", "SpawnTableUsed", "Unk0", "PointMulti1", "PointMulti2", "FinalLoop"],
+    "spawn_tables": ["FirstMonsterID", "FirstMonsterVariant", "SecondMonsterID", "SecondMonsterVariant",
+                     "MonstersStatTable", "MapZoneOverride", "SpawnWeighting", "AdditionalFlag"],
+    "counters": ["unk1", "unk2", "unk3", "unk4", "RoadEntries"],
+    "monster_points": ["monster_id", "monster_flag", "base_points", "level1_points", "level2_points",
+                       "level3_points", "level4_points", "level5_points"],
+    "catshop": ["item_id", "item_id2"],
+    "medalshop": ["item", "flag1", "flag2", "price"],
+}
+
+_U32 = 0xFFFFFFFF
+_U16 = 0xFFFF
+_U8 = 0xFF
+# per-column maximum; None marks a float column
+_BUNDLE_LIMITS = {
+    "floor_stats": [_U32, _U32, _U32, None, None, _U32],
+    "spawn_tables": [_U32] * 8,
+    "counters": [_U16] * 5,
+    "monster_points": [_U16] * 8,
+    "catshop": [_U16, _U16],
+    "medalshop": [_U16, _U16, _U8, _U16],
+}
+FLOAT32_MAX = 3.4028234663852886e38
+
+
+@dataclass
+class RoadSection:
+    floor_stats: list[FloorStats]
+    spawn_tables: list[list[SpawnTable]]
+
+
+@dataclass
+class RoadBundle:
+    multi: RoadSection | None = None
+    solo: RoadSection | None = None
+    counters: DataCounters | None = None
+    monster_points: list[MonsterPoints] | None = None
+    catshop: CatShopParsed | None = None
+    medalshop: MedalParsed | None = None
+
+
+class BundleValidationError(ValueError):
+    """Raised by read_bundle() with every schema problem found in the file."""
+
+    def __init__(self, problems: list[str]):
+        self.problems = problems
+        shown = "\n".join(f"  {p}" for p in problems[:25])
+        more = f"\n  ... and {len(problems) - 25} more" if len(problems) > 25 else ""
+        super().__init__(f"Invalid bundle ({len(problems)} problem(s)):\n{shown}{more}")
+
+
+def bundle_from_files(rengoku_path=None, mhfdat_path=None, *, rengoku_structs=None,
+                      mhfdat_parsed: dict | None = None) -> RoadBundle:
+    """Collect every editable section from the given files (or already-parsed data)."""
+    from core.io import parse_rengoku_data
+
+    bundle = RoadBundle()
+    structs = rengoku_structs or (parse_rengoku_data(rengoku_path) if rengoku_path else None)
+    if structs:
+        spawn_tables, floor_stats, _multi_def, spawn_tables_solo, floor_stats_solo, _solo_def = structs
+        bundle.multi = RoadSection(floor_stats, spawn_tables)
+        bundle.solo = RoadSection(floor_stats_solo, spawn_tables_solo)
+
+    if mhfdat_path or mhfdat_parsed:
+        parsed = mhfdat_parsed or parse_mhfdat(mhfdat_path)
+        bundle.counters = parsed["counters"]
+        bundle.monster_points = parsed["monster_rows"]
+        if mhfdat_path:
+            bundle.catshop = parse_catshop(mhfdat_path) or CatShopParsed(rows=[])
+            bundle.medalshop = parse_medal_shop(mhfdat_path) or MedalParsed(rows=[])
+    return bundle
+
+
+def row_values(section: str, obj) -> list:
+    """A section object's values in BUNDLE_FIELDS order (the positional bundle row)."""
+    if section == "medalshop":
+        return [obj.item, obj.random, obj.quantity, obj.price]
+    return [getattr(obj, f) for f in BUNDLE_FIELDS[section]]
+
+
+class _StreamWriter:
+    """Minimal streaming JSON writer: containers are opened/closed, rows are dumped one by one."""
+
+    def __init__(self, fp, pretty: bool):
+        self.fp = fp
+        self.pretty = pretty
+        self.sep = (", ", ": ") if pretty else (",", ":")
+        self.depth = 0
+        self.first = [True]
+
+    def _newline(self):
+        if self.pretty:
+            self.fp.write("\n" + "  " * self.depth)
+
+    def _comma(self):
+        if not self.first[-1]:
+            self.fp.write(",")
+        self.first[-1] = False
+        self._newline()
+
+    def open(self, key=None, bracket="{"):
+        if self.depth:
+            self._comma()
+        if key is not None:
+            self.fp.write(json.dumps(key) + self.sep[1])
+        self.fp.write(bracket)
+        self.depth += 1
+        self.first.append(True)
+
+    def close(self, bracket="}"):
+        empty = self.first.pop()
+        self.depth -= 1
+        if not empty:
+            self._newline()
+        self.fp.write(bracket)
+
+    def value(self, value, key=None):
+        self._comma()
+        if key is not None:
+            self.fp.write(json.dumps(key) + self.sep[1])
+        self.fp.write(json.dumps(value, separators=self.sep))
+
+
+def write_bundle(bundle: RoadBundle, dest, *, pretty: bool = False) -> None:
+    """
+    Stream a bundle to a path or text file object.
+    pretty=True puts one row per line (diff-friendly); pretty=False writes no whitespace.
+    """
+    if isinstance(dest, (str, os.PathLike)):
+        with open(dest, "w", encoding="utf-8", newline="\n") as f:
+            write_bundle(bundle, f, pretty=pretty)
+        return
+
+    w = _StreamWriter(dest, pretty)
+    w.open()
+    w.value(BUNDLE_FORMAT, "format")
+    w.value(BUNDLE_VERSION, "version")
+    w.value(BUNDLE_FIELDS, "fields")
+
+    if bundle.multi or bundle.solo:
+        w.open("rengoku")
+        for mode in ("multi", "solo"):
+            sec = getattr(bundle, mode)
+            if sec is None:
+                continue
+            w.open(mode)
+            w.open("floor_stats", "[")
+            for fs in sec.floor_stats:
+                w.value(row_values("floor_stats", fs))
+            w.close("]")
+            w.open("spawn_tables", "[")
+            for group in sec.spawn_tables:
+                w.open(None, "[")
+                for sp in group:
+                    w.value(row_values("spawn_tables", sp))
+                w.close("]")
+            w.close("]")
+            w.close()
+        w.close()
+
+    if bundle.counters or bundle.monster_points is not None or bundle.catshop or bundle.medalshop:
+        w.open("mhfdat")
+        if bundle.counters is not None:
+            w.value({f: getattr(bundle.counters, f) for f in BUNDLE_FIELDS["counters"]}, "counters")
+        for section, rows in (("monster_points", bundle.monster_points),
+                              ("catshop", bundle.catshop.rows if bundle.catshop else None),
+                              ("medalshop", bundle.medalshop.rows if bundle.medalshop else None)):
+            if rows is None:
+                continue
+            w.open(section, "[")
+            for r in rows:
+                w.value(row_values(section, r))
+            w.close("]")
+        w.close()
+
+    w.close()
+    if pretty:
+        dest.write("\n")
+
+
+def check_value(section: str, field: str, v) -> str | None:
+    """What is wrong with one value of a BUNDLE_FIELDS column, or None when it can be stored."""
+    limit = _BUNDLE_LIMITS[section][BUNDLE_FIELDS[section].index(field)]
+    if limit is None:
+        if isinstance(v, bool) or not isinstance(v, (int, float)) or not math.isfinite(v) or abs(v) > FLOAT32_MAX:
+            return f"expected a finite float32 number, got {v!r}"
+    elif isinstance(v, bool) or not isinstance(v, int) or not 0 <= v <= limit:
+        return f"expected an integer 0..{limit}, got {v!r}"
+    return None
+
+
+def check_rows(section: str, rows, path: str, problems: list[str]) -> list[list]:
+    """Validate positional rows against BUNDLE_FIELDS/_BUNDLE_LIMITS; returns the good rows."""
+    if not isinstance(rows, list):
+        problems.append(f"{path}: expected a list")
+        return []
+    fields = BUNDLE_FIELDS[section]
+    width = len(fields)
+    good = []
+    for i, row in enumerate(rows):
+        if not isinstance(row, list) or len(row) != width:
+            problems.append(f"{path}[{i}]: expected {width} values ({', '.join(fields)})")
+            continue
+        ok = True
+        for name, v in zip(fields, row):
+            problem = check_value(section, name, v)
+            if problem:
+                problems.append(f"{path}[{i}].{name}: {problem}")
+                ok = False
+        if ok:
+            good.append(row)
+    return good
+
+
+def read_bundle(src) -> RoadBundle:
+    """
+    Read a bundle from a path or text file object and validate it against the
+    schema in the same pass that builds the section objects.
+    Raises BundleValidationError listing every problem.
+    """
+    if isinstance(src, (str, os.PathLike)):
+        with open(src, "r", encoding="utf-8") as f:
+            return read_bundle(f)
+
+    try:
+        obj = json.load(src)
+    except json.JSONDecodeError as e:
+        raise BundleValidationError([f"not valid JSON: {e}"]) from None
+
+    problems: list[str] = []
+    if not isinstance(obj, dict) or obj.get("format") != BUNDLE_FORMAT:
+        raise BundleValidationError([f"not a {BUNDLE_FORMAT} file"])
+    version = obj.get("version")
+    if not isinstance(version, int) or version > BUNDLE_VERSION or version < 1:
+        raise BundleValidationError([f"unsupported bundle version {version!r} (this build reads <= {BUNDLE_VERSION})"])
+
+    bundle = RoadBundle()
+    rengoku = obj.get("rengoku")
+    if rengoku is not None:
+        if not isinstance(rengoku, dict):
+            problems.append("rengoku: expected an object")
+            rengoku = {}
+        for mode in ("multi", "solo"):
+            sec = rengoku.get(mode)
+            if sec is None:
+                continue
+            path = f"rengoku.{mode}"
+            if not isinstance(sec, dict):
+                problems.append(f"{path}: expected an object")
+                continue
+            floors = [FloorStats(*r) for r in check_rows("floor_stats", sec.get("floor_stats", []),
+                                                          f"{path}.floor_stats", problems)]
+            groups = sec.get("spawn_tables", [])
+            tables = []
+            if not isinstance(groups, list):
+                problems.append(f"{path}.spawn_tables: expected a list of groups")
+                groups = []
+            for gi, group in enumerate(groups):
+                tables.append([SpawnTable(*r) for r in check_rows("spawn_tables", group,
+                                                                   f"{path}.spawn_tables[{gi}]", problems)])
+            for fi, fs in enumerate(floors):
+                if tables and fs.SpawnTableUsed >= len(tables):
+                    problems.append(f"{path}.floor_stats[{fi}].SpawnTableUsed: {fs.SpawnTableUsed} "
+                                    f"is not below the group count ({len(tables)})")
+            setattr(bundle, mode, RoadSection(floors, tables))
+
+    mhf = obj.get("mhfdat")
+    if mhf is not None:
+        if not isinstance(mhf, dict):
+            problems.append("mhfdat: expected an object")
+            mhf = {}
+        c = mhf.get("counters")
+        if c is not None and not isinstance(c, (dict, list)):
+            problems.append("mhfdat.counters: expected an object")
+        elif c is not None:
+            row = [c.get(f) for f in BUNDLE_FIELDS["counters"]] if isinstance(c, dict) else c
+            good = check_rows("counters", [row], "mhfdat.counters", problems)
+            if good:
+                bundle.counters = DataCounters(*good[0], offset=-1)
+        if "monster_points" in mhf:
+            bundle.monster_points = [MonsterPoints(*r, offset=-1) for r in
+                                     check_rows("monster_points", mhf["monster_points"],
+                                                 "mhfdat.monster_points", problems)]
+        if "catshop" in mhf:
+            bundle.catshop = CatShopParsed(rows=[
+                CatShopItem(item_id=a, item_id2=b)
+                for a, b in check_rows("catshop", mhf["catshop"], "mhfdat.catshop", problems)])
+        if "medalshop" in mhf:
+            bundle.medalshop = MedalParsed(rows=[
+                MedalItem(item=a, random=b, quantity=q, price=p)
+                for a, b, q, p in check_rows("medalshop", mhf["medalshop"], "mhfdat.medalshop", problems)])
+
+    if problems:
+        raise BundleValidationError(problems)
+    return bundle
+
+
+def _copy_road_section(sec: RoadSection, floor_stats, spawn_tables, mode: str):
+    """Copy bundle values onto template structs in place (offsets come from the template)."""
+    if len(sec.floor_stats) != len(floor_stats) or len(sec.spawn_tables) != len(spawn_tables) or \
+            any(len(a) != len(b) for a, b in zip(sec.spawn_tables, spawn_tables)):
+        raise ValueError(f"{mode} road layout in the bundle does not match the template "
+                         f"(floors/groups/entries differ); these tables cannot be resized in place")
+    for src, dst in zip(sec.floor_stats, floor_stats):
+        for f in BUNDLE_FIELDS["floor_stats"]:
+            setattr(dst, f, getattr(src, f))
+    for src_group, dst_group in zip(sec.spawn_tables, spawn_tables):
+        for src, dst in zip(src_group, dst_group):
+            for f in BUNDLE_FIELDS["spawn_tables"]:
+                setattr(dst, f, getattr(src, f))
+
+
+def apply_bundle(bundle: RoadBundle, *, rengoku_template=None, rengoku_out=None,
+                 mhfdat_template=None, mhfdat_out=None) -> None:
+    """Write the bundle's sections onto template files using the normal savers."""
+    if (bundle.multi or bundle.solo) and rengoku_template and rengoku_out:
+        from core.io import parse_rengoku_data, save_structs_to_bin
+        structs = parse_rengoku_data(rengoku_template)
+        if not structs:
+            raise ValueError("Failed to parse Rengoku template")
+        if bundle.multi:
+            _copy_road_section(bundle.multi, structs[1], structs[0], "multi")
+        if bundle.solo:
+            _copy_road_section(bundle.solo, structs[4], structs[3], "solo")
+        save_structs_to_bin(rengoku_template, rengoku_out, structs)
+
+    if mhfdat_template and mhfdat_out:
+        _apply_mhfdat_sections(bundle, mhfdat_template, mhfdat_out)
+
+
+def section_values(section: str, rows) -> list:
+    """row_values() of every row of a section."""
+    return [row_values(section, r) for r in rows]
+
+
+def _apply_mhfdat_sections(bundle: RoadBundle, template, out) -> None:
+    """
+    Save only the mhfdat sections that differ from the template, so an unchanged
+    bundle reproduces the template byte for byte (the savers relocate blocks to EOF).
+    """
+    parsed = parse_mhfdat(template)
+    counters = parsed["counters"]
+    original_counters = counters.to_bytes()
+    if bundle.counters is not None:
+        for f in BUNDLE_FIELDS["counters"]:
+            setattr(counters, f, getattr(bundle.counters, f))
+
+    monsters_changed = bundle.monster_points is not None and \
+        section_values("monster_points", bundle.monster_points) != \
+        section_values("monster_points", parsed["monster_rows"])
+    catshop_changed = False
+    if bundle.catshop is not None:
+        current = parse_catshop(template) or CatShopParsed(rows=[])
+        catshop_changed = section_values("catshop", bundle.catshop.rows) != \
+            section_values("catshop", current.rows)
+    medal_changed = False
+    if bundle.medalshop is not None:
+        current = parse_medal_shop(template) or MedalParsed(rows=[])
+        medal_changed = section_values("medalshop", bundle.medalshop.rows) != \
+            section_values("medalshop", current.rows)
+
+    if monsters_changed:
+        counters.RoadEntries = len(bundle.monster_points)
+    cat_total = 0
+    if catshop_changed:
+        cat_total = sum((int(r.item_id) != 0) + (int(r.item_id2) != 0) for r in bundle.catshop.rows)
+        counters.unk3 = min(cat_total, _U16)
+
+    src = template
+    if monsters_changed:
+        parsed["monster_rows"] = bundle.monster_points
+        save_mhfdat(src, out, parsed)
+        src = out
+    elif counters.to_bytes() != original_counters:
+        buf = bytearray(Path(src).read_bytes())
+        buf[counters.offset:counters.offset + 10] = counters.to_bytes()
+        Path(out).write_bytes(buf)
+        src = out
+    if catshop_changed:
+        save_catshop(src, out, bundle.catshop, counters=counters, counter_items_count=cat_total)
+        src = out
+    if medal_changed:
+        save_medal_shop(src, out, bundle.medalshop)
+        src = out
+    if Path(src) != Path(out):
+        Path(out).write_bytes(Path(template).read_bytes())
@@ -0,0 +1,283 @@
+# core/mhfdat_excel.py
+"""
+Excel export/import for the mhfdat.bin sections (one workbook, one sheet each):
+  - Monster Points  (parse_mhfdat / save_mhfdat, RoadEntries counter)
+  - Cat Shop        (parse_catshop / save_catshop, CatShopItemCounter)
+  - Medal Shop      (parse_medal_shop / save_medal_shop, MedalShopEntries)
+
+Both directions stream: export uses a write-only workbook and import a read-only
+one, so hundreds of rows never build a full cell grid in memory.
+"""
+from __future__ import annotations
+
+import os
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+
+from .constants import MONSTERS, monster_id
+from .excel import register_named_styles, STYLE_HEADER
+from .items import load_item_names, item_ids_by_name
+from .mhfdat_io import parse_mhfdat, save_mhfdat, MonsterPoints
+from .catshop_io import parse_catshop, save_catshop, CatShopItem, CatShopParsed
+from .medalshop_io import parse_medal_shop, save_medal_shop, MedalItem, MedalParsed
+from .validation import Issue, ValidationReport, WorkbookValidationError
+
+MONSTER_SHEET = "Monster Points"
+CATSHOP_SHEET = "Cat Shop"
+MEDAL_SHEET = "Medal Shop"
+
+MONSTER_HEADERS = ["Monster", "EM ID", "Flag", "Base Points",
+                   "Level 1 Points", "Level 2 Points", "Level 3 Points", "Level 4 Points", "Level 5 Points"]
+MONSTER_POINT_FIELDS = ["monster_flag", "base_points",
+                        "level1_points", "level2_points", "level3_points", "level4_points", "level5_points"]
+CATSHOP_HEADERS = ["Item ID", "Item Name", "Item ID 2", "Item Name 2"]
+MEDAL_HEADERS = ["Item ID", "Item Name", "Flag 1", "Flag 2", "Price"]
+
+# Medal Shop flags are fixed on save (see MedalShopEditor)
+MEDAL_FLAG1 = 4
+MEDAL_FLAG2 = 1
+
+U16_MAX = 0xFFFF
+
+
+# ----------------------------
+# Export
+# ----------------------------
+
+def _header_row(ws, headers):
+    row = []
+    for h in headers:
+        c = WriteOnlyCell(ws, value=h)
+        c.style = STYLE_HEADER
+        row.append(c)
+    return row
+
+
+def _sheet(wb, title, headers, widths):
+    ws = wb.create_sheet(title)
+    for i, w in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = w
+    ws.freeze_panes = "A2"
+    ws.append(_header_row(ws, headers))
+    return ws
+
+
+def create_excel_from_mhfdat(mhfdat_path, output_file, *, parsed: dict | None = None,
+                             id_to_name: dict[int, str] | None = None):
+    """
+    Export Monster Points, Cat Shop and Medal Shop from mhfdat.bin into one workbook.
+    'parsed' may be an existing parse_mhfdat() result (e.g. with unsaved edits).
+    """
+    parsed = parsed or parse_mhfdat(mhfdat_path)
+    catshop = parse_catshop(mhfdat_path) or CatShopParsed(rows=[])
+    medal = parse_medal_shop(mhfdat_path) or MedalParsed(rows=[])
+    names = load_item_names() if id_to_name is None else id_to_name
+
+    def item_name(iid):
+        return names.get(int(iid), "" if not iid else f"Unknown ({iid})")
+
+    wb = register_named_styles(openpyxl.Workbook(write_only=True))
+
+    ws = _sheet(wb, MONSTER_SHEET, MONSTER_HEADERS, [28, 8] + [15] * 7)
+    for r in parsed["monster_rows"]:
+        name = MONSTERS[r.monster_id] if 0 <= r.monster_id < len(MONSTERS) else r.monster_id
+        ws.append([name, r.monster_id] + [getattr(r, f) for f in MONSTER_POINT_FIELDS])
+
+    ws = _sheet(wb, CATSHOP_SHEET, CATSHOP_HEADERS, [10, 36, 10, 36])
+    for r in catshop.rows:
+        ws.append([r.item_id, item_name(r.item_id), r.item_id2, item_name(r.item_id2)])
+
+    ws = _sheet(wb, MEDAL_SHEET, MEDAL_HEADERS, [10, 36, 8, 8, 10])
+    for r in medal.rows:
+        ws.append([r.item, item_name(r.item), r.random, r.quantity, r.price])
+
+    wb.save(output_file)
+
+
+# ----------------------------
+# Import
+# ----------------------------
+
+class _SheetReader:
+    """Streams one sheet as header-keyed rows and collects cell-level issues."""
+
+    def __init__(self, ws, report: ValidationReport):
+        self.ws = ws
+        self.title = ws.title
+        self.report = report
+        self.columns: dict[str, int] = {}
+
+    def rows(self):
+        for row_idx, row in enumerate(self.ws.iter_rows(values_only=True), start=1):
+            if row_idx == 1:
+                self.columns = {str(h).strip(): ci for ci, h in enumerate(row) if h is not None}
+                continue
+            if not row or all(v is None or (isinstance(v, str) and not v.strip()) for v in row):
+                continue
+            yield row_idx, row
+
+    def get(self, row, header):
+        ci = self.columns.get(header)
+        return row[ci] if ci is not None and ci < len(row) else None
+
+    def error(self, row_idx, header, value, message):
+        ci = self.columns.get(header)
+        cell = f"{get_column_letter(ci + 1)}{row_idx}" if ci is not None else f"row {row_idx}"
+        self.report.issues.append(Issue(self.title, cell, header, value, message))
+
+    def int_cell(self, row_idx, row, header, maximum):
+        v = self.get(row, header)
+        if v is None or (isinstance(v, str) and not v.strip()):
+            self.error(row_idx, header, v, "cell is blank")
+            return 0
+        try:
+            f = float(str(v).strip()) if isinstance(v, str) else float(v)
+        except (TypeError, ValueError):
+            self.error(row_idx, header, v, "not a number")
+            return 0
+        if not f.is_integer() or not 0 <= f <= maximum:
+            self.error(row_idx, header, v, f"must be a whole number between 0 and {maximum}")
+            return 0
+        return int(f)
+
+
+def _read_monster_rows(reader: _SheetReader) -> list[MonsterPoints]:
+    rows = []
+    for row_idx, row in reader.rows():
+        ref = reader.get(row, "Monster")
+        if ref is None or (isinstance(ref, str) and not ref.strip()):
+            ref = reader.get(row, "EM ID")
+        try:
+            em = monster_id(ref)
+            if not 0 < em < len(MONSTERS):
+                raise ValueError(f"EM ID must be between 1 and {len(MONSTERS) - 1}")
+        except ValueError as e:
+            reader.error(row_idx, "Monster", ref, str(e))
+            em = 0
+        fields = {f: reader.int_cell(row_idx, row, h, U16_MAX)
+                  for f, h in zip(MONSTER_POINT_FIELDS, MONSTER_HEADERS[2:])}
+        rows.append(MonsterPoints(monster_id=em, offset=-1, **fields))
+    return rows
+
+
+def _item_cell(reader: _SheetReader, row_idx, row, id_header, name_header, by_name):
+    """Item ID column wins; a blank ID falls back to an exact (case-insensitive) name match."""
+    v = reader.get(row, id_header)
+    if v is None or (isinstance(v, str) and not v.strip()):
+        name = reader.get(row, name_header)
+        if isinstance(name, str) and name.strip():
+            iid = by_name.get(name.strip().lower())
+            if iid is None:
+                reader.error(row_idx, name_header, name, "unknown item name (and Item ID is blank)")
+                return 0
+            return iid
+    return reader.int_cell(row_idx, row, id_header, U16_MAX)
+
+
+def _read_catshop_rows(reader: _SheetReader, by_name) -> list[CatShopItem]:
+    rows = []
+    for row_idx, row in reader.rows():
+        rows.append(CatShopItem(
+            item_id=_item_cell(reader, row_idx, row, "Item ID", "Item Name", by_name),
+            item_id2=_item_cell(reader, row_idx, row, "Item ID 2", "Item Name 2", by_name),
+        ))
+    return rows
+
+
+def _read_medal_rows(reader: _SheetReader, by_name) -> list[MedalItem]:
+    rows = []
+    for row_idx, row in reader.rows():
+        item = _item_cell(reader, row_idx, row, "Item ID", "Item Name", by_name)
+        seen = len(reader.report.issues)
+        price = reader.int_cell(row_idx, row, "Price", U16_MAX)
+        if price == 0 and len(reader.report.issues) == seen:
+            reader.error(row_idx, "Price", reader.get(row, "Price"), "price must be > 0")
+        rows.append(MedalItem(item=item, random=MEDAL_FLAG1, quantity=MEDAL_FLAG2, price=price))
+    return rows
+
+
+def read_mhfdat_sheet(wb, sheet: str, report: ValidationReport, by_name: dict[str, int] | None = None):
+    """
+    Read one sheet of an open workbook: list[MonsterPoints] for MONSTER_SHEET,
+    CatShopParsed / MedalParsed for CATSHOP_SHEET / MEDAL_SHEET (by_name resolves
+    item names when the ID cell is blank). Bad cells are added to 'report'.
+    """
+    reader = _SheetReader(wb[sheet], report)
+    if sheet == MONSTER_SHEET:
+        return _read_monster_rows(reader)
+    if by_name is None:
+        by_name = item_ids_by_name(load_item_names())
+    if sheet == CATSHOP_SHEET:
+        return CatShopParsed(rows=_read_catshop_rows(reader, by_name))
+    if sheet == MEDAL_SHEET:
+        return MedalParsed(rows=_read_medal_rows(reader, by_name))
+    raise ValueError(f"not an mhfdat sheet: {sheet!r}")
+
+
+def read_excel_mhfdat(excel_file, *, id_to_name: dict[int, str] | None = None) -> dict:
+    """
+    Stream the workbook back into section rows:
+      {'monster_rows': [...] | None, 'catshop': CatShopParsed | None, 'medalshop': MedalParsed | None}
+    Missing sheets come back as None (that section is left untouched).
+    Raises WorkbookValidationError listing every bad cell.
+    """
+    wb = openpyxl.load_workbook(excel_file, read_only=True, data_only=True)
+    report = ValidationReport()
+    by_name = None
+    out = {"monster_rows": None, "catshop": None, "medalshop": None}
+    try:
+        if MONSTER_SHEET in wb.sheetnames:
+            out["monster_rows"] = read_mhfdat_sheet(wb, MONSTER_SHEET, report)
+        if CATSHOP_SHEET in wb.sheetnames or MEDAL_SHEET in wb.sheetnames:
+            by_name = item_ids_by_name(load_item_names() if id_to_name is None else id_to_name)
+        if CATSHOP_SHEET in wb.sheetnames:
+            out["catshop"] = read_mhfdat_sheet(wb, CATSHOP_SHEET, report, by_name)
+        if MEDAL_SHEET in wb.sheetnames:
+            out["medalshop"] = read_mhfdat_sheet(wb, MEDAL_SHEET, report, by_name)
+    finally:
+        wb.close()
+    if report.errors:
+        raise WorkbookValidationError(report)
+    return out
+
+
+def catshop_item_count(parsed: CatShopParsed) -> int:
+    """CatShopItemCounter value: every non-zero Item ID / Item ID 2 (as CatShopEditor counts)."""
+    return sum((int(r.item_id) != 0) + (int(r.item_id2) != 0) for r in parsed.rows)
+
+
+def export_excel_to_mhfdat(excel_file, output_file, template_file, *, id_to_name: dict[int, str] | None = None):
+    """
+    Apply an edited mhfdat workbook onto template_file and write output_file.
+    Each section present in the workbook is saved through its normal writer,
+    with RoadEntries / CatShopItemCounter / MedalShopEntries kept in sync.
+    """
+    sections = read_excel_mhfdat(excel_file, id_to_name=id_to_name)
+    parsed = parse_mhfdat(template_file)
+    src = template_file
+
+    if sections["monster_rows"] is not None:
+        parsed["monster_rows"] = sections["monster_rows"]
+        parsed["counters"].RoadEntries = len(parsed["monster_rows"])
+        save_mhfdat(src, output_file, parsed)
+        src = output_file
+
+    if sections["catshop"] is not None:
+        # unk3 is the CatShopItemCounter; keep the in-memory counters in step with the file
+        parsed["counters"].unk3 = min(catshop_item_count(sections["catshop"]), U16_MAX)
+        save_catshop(src, output_file, sections["catshop"],
+                     counters=parsed["counters"],
+                     counter_items_count=catshop_item_count(sections["catshop"]))
+        src = output_file
+
+    if sections["medalshop"] is not None:
+        save_medal_shop(src, output_file, sections["medalshop"])
+        src = output_file
+
+    if os.fspath(src) != os.fspath(output_file):
+        # nothing to apply: still produce the requested output
+        with open(template_file, "rb") as f_in, open(output_file, "wb") as f_out:
+            f_out.write(f_in.read())
+    return sections
@@ -2,6 +2,23 @@
 import struct
 from dataclasses import dataclass
 
+from .constants import monster_id as resolve_monster_id
+
+
+def whole_number(v) -> int:
+    """
+    Cell value -> int, accepting what validation accepts: ints, whole floats and
+    numeric strings ("3", "3.0"). Raises ValueError for anything else (e.g. "3.5").
+    """
+    if isinstance(v, bool):
+        raise ValueError(f"not a number: {v!r}")
+    if isinstance(v, int):
+        return v
+    f = float(v.strip() if isinstance(v, str) else v)
+    if not f.is_integer():
+        raise ValueError(f"not a whole number: {v!r}")
+    return int(f)
+
 @dataclass
 class RoadMode:
     FloorStatsCount: int
@@ -65,23 +82,19 @@ class SpawnTable:
         ]
 
     def check_monster_id(self, monsters: list[str], monster_id):
-        if isinstance(monster_id, str):
-            if monster_id.isdigit():
-                monster_id = int(monster_id)
-            else:
-                monster_id = monsters.index(monster_id)
-        return monster_id
+        # names resolve through the precomputed registry built from MONSTERS
+        return resolve_monster_id(monster_id)
 
     def reset_values_from_row(self, monsters: list[str], group: dict):
         self.FirstMonsterID = self.check_monster_id(monsters, group["FirstMonsterID"])
-        self.FirstMonsterVariant = int(group["FirstMonsterVariant"])
+        self.FirstMonsterVariant = whole_number(group["FirstMonsterVariant"])
         self.SecondMonsterID = self.check_monster_id(monsters, group["SecondMonsterID"])
-        self.SecondMonsterVariant = int(group["SecondMonsterVariant"])
-        self.MonstersStatTable = int(group["MonstersStatTable"])
+        self.SecondMonsterVariant = whole_number(group["SecondMonsterVariant"])
+        self.MonstersStatTable = whole_number(group["MonstersStatTable"])
         mzo = group.get("Bonus Spawns", group.get("Bonus Spawn", group.get("MapZoneOverride", 0)))
-        self.MapZoneOverride = int(mzo)
-        self.SpawnWeighting = int(group["SpawnWeighting"])
-        self.AdditionalFlag = int(group["AdditionalFlag"])
+        self.MapZoneOverride = whole_number(mzo)
+        self.SpawnWeighting = whole_number(group["SpawnWeighting"])
+        self.AdditionalFlag = whole_number(group["AdditionalFlag"])
 
 
 @dataclass
@@ -0,0 +1,315 @@
+# core/patch.py
+"""
+Compact binary patches between two versions of a BIN (rengoku_data.bin / mhfdat.bin).
+
+A patch stores only what changed: differing byte ranges of the common prefix
+(nearby ranges coalesced), the bytes appended at EOF by save_mhfdat /
+save_catshop / save_medal_shop, and the final size. Runs of one repeated byte
+(the 0x00 alignment and end padding) are stored as FILL ops. The base size and
+SHA-256 are recorded so a patch is refused on anything but the file it was made from.
+
+Layout (little-endian):
+  header   "BHRP" | u16 version | u16 flags | u32 base_size | 32s base_sha256
+           | u32 target_size | 32s target_sha256 | u32 op_count
+  body     (zlib-compressed when flags & FLAG_ZLIB)
+           WRITE: u8 0 | u32 offset | u32 length | bytes
+           FILL:  u8 1 | u32 offset | u32 length | u8 value
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+PATCH_MAGIC = b"BHRP"
+PATCH_VERSION = 1
+FLAG_ZLIB = 0x1
+
+HEADER_PACK = "<4sHHI32sI32sI"
+HEADER_SIZE = struct.calcsize(HEADER_PACK)
+OP_PACK = "<BII"
+OP_SIZE = struct.calcsize(OP_PACK)
+
+OP_WRITE = 0
+OP_FILL = 1
+
+# Gaps of unchanged bytes shorter than this are folded into the surrounding
+# WRITE (cheaper than the 9-byte header of a new op).
+MERGE_GAP = OP_SIZE
+# Repeated-byte runs at least this long become FILL ops.
+MIN_FILL_RUN = 32
+
+
+class PatchMismatchError(ValueError):
+    """The file a patch is applied to is not the base it was made from."""
+
+
+@dataclass
+class PatchOp:
+    kind: int
+    offset: int
+    length: int
+    data: bytes = b""      # WRITE payload
+    value: int = 0         # FILL byte
+
+
+@dataclass
+class Patch:
+    base_size: int
+    base_sha256: bytes
+    target_size: int
+    target_sha256: bytes
+    ops: list[PatchOp]
+
+    @property
+    def changed_bytes(self) -> int:
+        return sum(op.length for op in self.ops)
+
+
+def _sha256(data) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+# ----------------------------
+# Diff
+# ----------------------------
+
+def _diff_ranges(base: bytes, target: bytes) -> list[tuple[int, int]]:
+    """[start, end) ranges where target differs from base, coalesced across small gaps."""
+    n = min(len(base), len(target))
+    ranges: list[tuple[int, int]] = []
+    if n:
+        a = np.frombuffer(base, dtype=np.uint8, count=n)
+        b = np.frombuffer(target, dtype=np.uint8, count=n)
+        idx = np.flatnonzero(a != b)
+        if idx.size:
+            # split where the gap to the next differing byte exceeds MERGE_GAP
+            breaks = np.flatnonzero(np.diff(idx) > MERGE_GAP + 1)
+            starts = np.concatenate(([idx[0]], idx[breaks + 1]))
+            ends = np.concatenate((idx[breaks], [idx[-1]])) + 1
+            ranges = list(zip(starts.tolist(), ends.tolist()))
+    if len(target) > n:
+        if ranges and n - ranges[-1][1] <= MERGE_GAP:
+            ranges[-1] = (ranges[-1][0], len(target))
+        else:
+            ranges.append((n, len(target)))
+    return ranges
+
+
+def _split_fills(target: bytes, start: int, end: int) -> list[PatchOp]:
+    """Turn one changed range into WRITE ops, carving out long single-byte runs as FILLs."""
+    chunk = np.frombuffer(target, dtype=np.uint8, count=end - start, offset=start)
+    if chunk.size < MIN_FILL_RUN:
+        return [PatchOp(OP_WRITE, start, end - start, bytes(chunk))]
+    # run boundaries: positions where the byte value changes
+    edges = np.flatnonzero(np.diff(chunk)) + 1
+    run_starts = np.concatenate(([0], edges))
+    run_ends = np.concatenate((edges, [chunk.size]))
+    long_runs = np.flatnonzero(run_ends - run_starts >= MIN_FILL_RUN)
+
+    ops: list[PatchOp] = []
+    cursor = 0
+    for r in long_runs.tolist():
+        rs, re_ = int(run_starts[r]), int(run_ends[r])
+        if rs > cursor:
+            ops.append(PatchOp(OP_WRITE, start + cursor, rs - cursor, bytes(chunk[cursor:rs])))
+        ops.append(PatchOp(OP_FILL, start + rs, re_ - rs, value=int(chunk[rs])))
+        cursor = re_
+    if cursor < chunk.size:
+        ops.append(PatchOp(OP_WRITE, start + cursor, chunk.size - cursor, bytes(chunk[cursor:])))
+    return ops
+
+
+def make_patch(base: bytes, target: bytes) -> Patch:
+    """Build a Patch turning 'base' into 'target'."""
+    ops: list[PatchOp] = []
+    for start, end in _diff_ranges(base, target):
+        ops.extend(_split_fills(target, start, end))
+    return Patch(len(base), _sha256(base), len(target), _sha256(target), ops)
+
+
+def make_patch_files(base_path, target_path) -> Patch:
+    return make_patch(Path(base_path).read_bytes(), Path(target_path).read_bytes())
+
+
+# ----------------------------
+# Serialization
+# ----------------------------
+
+def patch_to_bytes(patch: Patch, *, compress: bool = True) -> bytes:
+    body = bytearray()
+    for op in patch.ops:
+        body += struct.pack(OP_PACK, op.kind, op.offset, op.length)
+        body += op.data if op.kind == OP_WRITE else bytes((op.value,))
+    flags = 0
+    if compress:
+        packed = zlib.compress(bytes(body), 9)
+        if len(packed) < len(body):
+            body, flags = packed, FLAG_ZLIB
+    header = struct.pack(HEADER_PACK, PATCH_MAGIC, PATCH_VERSION, flags,
+                         patch.base_size, patch.base_sha256,
+                         patch.target_size, patch.target_sha256, len(patch.ops))
+    return header + bytes(body)
+
+
+def patch_from_bytes(blob: bytes) -> Patch:
+    if len(blob) < HEADER_SIZE:
+        raise ValueError("Patch file is truncated")
+    magic, version, flags, base_size, base_sha, target_size, target_sha, count = \
+        struct.unpack_from(HEADER_PACK, blob, 0)
+    if magic != PATCH_MAGIC:
+        raise ValueError("Not a road patch file (bad magic)")
+    if version > PATCH_VERSION:
+        raise ValueError(f"Unsupported patch version {version}")
+    body = blob[HEADER_SIZE:]
+    if flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+
+    ops: list[PatchOp] = []
+    pos = 0
+    for _ in range(count):
+        kind, offset, length = struct.unpack_from(OP_PACK, body, pos)
+        pos += OP_SIZE
+        if kind == OP_WRITE:
+            ops.append(PatchOp(kind, offset, length, data=bytes(body[pos:pos + length])))
+            pos += length
+        elif kind == OP_FILL:
+            ops.append(PatchOp(kind, offset, length, value=body[pos]))
+            pos += 1
+        else:
+            raise ValueError(f"Unknown patch op {kind}")
+        if offset + length > target_size:
+            raise ValueError("Patch op writes past the target size")
+    return Patch(base_size, base_sha, target_size, target_sha, ops)
+
+
+def write_patch(patch: Patch, path, *, compress: bool = True) -> int:
+    blob = patch_to_bytes(patch, compress=compress)
+    Path(path).write_bytes(blob)
+    return len(blob)
+
+
+def read_patch(path) -> Patch:
+    return patch_from_bytes(Path(path).read_bytes())
+
+
+# ----------------------------
+# Apply
+# ----------------------------
+
+def _check_base(patch: Patch, data_or_path) -> None:
+    if isinstance(data_or_path, (bytes, bytearray, memoryview)):
+        size = len(data_or_path)
+        digest = _sha256(data_or_path) if size == patch.base_size else None
+    else:
+        size = os.path.getsize(data_or_path)
+        digest = None
+        if size == patch.base_size:
+            h = hashlib.sha256()
+            with open(data_or_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            digest = h.digest()
+    if size != patch.base_size or digest != patch.base_sha256:
+        raise PatchMismatchError(
+            f"Patch base mismatch: expected {patch.base_size} bytes "
+            f"(sha256 {patch.base_sha256.hex()[:16]}…), got {size} bytes"
+            + (f" (sha256 {digest.hex()[:16]}…)" if digest else ""))
+
+
+def apply_patch_bytes(patch: Patch, base: bytes, *, verify: bool = True) -> bytes:
+    """Apply in memory and return the target bytes."""
+    _check_base(patch, base)
+    out = bytearray(base[:patch.target_size])
+    if len(out) < patch.target_size:
+        out.extend(b"\x00" * (patch.target_size - len(out)))
+    for op in patch.ops:
+        if op.kind == OP_WRITE:
+            out[op.offset:op.offset + op.length] = op.data
+        else:
+            out[op.offset:op.offset + op.length] = bytes((op.value,)) * op.length
+    if verify and _sha256(out) != patch.target_sha256:
+        raise ValueError("Patched output does not match the expected checksum")
+    return bytes(out)
+
+
+def pwrite(f, data: bytes, offset: int) -> None:
+    """Write 'data' at 'offset' of the open file 'f' without moving its position (where the OS allows)."""
+    if hasattr(os, "pwrite"):
+        os.pwrite(f.fileno(), data, offset)
+    else:  # Windows
+        f.seek(offset)
+        f.write(data)
+
+
+def apply_patch_file(patch: Patch, base_path, output_path=None, *, verify: bool = True) -> None:
+    """
+    Apply a patch with positioned writes. The base is copied to a temp file next to
+    the output, only the patched ranges are written, and the result replaces
+    output_path (base_path itself when output_path is None) once verified.
+    """
+    _check_base(patch, base_path)
+    dest = Path(output_path or base_path)
+    fd, tmp = tempfile.mkstemp(prefix=dest.name + ".", suffix=".tmp", dir=str(dest.parent))
+    os.close(fd)
+    try:
+        shutil.copyfile(base_path, tmp)
+        with open(tmp, "r+b") as f:
+            f.truncate(patch.target_size)
+            for op in patch.ops:
+                data = op.data if op.kind == OP_WRITE else bytes((op.value,)) * op.length
+                pwrite(f, data, op.offset)
+            f.flush()
+            os.fsync(f.fileno())
+        if verify:
+            h = hashlib.sha256()
+            with open(tmp, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+            if h.digest() != patch.target_sha256:
+                raise ValueError("Patched output does not match the expected checksum")
+        os.replace(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m core.patch", description="Binary patches between BIN versions")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    mk = sub.add_parser("make", help="diff base -> edited into a patch")
+    mk.add_argument("base")
+    mk.add_argument("edited")
+    mk.add_argument("patch")
+    ap_ = sub.add_parser("apply", help="apply a patch to its base")
+    ap_.add_argument("patch")
+    ap_.add_argument("base")
+    ap_.add_argument("-o", "--output", help="write here instead of patching base in place")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "make":
+        patch = make_patch_files(args.base, args.edited)
+        size = write_patch(patch, args.patch)
+        print(f"{len(patch.ops)} op(s), {patch.changed_bytes} byte(s) changed, patch is {size} bytes "
+              f"({patch.base_size} -> {patch.target_size})")
+        return 0
+    try:
+        apply_patch_file(read_patch(args.patch), args.base, args.output)
+    except PatchMismatchError as e:
+        print(e)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,270 @@
+# core/project.py
+"""
+RoadProject: one object for scripting against rengoku_data.bin + mhfdat.bin.
+
+  from core.project import RoadProject
+
+  project = RoadProject("rengoku_data.bin", "mhfdat.bin")
+  with project.edit():                                 # one write when the block exits
+      project.multi.spawn(7, 3).SpawnWeighting = 40
+      project.multi.floors[0].PointMulti1 = 1.5
+      project.monsters.get("Rathalos").base_points = 120
+      project.catshop.append(CatShopItem(item_id=1234, item_id2=0))
+      del project.medalshop[0]
+
+Collections:
+  project.multi / project.solo   RoadView: .floors[i] (FloorStats), .groups[g][e] / .spawn(g, e) (SpawnTable),
+                                 .definition (RoadMode header)
+  project.monsters               MonsterPoints rows; .get(name or EM ID)
+  project.catshop                CatShopItem rows; .items() -> every non-zero item ID
+  project.medalshop              MedalItem rows
+  project.counters               DataCounters (RoadEntries / CatShopItemCounter are kept in sync on save)
+
+Saving writes only what changed since the last save: edited road records are
+written at their offsets, and mhfdat.bin goes through json_io.apply_bundle
+(only sections that differ are saved; counters follow the tables). An exception
+inside edit(), or a value save() rejects, rolls every change made in the block back.
+"""
+from __future__ import annotations
+
+import copy
+import os
+import shutil
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from .constants import monster_id
+from .json_io import (BUNDLE_FIELDS, RoadBundle, RoadSection, apply_bundle, bundle_from_files, check_rows,
+                      check_value, row_values, section_values)
+from .models import FloorStats
+
+
+@dataclass
+class RoadView:
+    """Floor stats, spawn groups and header of one road mode."""
+    mode: str
+    floors: list
+    groups: list[list]
+    definition: object
+
+    def spawn(self, group: int, entry: int):
+        return self.groups[group][entry]
+
+    def records(self):
+        """Every FloorStats / SpawnTable of this mode (each knows its file offset)."""
+        yield from self.floors
+        for g in self.groups:
+            yield from g
+
+
+class MonsterTable(list):
+    """Monster points rows, with lookup by monster name or EM ID."""
+
+    def get(self, monster, nth: int = 0):
+        em = monster_id(monster)
+        matches = [r for r in self if r.monster_id == em]
+        if nth >= len(matches):
+            raise KeyError(f"no monster points row for {monster!r}" + (f" (#{nth})" if nth else ""))
+        return matches[nth]
+
+
+class CatShopTable(list):
+    """Cat shop rows (two item slots per row)."""
+
+    def items(self) -> list[int]:
+        return [i for r in self for i in (r.item_id, r.item_id2) if i]
+
+
+class ProjectError(ValueError):
+    pass
+
+
+def _record_fields(record) -> list[str]:
+    return BUNDLE_FIELDS["floor_stats" if isinstance(record, FloorStats) else "spawn_tables"]
+
+
+def _record_values(record) -> tuple:
+    """Field values of a FloorStats / SpawnTable (compared instead of bytes, so bad values never raise)."""
+    return tuple(getattr(record, f) for f in _record_fields(record))
+
+
+class RoadProject:
+    """
+    rengoku_data.bin and/or mhfdat.bin opened together. Saves go back to the same
+    files unless rengoku_out / mhfdat_out are given (the first save then copies).
+    """
+
+    def __init__(self, rengoku=None, mhfdat=None, *, rengoku_out=None, mhfdat_out=None):
+        if not rengoku and not mhfdat:
+            raise ProjectError("give a rengoku_data.bin and/or an mhfdat.bin")
+        self.rengoku_path = os.fspath(rengoku) if rengoku else None
+        self.mhfdat_path = os.fspath(mhfdat) if mhfdat else None
+        self.rengoku_out = os.fspath(rengoku_out) if rengoku_out else self.rengoku_path
+        self.mhfdat_out = os.fspath(mhfdat_out) if mhfdat_out else self.mhfdat_path
+        self._depth = 0
+        self.reload()
+
+    # ---- loading ----
+    def reload(self) -> None:
+        """Re-read both files (from the outputs once they have been saved), dropping unsaved changes."""
+        from .io import parse_rengoku_data
+
+        self.multi = self.solo = None
+        structs = None
+        if self.rengoku_path:
+            structs = parse_rengoku_data(self._current(self.rengoku_path, self.rengoku_out))
+            if not structs:
+                raise ProjectError(f"{self.rengoku_path}: not found")
+            self.multi = RoadView("multi", structs[1], structs[0], structs[2])
+            self.solo = RoadView("solo", structs[4], structs[3], structs[5])
+
+        self.monsters = self.catshop = self.medalshop = self.counters = None
+        if self.mhfdat_path:
+            bundle = bundle_from_files(mhfdat_path=self._current(self.mhfdat_path, self.mhfdat_out))
+            self.monsters = MonsterTable(bundle.monster_points)
+            self.catshop = CatShopTable(bundle.catshop.rows)
+            self.medalshop = list(bundle.medalshop.rows)
+            self.counters = bundle.counters
+        self._mark_saved()
+
+    @staticmethod
+    def _current(path, out):
+        return out if out != path and os.path.exists(out) else path
+
+    def _road_records(self):
+        for view in (self.multi, self.solo):
+            if view is not None:
+                yield from view.records()
+
+    def _mhfdat_state(self):
+        return (section_values("monster_points", self.monsters), section_values("catshop", self.catshop),
+                section_values("medalshop", self.medalshop), row_values("counters", self.counters))
+
+    def _mark_saved(self) -> None:
+        self._saved_records = {r.offset: _record_values(r) for r in self._road_records()}
+        self._saved_mhfdat = self._mhfdat_state() if self.mhfdat_path else None
+
+    # ---- change tracking ----
+    def changed_records(self) -> list:
+        """Road records whose values differ from the file."""
+        return [r for r in self._road_records() if _record_values(r) != self._saved_records[r.offset]]
+
+    @property
+    def mhfdat_changed(self) -> bool:
+        return self.mhfdat_path is not None and self._mhfdat_state() != self._saved_mhfdat
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.changed_records()) or self.mhfdat_changed
+
+    def bundle(self) -> RoadBundle:
+        """The project's current sections as a json_io.RoadBundle (shares the row objects)."""
+        from .catshop_io import CatShopParsed
+        from .medalshop_io import MedalParsed
+
+        b = RoadBundle()
+        if self.multi is not None:
+            b.multi = RoadSection(self.multi.floors, self.multi.groups)
+            b.solo = RoadSection(self.solo.floors, self.solo.groups)
+        if self.mhfdat_path:
+            b.counters = self.counters
+            b.monster_points = list(self.monsters)
+            b.catshop = CatShopParsed(rows=list(self.catshop))
+            b.medalshop = MedalParsed(rows=list(self.medalshop))
+        return b
+
+    # ---- saving ----
+    def _check_values(self, records: list, mhfdat: bool) -> None:
+        """Raise ProjectError listing every value that does not fit its field (before anything is written)."""
+        problems: list[str] = []
+        for r in records:
+            section = "floor_stats" if isinstance(r, FloorStats) else "spawn_tables"
+            for f, v in zip(_record_fields(r), _record_values(r)):
+                problem = check_value(section, f, v)
+                if problem:
+                    problems.append(f"{type(r).__name__} @0x{r.offset:X}.{f}: {problem}")
+        if mhfdat:
+            for section, rows in (("monster_points", self.monsters), ("catshop", self.catshop),
+                                  ("medalshop", self.medalshop)):
+                check_rows(section, section_values(section, rows), section, problems)
+            check_rows("counters", [row_values("counters", self.counters)], "counters", problems)
+        if problems:
+            more = f" (and {len(problems) - 10} more)" if len(problems) > 10 else ""
+            raise ProjectError("cannot save: " + "; ".join(problems[:10]) + more)
+
+    def save(self) -> dict:
+        """
+        Write pending changes; returns {"records": road records written, "mhfdat": saved?}.
+        Raises ProjectError, with nothing written, when a value does not fit its field.
+        """
+        from .mhfdat_io import parse_mhfdat
+        from .patch import pwrite
+
+        written = {"records": 0, "mhfdat": False}
+        records = sorted(self.changed_records(), key=lambda r: r.offset)
+        mhfdat_changed = self.mhfdat_changed
+        self._check_values(records, mhfdat_changed)
+        if records:
+            blobs = [(r.offset, r.serialize()) for r in records]
+            if self.rengoku_out != self.rengoku_path and not os.path.exists(self.rengoku_out):
+                shutil.copyfile(self.rengoku_path, self.rengoku_out)
+            with open(self.rengoku_out, "r+b") as f:
+                for offset, blob in blobs:
+                    pwrite(f, blob, offset)
+            written["records"] = len(records)
+
+        if mhfdat_changed:
+            src = self._current(self.mhfdat_path, self.mhfdat_out)
+            tmp = f"{self.mhfdat_out}.{os.getpid()}.tmp"
+            try:
+                apply_bundle(self.bundle(), mhfdat_template=src, mhfdat_out=tmp)
+                os.replace(tmp, self.mhfdat_out)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            # RoadEntries / CatShopItemCounter may have been recomputed by the savers
+            saved = parse_mhfdat(self.mhfdat_out)["counters"]
+            for f in BUNDLE_FIELDS["counters"] + ["offset"]:
+                setattr(self.counters, f, getattr(saved, f))
+            written["mhfdat"] = True
+        self._mark_saved()
+        return written
+
+    @contextmanager
+    def edit(self):
+        """
+        Batch changes: everything done inside the block is saved in one write when the
+        outermost block exits, or rolled back if it raises.
+        """
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+            return
+        before_records = {r.offset: _record_values(r) for r in self._road_records()}
+        before_mhfdat = copy.deepcopy((list(self.monsters), list(self.catshop), list(self.medalshop),
+                                       self.counters)) if self.mhfdat_path else None
+        self._depth = 1
+        try:
+            yield self
+            self.save()
+        except BaseException:
+            self._rollback(before_records, before_mhfdat)
+            raise
+        finally:
+            self._depth = 0
+
+    def _rollback(self, records: dict, mhfdat) -> None:
+        for r in self._road_records():
+            if _record_values(r) != records[r.offset]:
+                for f, v in zip(_record_fields(r), records[r.offset]):
+                    setattr(r, f, v)
+        if mhfdat is not None:
+            monsters, catshop, medals, counters = mhfdat
+            self.monsters[:] = monsters
+            self.catshop[:] = catshop
+            self.medalshop[:] = medals
+            for f in BUNDLE_FIELDS["counters"]:
+                setattr(self.counters, f, getattr(counters, f))
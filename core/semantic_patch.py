@@ -0,0 +1,639 @@
+# core/semantic_patch.py
+"""
+Semantic (record-keyed) edit patches that survive client updates.
+
+Byte patches (core.patch) only fit the exact file they were made from. A semantic
+patch instead names each change by what it means:
+
+  multi group 7 entry 3: SpawnWeighting=40
+  monster Rathalos: base_points=120
+  catshop: add item 1234
+  medalshop item 670: price=300
+
+File layout:
+  {"format": "blaze-road-edits", "version": 1, "edits": [
+     {"op": "set", "section": "multi.spawn", "group": 7, "entry": 3,
+      "field": "SpawnWeighting", "value": 40, "was": 30},
+     {"op": "set", "section": "monster", "monster": "Rathalos", "nth": 0,
+      "field": "base_points", "value": 120, "was": 100},
+     {"op": "add", "section": "catshop", "item": 1234, "after": "end", "count": 1},
+     {"op": "remove", "section": "medalshop", "item": 670, "nth": 0}
+  ]}
+
+Monster rows and shop entries are keyed by monster / item ID (plus "nth" for
+duplicates); road rows by group/entry/floor index. "was" is the value the edit
+was made against, which is how replay() tells a clean apply from a conflict.
+An add's "count" is how many equal rows the list holds once it is applied, so a
+second copy of an existing item is added while a re-applied add is not (without
+"count" an add is always applied).
+
+Edits are recorded by diffing a snapshot taken when an editor opens against
+the rows at export time (SectionRecorder), so adds, removes and in-place edits
+are all captured without hooking every model.
+"""
+from __future__ import annotations
+
+import copy
+import difflib
+import json
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import Callable
+
+from .constants import MONSTERS, monster_id
+from .catshop_io import CatShopItem
+from .medalshop_io import MedalItem
+from .mhfdat_io import MonsterPoints
+from .json_io import BUNDLE_FIELDS, RoadBundle, RoadSection, check_value
+
+EDITS_FORMAT = "blaze-road-edits"
+EDITS_VERSION = 1
+
+SET = "set"
+ADD = "add"
+REMOVE = "remove"
+
+ROAD_SECTIONS = ("multi.floor", "multi.spawn", "solo.floor", "solo.spawn")
+MONSTER = "monster"
+CATSHOP = "catshop"
+MEDALSHOP = "medalshop"
+
+MONSTER_FIELDS = BUNDLE_FIELDS["monster_points"]
+MEDAL_FIELDS = ["item", "price"]
+_ROAD_MONSTER_FIELDS = {"FirstMonsterID", "SecondMonsterID"}
+
+# anchors for "add": after the keyed row, at the start, or at the end of the list
+START = "start"
+END = "end"
+
+# Medal Shop flags are fixed on save (see MedalShopEditor)
+_MEDAL_FLAG1 = 4
+_MEDAL_FLAG2 = 1
+
+
+@dataclass
+class Edit:
+    op: str                       # SET / ADD / REMOVE
+    section: str                  # ROAD_SECTIONS, MONSTER, CATSHOP or MEDALSHOP
+    key: dict                     # {"group", "entry"} / {"floor"} / {"monster", "nth"} / {"item", "nth"}
+    field: str | None = None      # SET only
+    value: object = None          # SET: new value; ADD: row dict (monster/medal) or item id (catshop)
+    was: object = None            # SET: value the edit was made against
+    after: object = None          # ADD: anchor key dict, START or END
+    count: int | None = None      # ADD: equal rows in the list once applied (None: always add)
+
+    def todict(self) -> dict:
+        d = {"op": self.op, "section": self.section, **self.key}
+        if self.section == MONSTER and "monster" in d:
+            d["monster"] = _monster_label(d["monster"])
+        if self.op == SET:
+            d.update(field=self.field, value=self.value, was=self.was)
+        elif self.op == ADD:
+            if self.section == CATSHOP:
+                d["item"] = self.value
+            else:
+                d["row"] = dict(self.value)
+            d["after"] = self.after
+            if self.count is not None:
+                d["count"] = self.count
+        return d
+
+    @classmethod
+    def fromdict(cls, d: dict) -> "Edit":
+        op, section = d.get("op"), d.get("section")
+        if op not in (SET, ADD, REMOVE):
+            raise ValueError(f"unknown op {op!r}")
+        if section in ROAD_SECTIONS:
+            if op != SET:
+                raise ValueError(f"{section} only supports 'set' (road tables cannot be resized)")
+            key = {"floor": int(d["floor"])} if section.endswith("floor") else \
+                {"group": int(d["group"]), "entry": int(d["entry"])}
+        elif section == MONSTER:
+            key = {} if op == ADD else {"monster": monster_id(d["monster"]), "nth": int(d.get("nth", 0))}
+        elif section in (CATSHOP, MEDALSHOP):
+            key = {} if op == ADD else {"item": int(d["item"]), "nth": int(d.get("nth", 0))}
+        else:
+            raise ValueError(f"unknown section {section!r}")
+
+        if op == SET:
+            return cls(op, section, key, field=d["field"], value=d["value"], was=d.get("was"))
+        if op == ADD:
+            after = d.get("after", END)
+            if isinstance(after, dict) and section == MONSTER:
+                after = {"monster": monster_id(after["monster"]), "nth": int(after.get("nth", 0))}
+            count = int(d["count"]) if d.get("count") is not None else None
+            if section == CATSHOP:
+                return cls(op, section, key, value=int(d["item"]), after=after, count=count)
+            row = dict(d["row"])
+            if section == MONSTER:
+                row["monster_id"] = monster_id(row["monster_id"])
+            return cls(op, section, key, value=row, after=after, count=count)
+        return cls(op, section, key)
+
+
+def _monster_label(em: int):
+    return MONSTERS[em] if isinstance(em, int) and 0 <= em < len(MONSTERS) else em
+
+
+def _fmt_value(field_name, v):
+    if field_name in _ROAD_MONSTER_FIELDS or field_name == "monster_id":
+        return _monster_label(v)
+    return v
+
+
+def describe(edit: Edit) -> str:
+    """One-line human description, e.g. 'multi group 7 entry 3: SpawnWeighting=40'."""
+    k = edit.key
+    if edit.section in ROAD_SECTIONS:
+        mode = edit.section.split(".")[0]
+        where = f"{mode} floor {k['floor']}" if "floor" in k else f"{mode} group {k['group']} entry {k['entry']}"
+    elif edit.section == MONSTER:
+        where = "monster" if edit.op == ADD else \
+            f"monster {_monster_label(k['monster'])}" + (f" #{k['nth'] + 1}" if k["nth"] else "")
+    else:
+        where = edit.section if edit.op == ADD else \
+            f"{edit.section} item {k['item']}" + (f" #{k['nth'] + 1}" if k["nth"] else "")
+
+    if edit.op == SET:
+        return f"{where}: {edit.field}={_fmt_value(edit.field, edit.value)}"
+    if edit.op == REMOVE:
+        return f"{where}: remove"
+    if edit.section == CATSHOP:
+        return f"{where}: add item {edit.value}"
+    row = edit.value if isinstance(edit.value, dict) else {}
+    if edit.section == MONSTER:
+        return f"{where}: add {_monster_label(row.get('monster_id'))}"
+    return f"{where}: add item {row.get('item')} (price {row.get('price')})"
+
+
+# ----------------------------
+# Row keys (shared by diff and replay)
+# ----------------------------
+
+def _monster_values(r: MonsterPoints) -> dict:
+    return {f: getattr(r, f) for f in MONSTER_FIELDS}
+
+
+def _medal_values(r: MedalItem) -> dict:
+    return {"item": r.item, "price": r.price}
+
+
+def _catshop_items(rows: list[CatShopItem]) -> list[int]:
+    """The Cat Shop as the game sees it: a flat item list packed two per row."""
+    return [int(v) for r in rows for v in (r.item_id, r.item_id2) if int(v) != 0]
+
+
+def _keys(ids: list[int]) -> list[tuple[int, int]]:
+    """(id, nth occurrence) for each position."""
+    seen: dict[int, int] = {}
+    out = []
+    for v in ids:
+        out.append((v, seen.get(v, 0)))
+        seen[v] = seen.get(v, 0) + 1
+    return out
+
+
+def _list_spec(section: str):
+    """(id name, row -> id, row -> value dict or None, settable fields) for keyed list sections."""
+    if section == MONSTER:
+        return "monster", (lambda r: r.monster_id), _monster_values, MONSTER_FIELDS
+    if section == MEDALSHOP:
+        return "item", (lambda r: r.item), _medal_values, MEDAL_FIELDS
+    return "item", (lambda r: r), None, ["item"]   # CATSHOP: rows are plain item IDs
+
+
+# ----------------------------
+# Diff (recording)
+# ----------------------------
+
+def diff_road(mode: str, before: RoadSection, after: RoadSection) -> list[Edit]:
+    edits = []
+    for i, (a, b) in enumerate(zip(before.floor_stats, after.floor_stats)):
+        for f in BUNDLE_FIELDS["floor_stats"]:
+            if getattr(a, f) != getattr(b, f):
+                edits.append(Edit(SET, f"{mode}.floor", {"floor": i}, f, getattr(b, f), getattr(a, f)))
+    for g, (ga, gb) in enumerate(zip(before.spawn_tables, after.spawn_tables)):
+        for i, (a, b) in enumerate(zip(ga, gb)):
+            for f in BUNDLE_FIELDS["spawn_tables"]:
+                if getattr(a, f) != getattr(b, f):
+                    edits.append(Edit(SET, f"{mode}.spawn", {"group": g, "entry": i}, f,
+                                      getattr(b, f), getattr(a, f)))
+    return edits
+
+
+def diff_list(section: str, before: list, after: list) -> list[Edit]:
+    """
+    Diff a keyed list section (MONSTER, MEDALSHOP, or CATSHOP as a flat item list).
+    Rows are aligned on their IDs; equal-length replaced runs become field edits.
+    """
+    id_name, row_id, row_values, fields = _list_spec(section)
+    keys = _keys([row_id(r) for r in before])
+    ids_after = [row_id(r) for r in after]
+
+    def key(i):
+        return {id_name: keys[i][0], "nth": keys[i][1]}
+
+    def set_edits(i, b_row):
+        a_vals = row_values(before[i]) if row_values else {"item": before[i]}
+        b_vals = row_values(b_row) if row_values else {"item": b_row}
+        return [Edit(SET, section, key(i), f, b_vals[f], a_vals[f]) for f in fields if a_vals[f] != b_vals[f]]
+
+    def add_edit(j, i1):
+        anchor = END if i1 == len(before) else (START if i1 == 0 else key(i1 - 1))
+        value = row_values(after[j]) if row_values else after[j]
+        count = sum(1 for r in after[:j + 1] if (row_values(r) if row_values else r) == value)
+        return Edit(ADD, section, {}, value=value, after=anchor, count=count)
+
+    edits = []
+    sm = difflib.SequenceMatcher(None, [k[0] for k in keys], ids_after, autojunk=False)
+    for tag, i1, i2, j1, j2 in sm.get_opcodes():
+        if tag == "equal" or (tag == "replace" and i2 - i1 == j2 - j1):
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                edits.extend(set_edits(i, after[j]))
+            continue
+        if tag in ("delete", "replace"):
+            edits.extend(Edit(REMOVE, section, key(i)) for i in range(i1, i2))
+        if tag in ("insert", "replace"):
+            edits.extend(add_edit(j, i1) for j in range(j1, j2))
+    return edits
+
+
+def diff_section(section: str, before, after) -> list[Edit]:
+    """Dispatch on a recorder section name: 'multi'/'solo' (RoadSection), MONSTER, CATSHOP, MEDALSHOP."""
+    if section in ("multi", "solo"):
+        return diff_road(section, before, after)
+    if section == CATSHOP:
+        return diff_list(CATSHOP, _catshop_items(before), _catshop_items(after))
+    return diff_list(section, before, after)
+
+
+class SectionRecorder:
+    """
+    Records semantic edits for one section of an open editor: a deep copy is taken
+    at construction and edits() diffs it against what get_rows() returns now.
+    A baseline (a deep copy made elsewhere, e.g. on a loader thread) can be passed in.
+    """
+
+    def __init__(self, section: str, get_rows: Callable[[], object], baseline=None):
+        self.section = section
+        self.get_rows = get_rows
+        self.baseline = copy.deepcopy(get_rows()) if baseline is None else baseline
+
+    def edits(self) -> list[Edit]:
+        return diff_section(self.section, self.baseline, self.get_rows())
+
+
+# ----------------------------
+# File I/O
+# ----------------------------
+
+def write_edits(edits: list[Edit], path) -> None:
+    doc = {"format": EDITS_FORMAT, "version": EDITS_VERSION, "edits": [e.todict() for e in edits]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=1, ensure_ascii=False)
+        f.write("\n")
+
+
+def read_edits(path) -> list[Edit]:
+    with open(path, "r", encoding="utf-8") as f:
+        doc = json.load(f)
+    if not isinstance(doc, dict) or doc.get("format") != EDITS_FORMAT:
+        raise ValueError(f"Not a {EDITS_FORMAT} file")
+    if int(doc.get("version", 0)) > EDITS_VERSION:
+        raise ValueError(f"Unsupported edits version {doc.get('version')}")
+    edits, problems = [], []
+    for i, d in enumerate(doc.get("edits", [])):
+        try:
+            edits.append(Edit.fromdict(d))
+        except (KeyError, TypeError, ValueError) as e:
+            problems.append(f"edits[{i}]: {e}")
+    if problems:
+        raise ValueError("Invalid edits file:\n  " + "\n  ".join(problems))
+    return edits
+
+
+# ----------------------------
+# Replay
+# ----------------------------
+
+@dataclass
+class Conflict:
+    edit: Edit
+    reason: str
+
+
+@dataclass
+class ReplayReport:
+    applied: list[Edit] = field(default_factory=list)
+    already: list[Edit] = field(default_factory=list)     # target already had the edit
+    conflicts: list[Conflict] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.conflicts
+
+    def format(self) -> str:
+        lines = [f"{len(self.applied)} applied, {len(self.already)} already present, "
+                 f"{len(self.conflicts)} conflict(s)"]
+        lines += [f"  CONFLICT {describe(c.edit)} — {c.reason}" for c in self.conflicts]
+        return "\n".join(lines)
+
+
+def _same(a, b) -> bool:
+    """Equality as stored in the BIN (floats are float32 on disk)."""
+    if isinstance(a, float) or isinstance(b, float):
+        return struct.pack("<f", a) == struct.pack("<f", b)
+    return a == b
+
+
+def _check_set(report: ReplayReport, edit: Edit, current, force: bool) -> bool:
+    """True when the SET should be written."""
+    if _same(current, edit.value):
+        report.already.append(edit)
+        return False
+    if edit.was is not None and not _same(current, edit.was) and not force:
+        report.conflicts.append(Conflict(edit, f"expected {edit.field}={_fmt_value(edit.field, edit.was)}, "
+                                               f"found {_fmt_value(edit.field, current)}"))
+        return False
+    report.applied.append(edit)
+    return True
+
+
+def _bad_value(section: str, field_name: str, value) -> str | None:
+    """json_io.check_value() for an edit's field (a Cat Shop "item" is an Item ID slot)."""
+    if section in ROAD_SECTIONS:
+        column = "floor_stats" if section.endswith("floor") else "spawn_tables"
+    elif section == CATSHOP:
+        column, field_name = "catshop", "item_id"
+    else:
+        column = "monster_points" if section == MONSTER else "medalshop"
+    problem = check_value(column, field_name, value)
+    return f"bad {field_name}: {problem}" if problem else None
+
+
+def _bad_row(section: str, value) -> str | None:
+    """What is wrong with the row of an ADD, or None."""
+    if section == CATSHOP:
+        return _bad_value(section, "item", value)
+    if not isinstance(value, dict):
+        return "bad row: expected an object"
+    for f in MONSTER_FIELDS if section == MONSTER else MEDAL_FIELDS:
+        if f not in value:
+            return f"bad row: missing {f}"
+        problem = _bad_value(section, f, value[f])
+        if problem:
+            return problem
+    return None
+
+
+def check_edit(edit: Edit) -> str | None:
+    """What is wrong with the value of a set or the row of an add (see replay()), or None."""
+    if edit.op == SET:
+        return _bad_value(edit.section, edit.field, edit.value)
+    if edit.op == ADD:
+        return _bad_row(edit.section, edit.value)
+    return None
+
+
+def _replay_road(edits: list[Edit], bundle: RoadBundle, report: ReplayReport, force: bool) -> None:
+    for e in edits:
+        sec: RoadSection | None = getattr(bundle, e.section.split(".")[0])
+        k = e.key
+        try:
+            if sec is None:
+                raise IndexError
+            obj = sec.floor_stats[k["floor"]] if "floor" in k else sec.spawn_tables[k["group"]][k["entry"]]
+        except IndexError:
+            report.conflicts.append(Conflict(e, "row does not exist in this file"))
+            continue
+        if e.field not in BUNDLE_FIELDS["spawn_tables" if "group" in k else "floor_stats"]:
+            report.conflicts.append(Conflict(e, f"unknown field {e.field!r}"))
+            continue
+        problem = _bad_value(e.section, e.field, e.value)
+        if problem:
+            report.conflicts.append(Conflict(e, problem))
+            continue
+        if _check_set(report, e, getattr(obj, e.field), force):
+            setattr(obj, e.field, type(getattr(obj, e.field))(e.value))
+
+
+def _new_row(section: str, value):
+    if section == MONSTER:
+        return MonsterPoints(offset=-1, **{f: int(value[f]) for f in MONSTER_FIELDS})
+    if section == MEDALSHOP:
+        return MedalItem(item=int(value["item"]), random=_MEDAL_FLAG1, quantity=_MEDAL_FLAG2,
+                         price=int(value["price"]))
+    return int(value)
+
+
+def _resolve_list(section: str, edits: list[Edit], rows: list, report: ReplayReport, force: bool):
+    """
+    Resolve keyed edits against 'rows': returns (slots, inserts). slots[i][0] is row i
+    (edited in place), its new value (plain-ID sections) or None once removed; inserts
+    maps START / END / original row index to the rows added there. Keys resolve against
+    the rows as they were before this replay, so edit order inside a section does not
+    matter (adds are resolved after every set/remove).
+    """
+    id_name, row_id, row_values, fields = _list_spec(section)
+    signature = row_values or (lambda r: r)
+    slots = [[r] for r in rows]   # one mutable cell per original row
+    index = {k: i for i, k in enumerate(_keys([row_id(r) for r in rows]))}
+    inserts: dict[object, list] = {}
+
+    def lookup(key):
+        return index.get((key[id_name], key.get("nth", 0)))
+
+    for e in [e for e in edits if e.op != ADD]:
+        i = lookup(e.key)
+        if i is None or slots[i][0] is None:
+            id_field = "monster_id" if section == MONSTER else "item"
+            if e.op == REMOVE or (e.field == id_field and any(
+                    s[0] is not None and row_id(s[0]) == e.value for s in slots)):
+                report.already.append(e)
+            else:
+                report.conflicts.append(Conflict(e, "row does not exist in this file"))
+            continue
+        if e.op == REMOVE:
+            slots[i][0] = None
+            report.applied.append(e)
+            continue
+        if e.field not in fields:
+            report.conflicts.append(Conflict(e, f"unknown field {e.field!r}"))
+            continue
+        problem = _bad_value(section, e.field, e.value)
+        if problem:
+            report.conflicts.append(Conflict(e, problem))
+            continue
+        row = slots[i][0]
+        current = row_values(row)[e.field] if row_values else row
+        if not _check_set(report, e, current, force):
+            continue
+        if row_values:
+            setattr(row, e.field, int(e.value))
+        else:
+            slots[i][0] = int(e.value)
+
+    for e in [e for e in edits if e.op == ADD]:
+        problem = _bad_row(section, e.value)
+        if problem:
+            report.conflicts.append(Conflict(e, problem))
+            continue
+        new = _new_row(section, e.value)
+        if e.count is not None:
+            sig = signature(new)
+            equal = sum(1 for s in slots if s[0] is not None and signature(s[0]) == sig) + \
+                sum(1 for added in inserts.values() for r in added if signature(r) == sig)
+            if equal >= e.count:
+                report.already.append(e)
+                continue
+        if isinstance(e.after, dict):
+            anchor = lookup(e.after)
+            if anchor is None and not force:
+                report.conflicts.append(Conflict(e, f"anchor row {e.after} not found"))
+                continue
+            anchor = END if anchor is None else anchor
+        else:
+            anchor = e.after if e.after in (START, END) else END
+        inserts.setdefault(anchor, []).append(new)
+        report.applied.append(e)
+    return slots, inserts
+
+
+def _replay_list(section: str, edits: list[Edit], rows: list, report: ReplayReport, force: bool) -> list:
+    """Apply keyed edits to 'rows' and return the new list (see _resolve_list)."""
+    slots, inserts = _resolve_list(section, edits, rows, report, force)
+    out = list(inserts.get(START, []))
+    for i, (r,) in enumerate(slots):
+        if r is not None:
+            out.append(r)
+        out.extend(inserts.get(i, []))
+    out.extend(inserts.get(END, []))
+    return out
+
+
+def _replay_catshop(edits: list[Edit], rows: list[CatShopItem], report: ReplayReport, force: bool) -> list:
+    """
+    Cat Shop edits are keyed on the flat item list, but applied to the existing
+    two-slot rows: a set rewrites its slot, a remove zeroes it (a row emptied that
+    way is dropped), and added items fill the free second slot of the anchor row
+    or go into new rows right after it. Untouched rows keep their layout and fields.
+    """
+    positions = [(r, attr) for r in rows for attr in ("item_id", "item_id2") if int(getattr(r, attr)) != 0]
+    items = [int(getattr(r, attr)) for r, attr in positions]
+    slots, inserts = _resolve_list(CATSHOP, edits, items, report, force)
+
+    emptied = set()
+    for (row, attr), old, (new,) in zip(positions, items, slots):
+        if new is None:
+            setattr(row, attr, 0)
+            emptied.add(id(row))
+        elif new != old:
+            setattr(row, attr, new)
+
+    def place(after_row, added: list[int]) -> list[CatShopItem]:
+        """Fill after_row's free second slot, then pack the rest two per new row."""
+        added = list(added)
+        if after_row is not None and added and int(after_row.item_id) != 0 and int(after_row.item_id2) == 0:
+            after_row.item_id2 = added.pop(0)
+        return [CatShopItem(item_id=added[i], item_id2=added[i + 1] if i + 1 < len(added) else 0)
+                for i in range(0, len(added), 2)]
+
+    after_row: dict[int, list[int]] = {}
+    for i, added in inserts.items():
+        if i not in (START, END):
+            after_row.setdefault(id(positions[i][0]), []).extend(added)
+
+    out = place(None, inserts.get(START, []))
+    for r in rows:
+        if id(r) in emptied and int(r.item_id) == 0 and int(r.item_id2) == 0:
+            continue
+        out.append(r)
+        out.extend(place(r, after_row.get(id(r), [])))
+    out.extend(place(out[-1] if out else None, inserts.get(END, [])))
+    return out
+
+
+def replay(edits: list[Edit], bundle: RoadBundle, *, force: bool = False) -> ReplayReport:
+    """
+    Apply semantic edits to a bundle in place. An edit whose 'was' value no longer
+    matches, whose row is gone, or whose value does not fit its column (the
+    json_io.check_value limits) is reported as a conflict and skipped (force=True
+    applies value edits anyway and appends rows whose anchor is missing).
+    """
+    report = ReplayReport()
+    by_section: dict[str, list[Edit]] = {}
+    for e in edits:
+        by_section.setdefault(e.section, []).append(e)
+
+    _replay_road([e for s in ROAD_SECTIONS for e in by_section.get(s, [])], bundle, report, force)
+
+    if MONSTER in by_section:
+        if bundle.monster_points is None:
+            report.conflicts.extend(Conflict(e, "no mhfdat.bin loaded") for e in by_section[MONSTER])
+        else:
+            bundle.monster_points = _replay_list(MONSTER, by_section[MONSTER], bundle.monster_points, report, force)
+    if CATSHOP in by_section:
+        if bundle.catshop is None:
+            report.conflicts.extend(Conflict(e, "no mhfdat.bin loaded") for e in by_section[CATSHOP])
+        else:
+            bundle.catshop.rows = _replay_catshop(by_section[CATSHOP], bundle.catshop.rows, report, force)
+    if MEDALSHOP in by_section:
+        if bundle.medalshop is None:
+            report.conflicts.extend(Conflict(e, "no mhfdat.bin loaded") for e in by_section[MEDALSHOP])
+        else:
+            bundle.medalshop.rows = _replay_list(MEDALSHOP, by_section[MEDALSHOP], bundle.medalshop.rows,
+                                                 report, force)
+    return report
+
+
+def replay_files(edits_path, *, rengoku_template=None, rengoku_out=None, mhfdat_template=None,
+                 mhfdat_out=None, force: bool = False, strict: bool = False) -> ReplayReport:
+    """
+    Replay an edits file onto new game files. Clean edits are written even when others
+    conflict, unless strict=True (then nothing is written if anything conflicts).
+    """
+    from .json_io import bundle_from_files, apply_bundle
+
+    edits = read_edits(edits_path)
+    bundle = bundle_from_files(rengoku_template, mhfdat_template)
+    report = replay(edits, bundle, force=force)
+    if strict and report.conflicts:
+        return report
+    apply_bundle(bundle, rengoku_template=rengoku_template, rengoku_out=rengoku_out,
+                 mhfdat_template=mhfdat_template, mhfdat_out=mhfdat_out)
+    return report
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m core.semantic_patch",
+                                 description="Replay semantic edits onto a new game dump")
+    ap.add_argument("edits", help="edits file exported from the editors")
+    ap.add_argument("--rengoku", help="rengoku_data.bin to apply onto")
+    ap.add_argument("--mhfdat", help="mhfdat.bin to apply onto")
+    ap.add_argument("--rengoku-out", help="output rengoku_data.bin (default: <input>.patched.bin)")
+    ap.add_argument("--mhfdat-out", help="output mhfdat.bin (default: <input>.patched.bin)")
+    ap.add_argument("--force", action="store_true", help="apply value edits even when 'was' does not match")
+    ap.add_argument("--strict", action="store_true", help="write nothing if any edit conflicts")
+    ap.add_argument("--list", action="store_true", help="only print the edits")
+    args = ap.parse_args(argv)
+
+    if args.list:
+        for e in read_edits(args.edits):
+            print(describe(e))
+        return 0
+
+    def _out(src, out):
+        return out or (os.path.splitext(src)[0] + ".patched.bin" if src else None)
+
+    report = replay_files(args.edits, rengoku_template=args.rengoku, rengoku_out=_out(args.rengoku, args.rengoku_out),
+                          mhfdat_template=args.mhfdat, mhfdat_out=_out(args.mhfdat, args.mhfdat_out),
+                          force=args.force, strict=args.strict)
+    print(report.format())
+    return 0 if report.ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,468 @@
+# core/server.py
+"""
+Local JSON-RPC 2.0 edit server: open rengoku_data.bin / mhfdat.bin once, keep the
+parsed sections in memory and serve reads, queries and batched edits.
+
+  python -m core.server --rengoku rengoku_data.bin --mhfdat mhfdat.bin --socket /tmp/road.sock
+  python -m core.server --rengoku rengoku_data.bin --port 8765        # 127.0.0.1 only
+
+Transport: one JSON-RPC request (or batch array) per line, one response line back.
+Methods:
+  info                                       paths, table sizes, unflushed edit counts
+  get      {section, group?, start?, limit?} rows of one section (road spawn rows per group)
+  query    {section, where, limit?}          rows whose fields match ({"field": v} or {"field": [min, max]})
+  edit     {edits, force?}                   semantic edits (core.semantic_patch format), applied in memory,
+                                             all or nothing (a bad value fails the whole call)
+  flush    {}                                write pending edits to disk
+  reload   {}                                re-read both files, dropping unflushed edits
+  shutdown {}                                stop the server (unflushed edits are lost)
+
+Sections: multi.floor, multi.spawn, solo.floor, solo.spawn, monster, catshop, medalshop.
+
+flush() writes only what changed: each edited road record is written at its
+offset in rengoku_data.bin (the file keeps its layout), and mhfdat.bin goes
+through json_io.apply_bundle, which saves only the sections that differ.
+
+  with RpcClient("/tmp/road.sock") as rpc:
+      rpc.call("edit", edits=[{"op": "set", "section": "multi.spawn", "group": 7, "entry": 3,
+                               "field": "SpawnWeighting", "value": 40}])
+      rpc.call("flush")
+"""
+from __future__ import annotations
+
+import copy
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+
+from .constants import MONSTERS
+from .json_io import BUNDLE_FIELDS, RoadBundle, row_values, bundle_from_files, apply_bundle
+from .patch import pwrite
+from .semantic_patch import ROAD_SECTIONS, MONSTER, CATSHOP, MEDALSHOP, Edit, check_edit, describe, replay
+
+SECTIONS = ROAD_SECTIONS + (MONSTER, CATSHOP, MEDALSHOP)
+MHFDAT_SECTIONS = (MONSTER, CATSHOP, MEDALSHOP)
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+MAX_LINE = 64 << 20
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class StaleFileError(ValueError):
+    """The file changed on disk since it was loaded; flushing would overwrite someone else's save."""
+
+
+# ----------------------------
+# Session (resident data)
+# ----------------------------
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _nth_keys(ids: list) -> list[int]:
+    seen: dict = {}
+    out = []
+    for i in ids:
+        out.append(seen.get(i, 0))
+        seen[i] = out[-1] + 1
+    return out
+
+
+class EditSession:
+    """Parsed files kept in memory, with the edits made since the last flush."""
+
+    def __init__(self, rengoku_path=None, mhfdat_path=None):
+        if not rengoku_path and not mhfdat_path:
+            raise ValueError("give a rengoku_data.bin and/or an mhfdat.bin")
+        self.rengoku_path = os.fspath(rengoku_path) if rengoku_path else None
+        self.mhfdat_path = os.fspath(mhfdat_path) if mhfdat_path else None
+        self.lock = threading.RLock()
+        self.reload()
+
+    def reload(self) -> None:
+        with self.lock:
+            self.bundle: RoadBundle = bundle_from_files(self.rengoku_path, self.mhfdat_path)
+            self.stamps = {p: _stamp(p) for p in (self.rengoku_path, self.mhfdat_path) if p}
+            self.dirty_records: dict[int, object] = {}   # file offset -> SpawnTable / FloorStats
+            self.mhfdat_dirty = False
+
+    # ---- reads ----
+    def _road(self, section: str):
+        sec = getattr(self.bundle, section.split(".")[0])
+        if sec is None:
+            raise ValueError(f"{section}: no rengoku_data.bin loaded")
+        return sec
+
+    def rows(self, section: str, group: int | None = None) -> list[dict]:
+        """Every row of a section as a dict carrying its edit key (group/entry, floor, monster/item + nth)."""
+        if section not in SECTIONS:
+            raise ValueError(f"unknown section {section!r} (expected one of {', '.join(SECTIONS)})")
+        if section in ROAD_SECTIONS:
+            sec = self._road(section)
+            if section.endswith("floor"):
+                fields = BUNDLE_FIELDS["floor_stats"]
+                return [{"floor": i, **dict(zip(fields, row_values("floor_stats", fs)))}
+                        for i, fs in enumerate(sec.floor_stats)]
+            fields = BUNDLE_FIELDS["spawn_tables"]
+            groups = range(len(sec.spawn_tables)) if group is None else [group]
+            return [{"group": g, "entry": i, **dict(zip(fields, row_values("spawn_tables", sp)))}
+                    for g in groups for i, sp in enumerate(sec.spawn_tables[g])]
+        if self.bundle.monster_points is None:
+            raise ValueError(f"{section}: no mhfdat.bin loaded")
+        if section == MONSTER:
+            rows = self.bundle.monster_points
+            nths = _nth_keys([r.monster_id for r in rows])
+            fields = BUNDLE_FIELDS["monster_points"]
+            return [{"monster": MONSTERS[r.monster_id] if r.monster_id < len(MONSTERS) else r.monster_id,
+                     "nth": n, **dict(zip(fields, row_values("monster_points", r)))} for r, n in zip(rows, nths)]
+        if section == CATSHOP:
+            items = [i for r in self.bundle.catshop.rows for i in (r.item_id, r.item_id2) if i]
+            return [{"item": i, "nth": n} for i, n in zip(items, _nth_keys(items))]
+        rows = self.bundle.medalshop.rows
+        nths = _nth_keys([r.item for r in rows])
+        return [{"item": r.item, "nth": n, "flag1": r.random, "flag2": r.quantity, "price": r.price}
+                for r, n in zip(rows, nths)]
+
+    def info(self) -> dict:
+        out = {"rengoku": self.rengoku_path, "mhfdat": self.mhfdat_path,
+               "pending_records": len(self.dirty_records), "mhfdat_dirty": self.mhfdat_dirty}
+        for mode in ("multi", "solo"):
+            sec = getattr(self.bundle, mode)
+            if sec is not None:
+                out[mode] = {"floors": len(sec.floor_stats), "groups": len(sec.spawn_tables),
+                             "entries": sum(len(g) for g in sec.spawn_tables)}
+        if self.bundle.monster_points is not None:
+            out["monster_rows"] = len(self.bundle.monster_points)
+            out["catshop_rows"] = len(self.bundle.catshop.rows)
+            out["medalshop_rows"] = len(self.bundle.medalshop.rows)
+        return out
+
+    # ---- edits ----
+    def _record(self, e: Edit):
+        sec = self._road(e.section)
+        k = e.key
+        return sec.floor_stats[k["floor"]] if "floor" in k else sec.spawn_tables[k["group"]][k["entry"]]
+
+    def _snapshot(self, edits: list[Edit]):
+        """Field values of the road records and copies of the mhfdat rows that 'edits' can change."""
+        records = {}
+        for e in edits:
+            if e.section in ROAD_SECTIONS:
+                try:
+                    obj = self._record(e)
+                except (KeyError, IndexError, TypeError, ValueError):
+                    continue   # replay reports it as a conflict
+                section = "floor_stats" if e.section.endswith("floor") else "spawn_tables"
+                records[id(obj)] = (obj, section, row_values(section, obj))
+        mhfdat = None
+        if any(e.section in MHFDAT_SECTIONS for e in edits):
+            b = self.bundle
+            mhfdat = copy.deepcopy((b.monster_points, b.catshop, b.medalshop))
+        return records, mhfdat
+
+    def _restore(self, snapshot) -> None:
+        records, mhfdat = snapshot
+        for obj, section, values in records.values():
+            for f, v in zip(BUNDLE_FIELDS[section], values):
+                setattr(obj, f, v)
+        if mhfdat is not None:
+            self.bundle.monster_points, self.bundle.catshop, self.bundle.medalshop = mhfdat
+
+    def edit(self, edits: list[Edit], *, force: bool = False):
+        """
+        Apply a batch of edits all-or-nothing: every value is checked before anything
+        changes (ValueError listing the bad ones), and if replay fails part way the
+        touched rows are put back.
+        """
+        problems = [f"{describe(e)}: {p}" for e in edits if (p := check_edit(e))]
+        if problems:
+            raise ValueError("; ".join(problems))
+        with self.lock:
+            snapshot = self._snapshot(edits)
+            try:
+                report = replay(edits, self.bundle, force=force)
+            except Exception:
+                self._restore(snapshot)
+                raise
+            for e in report.applied:
+                if e.section in ROAD_SECTIONS:
+                    obj = self._record(e)
+                    self.dirty_records[obj.offset] = obj
+                else:
+                    self.mhfdat_dirty = True
+            return report
+
+    def _check_stamp(self, path) -> None:
+        if _stamp(path) != self.stamps[path]:
+            raise StaleFileError(f"{path} changed on disk since it was loaded; reload first")
+
+    def flush(self) -> dict:
+        with self.lock:
+            written = {"records": 0, "mhfdat": False}
+            if self.dirty_records:
+                self._check_stamp(self.rengoku_path)
+                blobs = [(off, self.dirty_records[off].serialize()) for off in sorted(self.dirty_records)]
+                with open(self.rengoku_path, "r+b") as f:
+                    for off, blob in blobs:
+                        pwrite(f, blob, off)
+                written["records"] = len(self.dirty_records)
+                self.dirty_records.clear()
+                self.stamps[self.rengoku_path] = _stamp(self.rengoku_path)
+            if self.mhfdat_dirty:
+                from .mhfdat_io import parse_mhfdat
+                self._check_stamp(self.mhfdat_path)
+                tmp = f"{self.mhfdat_path}.{os.getpid()}.tmp"
+                try:
+                    apply_bundle(self.bundle, mhfdat_template=self.mhfdat_path, mhfdat_out=tmp)
+                    os.replace(tmp, self.mhfdat_path)
+                finally:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+                # the savers recompute RoadEntries / CatShopItemCounter; keep the resident copy in step
+                self.bundle.counters = parse_mhfdat(self.mhfdat_path)["counters"]
+                self.mhfdat_dirty = False
+                self.stamps[self.mhfdat_path] = _stamp(self.mhfdat_path)
+                written["mhfdat"] = True
+            return written
+
+
+# ----------------------------
+# JSON-RPC dispatch
+# ----------------------------
+
+def _match(row: dict, where: dict) -> bool:
+    for f, want in where.items():
+        v = row.get(f)
+        if isinstance(want, list) and len(want) == 2:
+            if v is None or not want[0] <= v <= want[1]:
+                return False
+        elif v != want:
+            return False
+    return True
+
+
+class RpcHandler:
+    """Maps method names to EditSession calls; shared by every connection."""
+
+    def __init__(self, session: EditSession):
+        self.session = session
+        self.stop = threading.Event()
+
+    def rpc_info(self):
+        return self.session.info()
+
+    def rpc_get(self, section, group=None, start=0, limit=None):
+        with self.session.lock:
+            rows = self.session.rows(section, group)
+        return rows[start:None if limit is None else start + limit]
+
+    def rpc_query(self, section, where, limit=None):
+        if not isinstance(where, dict):
+            raise ValueError("'where' must be an object")
+        with self.session.lock:
+            rows = [r for r in self.session.rows(section) if _match(r, where)]
+        return rows if limit is None else rows[:limit]
+
+    def rpc_edit(self, edits, force=False):
+        report = self.session.edit([Edit.fromdict(d) for d in edits], force=bool(force))
+        return {"applied": len(report.applied), "already": len(report.already),
+                "conflicts": [f"{describe(c.edit)} — {c.reason}" for c in report.conflicts]}
+
+    def rpc_flush(self):
+        return self.session.flush()
+
+    def rpc_reload(self):
+        self.session.reload()
+        return self.session.info()
+
+    def rpc_shutdown(self):
+        self.stop.set()
+        return True
+
+    def call(self, req) -> dict | None:
+        """Handle one request object; returns the response (None for notifications)."""
+        rid = req.get("id") if isinstance(req, dict) else None
+        try:
+            if not isinstance(req, dict) or req.get("jsonrpc") != "2.0" or not isinstance(req.get("method"), str):
+                raise RpcError(INVALID_REQUEST, "invalid request")
+            fn = getattr(self, "rpc_" + req["method"], None)
+            if fn is None:
+                raise RpcError(METHOD_NOT_FOUND, f"method not found: {req['method']}")
+            params = req.get("params", {})
+            try:
+                result = fn(*params) if isinstance(params, list) else fn(**params)
+            except TypeError as e:
+                raise RpcError(INVALID_PARAMS, str(e)) from None
+            except (ValueError, KeyError, IndexError) as e:
+                code = SERVER_ERROR if isinstance(e, StaleFileError) else INVALID_PARAMS
+                raise RpcError(code, f"{type(e).__name__}: {e}") from None
+            except (OSError, struct.error, OverflowError) as e:
+                raise RpcError(SERVER_ERROR, f"{type(e).__name__}: {e}") from None
+        except RpcError as e:
+            return {"jsonrpc": "2.0", "id": rid, "error": {"code": e.code, "message": str(e)}}
+        if "id" not in req:
+            return None
+        return {"jsonrpc": "2.0", "id": rid, "result": result}
+
+    def handle_line(self, line: bytes) -> bytes | None:
+        try:
+            msg = json.loads(line)
+        except ValueError as e:
+            return self._encode({"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(e)}})
+        if isinstance(msg, list):
+            if not msg:
+                return self._encode({"jsonrpc": "2.0", "id": None,
+                                     "error": {"code": INVALID_REQUEST, "message": "empty batch"}})
+            out = [r for r in (self.call(m) for m in msg) if r is not None]
+            return self._encode(out) if out else None
+        resp = self.call(msg)
+        return self._encode(resp) if resp is not None else None
+
+    @staticmethod
+    def _encode(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+class _StreamHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        rpc: RpcHandler = self.server.rpc
+        while not rpc.stop.is_set():
+            line = self.rfile.readline(MAX_LINE)
+            if not line:
+                break
+            if not line.strip():
+                continue
+            out = rpc.handle_line(line)
+            if out is not None:
+                self.wfile.write(out)
+                self.wfile.flush()
+            if rpc.stop.is_set():
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+
+
+class _TcpServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+def make_server(session: EditSession, *, socket_path=None, host="127.0.0.1", port=0):
+    """Bind a threading server (Unix socket when socket_path is given, else TCP) for the session."""
+    if socket_path:
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise ValueError("Unix sockets are not available on this platform; use --port")
+        if os.path.exists(socket_path):
+            os.remove(socket_path)   # stale socket from a previous run
+        server = _UnixServer(os.fspath(socket_path), _StreamHandler)
+        os.chmod(socket_path, 0o600)
+    else:
+        server = _TcpServer((host, port), _StreamHandler)
+    server.rpc = RpcHandler(session)
+    return server
+
+
+# ----------------------------
+# Client
+# ----------------------------
+
+class RpcClient:
+    """Minimal blocking client: RpcClient('/tmp/road.sock') or RpcClient(('127.0.0.1', 8765))."""
+
+    def __init__(self, address):
+        if isinstance(address, (str, os.PathLike)):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(os.fspath(address))
+        else:
+            self.sock = socket.create_connection(tuple(address))
+        self.file = self.sock.makefile("rwb")
+        self._next_id = 0
+
+    def _send(self, payload):
+        self.file.write(RpcHandler._encode(payload))
+        self.file.flush()
+        line = self.file.readline(MAX_LINE)
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    def call(self, method: str, **params):
+        self._next_id += 1
+        resp = self._send({"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params})
+        if "error" in resp:
+            raise RpcError(resp["error"]["code"], resp["error"]["message"])
+        return resp["result"]
+
+    def batch(self, calls: list[tuple[str, dict]]) -> list:
+        """Send several calls in one round trip; results (or RpcError instances) in call order."""
+        reqs = []
+        for method, params in calls:
+            self._next_id += 1
+            reqs.append({"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params})
+        by_id = {r["id"]: r for r in self._send(reqs)}
+        return [RpcError(by_id[q["id"]]["error"]["code"], by_id[q["id"]]["error"]["message"])
+                if "error" in by_id[q["id"]] else by_id[q["id"]]["result"] for q in reqs]
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m core.server", description="Local JSON-RPC edit server")
+    ap.add_argument("--rengoku", help="rengoku_data.bin to keep open")
+    ap.add_argument("--mhfdat", help="mhfdat.bin to keep open")
+    ap.add_argument("--socket", help="Unix socket path")
+    ap.add_argument("--port", type=int, help="TCP port on 127.0.0.1 (when no --socket)")
+    args = ap.parse_args(argv)
+    if not args.rengoku and not args.mhfdat:
+        ap.error("give --rengoku and/or --mhfdat")
+    if not args.socket and args.port is None:
+        ap.error("give --socket or --port")
+
+    server = make_server(EditSession(args.rengoku, args.mhfdat), socket_path=args.socket, port=args.port or 0)
+    where = args.socket or "127.0.0.1:%d" % server.server_address[1]
+    print(f"serving on {where}; Ctrl+C to stop", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    pending = server.rpc.session.info()
+    if pending["pending_records"] or pending["mhfdat_dirty"]:
+        print("warning: unflushed edits were discarded", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
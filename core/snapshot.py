@@ -0,0 +1,251 @@
+# core/snapshot.py
+"""
+Columnar .npz snapshots of every road table, for offline analysis with NumPy/pandas.
+
+One uncompressed .npz holds one array per column, named "<table>/<column>":
+  multi_spawn/group, multi_spawn/row, multi_spawn/FirstMonsterID, ...   (uint32)
+  multi_floor/FloorNumber, ..., multi_floor/PointMulti1 (float32), ...
+  solo_spawn/..., solo_floor/...
+  monster_points/monster_id, ...                                        (uint16)
+  catshop/item_id, catshop/item_id2                                     (uint16)
+  medalshop/item, medalshop/flag1, medalshop/flag2, medalshop/price
+  names/monster                  (MONSTERS, index = monster ID)
+  names/item_id, names/item_name (asset/Items.xlsx, when available)
+  meta/json                      (uint8 UTF-8 JSON: format, version, sources)
+
+load_snapshot() memory-maps the file and returns zero-copy read-only views of
+each member (members are stored uncompressed, so each .npy payload is a plain
+byte range of the file). It needs only NumPy: no Qt, no openpyxl.
+
+  snap = load_snapshot("road.npz")
+  df = pandas.DataFrame(snap.table("multi_spawn"))
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+SNAPSHOT_FORMAT = "blaze-road-snapshot"
+SNAPSHOT_VERSION = 1
+
+# table -> [(column, dtype)]; road columns follow json_io.BUNDLE_FIELDS
+_U32, _U16, _U8, _F32 = np.uint32, np.uint16, np.uint8, np.float32
+FLOOR_COLUMNS = [("FloorNumber", _U32), ("SpawnTableUsed", _U32), ("Unk0", _U32),
+                 ("PointMulti1", _F32), ("PointMulti2", _F32), ("FinalLoop", _U32)]
+SPAWN_COLUMNS = [("group", _U32), ("row", _U32),
+                 ("FirstMonsterID", _U32), ("FirstMonsterVariant", _U32), ("SecondMonsterID", _U32),
+                 ("SecondMonsterVariant", _U32), ("MonstersStatTable", _U32), ("MapZoneOverride", _U32),
+                 ("SpawnWeighting", _U32), ("AdditionalFlag", _U32)]
+MONSTER_COLUMNS = [(f, _U16) for f in ("monster_id", "monster_flag", "base_points", "level1_points",
+                                       "level2_points", "level3_points", "level4_points", "level5_points")]
+CATSHOP_COLUMNS = [("item_id", _U16), ("item_id2", _U16)]
+MEDAL_COLUMNS = [("item", _U16), ("flag1", _U8), ("flag2", _U8), ("price", _U16)]
+
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5H3I2H")   # PK\3\4 local file header (30 bytes)
+
+
+# ----------------------------
+# Export
+# ----------------------------
+
+def _columns(prefix: str, spec, rows: list[tuple]) -> dict[str, np.ndarray]:
+    out = {}
+    for ci, (name, dtype) in enumerate(spec):
+        out[f"{prefix}/{name}"] = np.fromiter((r[ci] for r in rows), dtype=dtype, count=len(rows))
+    return out
+
+
+def _file_info(path) -> dict:
+    data = Path(path).read_bytes()
+    return {"path": os.fspath(path), "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def snapshot_arrays(rengoku_path=None, mhfdat_path=None, *, id_to_name: dict[int, str] | None = None,
+                    bundle=None) -> dict[str, np.ndarray]:
+    """Build the snapshot's column arrays from the BIN(s) (or an existing RoadBundle)."""
+    from .constants import MONSTERS
+    from .json_io import bundle_from_files, row_values
+
+    if bundle is None:
+        bundle = bundle_from_files(rengoku_path, mhfdat_path)
+    arrays: dict[str, np.ndarray] = {}
+
+    for mode in ("multi", "solo"):
+        sec = getattr(bundle, mode)
+        if sec is None:
+            continue
+        arrays.update(_columns(f"{mode}_floor", FLOOR_COLUMNS,
+                               [tuple(row_values("floor_stats", fs)) for fs in sec.floor_stats]))
+        arrays.update(_columns(f"{mode}_spawn", SPAWN_COLUMNS,
+                               [(g, i, *row_values("spawn_tables", sp))
+                                for g, group in enumerate(sec.spawn_tables) for i, sp in enumerate(group)]))
+    if bundle.monster_points is not None:
+        arrays.update(_columns("monster_points", MONSTER_COLUMNS,
+                               [tuple(row_values("monster_points", r)) for r in bundle.monster_points]))
+    if bundle.catshop is not None:
+        arrays.update(_columns("catshop", CATSHOP_COLUMNS, [(r.item_id, r.item_id2) for r in bundle.catshop.rows]))
+    if bundle.medalshop is not None:
+        arrays.update(_columns("medalshop", MEDAL_COLUMNS,
+                               [tuple(row_values("medalshop", r)) for r in bundle.medalshop.rows]))
+
+    arrays["names/monster"] = np.array(MONSTERS, dtype=str)
+    if id_to_name is None and (bundle.catshop is not None or bundle.medalshop is not None):
+        from .items import load_item_names
+        id_to_name = load_item_names()
+    if id_to_name:
+        ids = sorted(id_to_name)
+        arrays["names/item_id"] = np.array(ids, dtype=_U32)
+        arrays["names/item_name"] = np.array([id_to_name[i] for i in ids], dtype=str)
+
+    meta = {"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION,
+            "sources": {k: _file_info(p) for k, p in (("rengoku", rengoku_path), ("mhfdat", mhfdat_path)) if p}}
+    arrays["meta/json"] = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=_U8)
+    return arrays
+
+
+def write_snapshot(dest, rengoku_path=None, mhfdat_path=None, *, id_to_name: dict[int, str] | None = None,
+                   bundle=None) -> None:
+    """Write an uncompressed (memory-mappable) .npz snapshot."""
+    arrays = snapshot_arrays(rengoku_path, mhfdat_path, id_to_name=id_to_name, bundle=bundle)
+    with open(dest, "wb") as f:   # a file object keeps np.savez from appending ".npz"
+        np.savez(f, **arrays)
+
+
+# ----------------------------
+# Load
+# ----------------------------
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot. Arrays stay valid until close()."""
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.arrays: dict[str, np.ndarray] = {}
+        try:
+            with zipfile.ZipFile(self._file) as zf:
+                for info in zf.infolist():
+                    if not info.filename.endswith(".npy"):
+                        continue
+                    if info.compress_type != zipfile.ZIP_STORED:
+                        raise ValueError(f"{info.filename}: compressed members cannot be memory-mapped")
+                    self.arrays[info.filename[:-4]] = self._map_member(info)
+            raw = self.arrays.get("meta/json")
+            self.meta = json.loads(bytes(raw).decode("utf-8")) if raw is not None else {}
+            if self.meta.get("format") != SNAPSHOT_FORMAT:
+                raise ValueError(f"Not a {SNAPSHOT_FORMAT} file")
+        except BaseException:
+            self.close()
+            raise
+
+    def _map_member(self, info: zipfile.ZipInfo) -> np.ndarray:
+        fields = _ZIP_LOCAL_HEADER.unpack_from(self._mm, info.header_offset)
+        name_len, extra_len = fields[-2], fields[-1]
+        start = info.header_offset + _ZIP_LOCAL_HEADER.size + name_len + extra_len
+        header = _MemberReader(self._mm, start)
+        version = np.lib.format.read_magic(header)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(header)
+        elif version == (2, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(header)
+        else:
+            raise ValueError(f"{info.filename}: unsupported .npy version {version}")
+        if dtype.hasobject:
+            raise ValueError(f"{info.filename}: object arrays are not supported")
+        count = int(np.prod(shape)) if shape else 1
+        arr = np.frombuffer(self._mm, dtype=dtype, count=count, offset=header.pos)
+        return arr.reshape(shape, order="F" if fortran else "C")
+
+    # ---- access ----
+    def tables(self) -> list[str]:
+        return sorted({k.split("/", 1)[0] for k in self.arrays} - {"names", "meta"})
+
+    def table(self, name: str) -> dict[str, np.ndarray]:
+        """Columns of one table, e.g. table('multi_spawn') -> {'group': ..., 'SpawnWeighting': ...}."""
+        prefix = name + "/"
+        cols = {k[len(prefix):]: v for k, v in self.arrays.items() if k.startswith(prefix)}
+        if not cols:
+            raise KeyError(f"No table {name!r} in snapshot (have: {', '.join(self.tables())})")
+        return cols
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.arrays[key]
+
+    @property
+    def monster_names(self) -> np.ndarray:
+        return self.arrays["names/monster"]
+
+    @property
+    def item_names(self) -> dict[int, str]:
+        if "names/item_id" not in self.arrays:
+            return {}
+        return dict(zip(self.arrays["names/item_id"].tolist(), self.arrays["names/item_name"].tolist()))
+
+    # ---- lifetime ----
+    def close(self) -> None:
+        self.arrays = {}
+        try:
+            self._mm.close()
+        except (AttributeError, BufferError):
+            pass  # views still alive elsewhere keep the map open until they are collected
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _MemberReader:
+    """Tiny file-like reader over the mmap, for numpy's .npy header parser."""
+
+    def __init__(self, mm, pos: int):
+        self.mm = mm
+        self.pos = pos
+
+    def read(self, n: int) -> bytes:
+        data = self.mm[self.pos:self.pos + n]
+        self.pos += len(data)
+        return data
+
+
+def load_snapshot(path) -> Snapshot:
+    return Snapshot(path)
+
+
+def main(argv=None) -> int:
+    import argparse
+    import time
+
+    ap = argparse.ArgumentParser(prog="python -m core.snapshot", description="Columnar .npz snapshot of road data")
+    ap.add_argument("output", help="snapshot .npz to write (or read with --info)")
+    ap.add_argument("--rengoku", help="rengoku_data.bin")
+    ap.add_argument("--mhfdat", help="mhfdat.bin")
+    ap.add_argument("--info", action="store_true", help="load an existing snapshot and list its tables")
+    args = ap.parse_args(argv)
+
+    if not args.info:
+        if not args.rengoku and not args.mhfdat:
+            ap.error("give --rengoku and/or --mhfdat")
+        write_snapshot(args.output, args.rengoku, args.mhfdat)
+    start = time.perf_counter()
+    with load_snapshot(args.output) as snap:
+        elapsed = time.perf_counter() - start
+        for t in snap.tables():
+            cols = snap.table(t)
+            print(f"{t:16} {len(next(iter(cols.values()))):7} rows  {', '.join(cols)}")
+        print(f"loaded in {elapsed * 1000:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,281 @@
+# core/sweep.py
+"""
+Parameter sweeps: every combination of a parameter grid as its own variant BIN.
+
+  python -m core.sweep sweep.json [-j 8]
+
+Spec (paths are relative to the spec file):
+  {
+    "rengoku": "base/rengoku_data.bin",
+    "mhfdat": "base/mhfdat.bin",              (needed for base_points)
+    "output_dir": "variants",
+    "mode": "multi",                          (road mode the road parameters apply to)
+    "groups": [0, 1, 2],                      (optional: spawn groups spawn_weight applies to)
+    "grid": {
+      "spawn_weight": [0.5, 1, 2],            SpawnWeighting x factor
+      "point_multi1": [1.0, [1.0, 3.0]],      number: PointMulti1 x factor; [start, end]: linear ramp over floors
+      "point_multi2": [1.0],
+      "base_points":  [0.8, 1.2]              monster base_points x factor
+    }
+  }
+
+Writes output_dir/<name>/rengoku_data.bin (and mhfdat.bin when base_points is in
+the grid) for each combination, plus output_dir/variants.json:
+  {"rengoku": ..., "mhfdat": ..., "parameters": [...],
+   "variants": [{"name": "v0001", "params": {"spawn_weight": 0.5, ...}, "files": [...], "records": 2400}]}
+
+The template is parsed once; each worker process gets the parsed records once
+(pool initializer) and builds a variant by re-serialising only the records a
+parameter touches into a copy of the template bytes.
+"""
+from __future__ import annotations
+
+import dataclasses
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+ROAD_PARAMETERS = ("spawn_weight", "point_multi1", "point_multi2")
+MHFDAT_PARAMETERS = ("base_points",)
+PARAMETERS = ROAD_PARAMETERS + MHFDAT_PARAMETERS
+
+_U32 = 0xFFFFFFFF
+_U16 = 0xFFFF
+
+
+class SweepError(ValueError):
+    pass
+
+
+@dataclass
+class SweepSpec:
+    rengoku: str | None
+    mhfdat: str | None
+    output_dir: str
+    grid: dict[str, list]
+    mode: str = "multi"
+    groups: list[int] | None = None
+
+
+@dataclass
+class VariantResult:
+    name: str
+    params: dict
+    files: list[str] = field(default_factory=list)
+    records: int = 0
+    error: str = ""
+
+
+def load_spec(path) -> SweepSpec:
+    base = Path(path).resolve().parent
+    obj = json.loads(Path(path).read_text(encoding="utf-8"))
+
+    def rel(key):
+        return str(base / obj[key]) if obj.get(key) else None
+
+    spec = SweepSpec(rengoku=rel("rengoku"), mhfdat=rel("mhfdat"), output_dir=str(base / obj.get("output_dir", "variants")),
+                     grid=dict(obj.get("grid", {})), mode=obj.get("mode", "multi"), groups=obj.get("groups"))
+    check_spec(spec)
+    return spec
+
+
+def check_spec(spec: SweepSpec) -> None:
+    unknown = sorted(set(spec.grid) - set(PARAMETERS))
+    if unknown:
+        raise SweepError(f"Unknown parameter(s) {', '.join(unknown)} (expected {', '.join(PARAMETERS)})")
+    if not spec.grid or any(not isinstance(v, list) or not v for v in spec.grid.values()):
+        raise SweepError("grid needs at least one parameter, each with a non-empty list of values")
+    if spec.mode not in ("multi", "solo"):
+        raise SweepError(f"mode must be 'multi' or 'solo', not {spec.mode!r}")
+    if set(spec.grid) & set(ROAD_PARAMETERS) and not spec.rengoku:
+        raise SweepError("road parameters need 'rengoku'")
+    if "base_points" in spec.grid and not spec.mhfdat:
+        raise SweepError("base_points needs 'mhfdat'")
+    for name in ("point_multi1", "point_multi2"):
+        for v in spec.grid.get(name, []):
+            if not (isinstance(v, (int, float)) or (isinstance(v, list) and len(v) == 2)):
+                raise SweepError(f"{name}: {v!r} is neither a factor nor a [start, end] ramp")
+
+
+def combinations(grid: dict[str, list]) -> list[dict]:
+    names = [p for p in PARAMETERS if p in grid]
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+# ----------------------------
+# Worker side
+# ----------------------------
+
+_template: dict = {}
+
+
+def _init_worker(template: dict) -> None:
+    global _template
+    _template = template
+
+
+def _scaled(value: int, factor: float, maximum: int) -> int:
+    return max(0, min(maximum, round(value * factor)))
+
+
+def _ramp(value: list, index: int, count: int) -> float:
+    start, end = value
+    return start + (end - start) * (index / (count - 1) if count > 1 else 0.0)
+
+
+def _apply_road(data: bytearray, params: dict) -> int:
+    """Re-serialise the records the road parameters touch; returns how many were written."""
+    t = _template
+    written = 0
+    if "spawn_weight" in params and params["spawn_weight"] != 1:
+        for g in t["groups"]:
+            for sp in t["spawns"][g]:
+                new = _scaled(sp.SpawnWeighting, params["spawn_weight"], _U32)
+                if new != sp.SpawnWeighting:
+                    data[sp.offset:sp.offset + 32] = dataclasses.replace(sp, SpawnWeighting=new).serialize()
+                    written += 1
+    floors = t["floors"]
+    pm = {f: params[p] for p, f in (("point_multi1", "PointMulti1"), ("point_multi2", "PointMulti2"))
+          if p in params and params[p] != 1}
+    if pm:
+        for i, fs in enumerate(floors):
+            changes = {f: _ramp(v, i, len(floors)) if isinstance(v, list) else getattr(fs, f) * v
+                       for f, v in pm.items()}
+            new = dataclasses.replace(fs, **changes).serialize()
+            if new != fs.serialize():
+                data[fs.offset:fs.offset + 24] = new
+                written += 1
+    return written
+
+
+def _apply_mhfdat(data: bytearray, params: dict) -> int:
+    written = 0
+    factor = params.get("base_points", 1)
+    if factor != 1:
+        for r in _template["monsters"]:
+            new = _scaled(r.base_points, factor, _U16)
+            if new != r.base_points:
+                data[r.offset:r.offset + 16] = dataclasses.replace(r, base_points=new).to_bytes()
+                written += 1
+    return written
+
+
+def _write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def build_variant(job: tuple[str, dict, str]) -> VariantResult:
+    name, params, out_dir = job
+    res = VariantResult(name, params)
+    try:
+        if set(params) & set(ROAD_PARAMETERS):
+            data = bytearray(_template["rengoku_bytes"])
+            res.records += _apply_road(data, params)
+            res.files.append(os.path.join(out_dir, name, "rengoku_data.bin"))
+            _write(res.files[-1], data)
+        if set(params) & set(MHFDAT_PARAMETERS):
+            data = bytearray(_template["mhfdat_bytes"])
+            res.records += _apply_mhfdat(data, params)
+            res.files.append(os.path.join(out_dir, name, "mhfdat.bin"))
+            _write(res.files[-1], data)
+    except Exception as e:
+        res.error = f"{type(e).__name__}: {e}"
+    return res
+
+
+# ----------------------------
+# Driver
+# ----------------------------
+
+def load_template(spec: SweepSpec) -> dict:
+    """Parse the template file(s) once; the result is shipped to each worker."""
+    template = {}
+    if spec.rengoku:
+        from .io import parse_rengoku_data
+        structs = parse_rengoku_data(spec.rengoku)
+        if not structs:
+            raise SweepError(f"{spec.rengoku}: not found")
+        spawns, floors = (structs[0], structs[1]) if spec.mode == "multi" else (structs[3], structs[4])
+        groups = spec.groups if spec.groups is not None else range(len(spawns))
+        bad = [g for g in groups if not 0 <= g < len(spawns)]
+        if bad:
+            raise SweepError(f"groups {bad} out of range (0..{len(spawns) - 1})")
+        template.update(rengoku_bytes=Path(spec.rengoku).read_bytes(), spawns=spawns, floors=floors,
+                        groups=list(groups))
+    if spec.mhfdat:
+        from .mhfdat_io import parse_mhfdat
+        template.update(mhfdat_bytes=Path(spec.mhfdat).read_bytes(),
+                        monsters=parse_mhfdat(spec.mhfdat)["monster_rows"])
+    return template
+
+
+def run_sweep(
+    spec: SweepSpec,
+    *,
+    workers: int | None = None,
+    on_result: Callable[[VariantResult], None] | None = None,
+) -> list[VariantResult]:
+    """Write every variant and output_dir/variants.json. workers=1 runs inline."""
+    check_spec(spec)
+    combos = combinations(spec.grid)
+    width = max(4, len(str(len(combos))))
+    jobs = [(f"v{i + 1:0{width}d}", params, spec.output_dir) for i, params in enumerate(combos)]
+    template = load_template(spec)
+
+    results: list[VariantResult] = []
+    if workers == 1 or len(jobs) == 1:
+        _init_worker(template)
+        for job in jobs:
+            results.append(build_variant(job))
+            if on_result:
+                on_result(results[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(template,)) as pool:
+            chunk = max(1, min(16, len(jobs) // ((workers or os.cpu_count() or 1) * 4)))
+            for res in pool.map(build_variant, jobs, chunksize=chunk):
+                results.append(res)
+                if on_result:
+                    on_result(res)
+
+    os.makedirs(spec.output_dir, exist_ok=True)
+    manifest = {
+        "rengoku": spec.rengoku, "mhfdat": spec.mhfdat, "mode": spec.mode, "groups": spec.groups,
+        "parameters": [p for p in PARAMETERS if p in spec.grid],
+        "variants": [{"name": r.name, "params": r.params,
+                      "files": [os.path.relpath(f, spec.output_dir) for f in r.files],
+                      "records": r.records, **({"error": r.error} if r.error else {})} for r in results],
+    }
+    Path(spec.output_dir, "variants.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return results
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m core.sweep", description="Generate parameter-sweep variants")
+    ap.add_argument("spec", help="sweep spec JSON (template, output_dir, grid)")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    args = ap.parse_args(argv)
+
+    spec = load_spec(args.spec)
+    start = time.perf_counter()
+    results = run_sweep(spec, workers=args.workers)
+    failed = [r for r in results if r.error]
+    for r in failed:
+        print(f"[FAIL] {r.name} {r.params}: {r.error}")
+    print(f"{len(results) - len(failed)}/{len(results)} variants in {time.perf_counter() - start:.2f}s "
+          f"-> {os.path.join(spec.output_dir, 'variants.json')}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
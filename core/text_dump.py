@@ -0,0 +1,261 @@
+# core/text_dump.py
+"""
+Canonical line-per-record text dump of every editable section.
+
+  # blaze-road-dump 1
+  multi.floor[0] FloorNumber=1 SpawnTableUsed=4 Unk0=0 PointMulti1=2.0 PointMulti2=1.0 FinalLoop=40
+  # multi.spawn 24
+  multi.spawn[7][3] FirstMonsterID=11:Rathalos FirstMonsterVariant=0 ... SpawnWeighting=40 AdditionalFlag=0
+  solo.floor[0] ...
+  mhfdat.counters unk1=1 unk2=2 unk3=60 unk4=4 RoadEntries=60
+  mhfdat.monster[0] monster_id=1:Rathian monster_flag=0 base_points=120 ...
+  mhfdat.catshop[0] item_id=670 item_id2=1204
+  mhfdat.medalshop[0] item=670 flag1=4 flag2=1 price=300
+
+Output is deterministic (fixed record order, fixed field order, float32 values
+written with a round-trip-exact repr), so a one-value edit is a one-line diff.
+Monster fields are written as "ID:Name"; on read the ID is authoritative and the
+name, when present, must agree with it. Lines starting with '#' are comments,
+except the "# <section> N" count markers, which keep empty spawn groups and
+emptied mhfdat sections from disappearing on read.
+
+Reading streams the file line by line into a RoadBundle, and apply_dump() writes
+it through apply_bundle(): an unedited dump reproduces the templates byte for byte.
+"""
+from __future__ import annotations
+
+import os
+import re
+
+from .constants import MONSTERS, MONSTER_ALIASES, monster_key
+from .catshop_io import CatShopItem, CatShopParsed
+from .medalshop_io import MedalItem, MedalParsed
+from .mhfdat_io import MonsterPoints, DataCounters
+from .models import FloorStats, SpawnTable
+from .json_io import (RoadBundle, RoadSection, BUNDLE_FIELDS, bundle_from_files, apply_bundle,
+                      row_values, check_rows)
+
+DUMP_MAGIC = "# blaze-road-dump"
+DUMP_VERSION = 1
+
+MONSTER_FIELDS = {"FirstMonsterID", "SecondMonsterID", "monster_id"}
+
+# record kind -> (bundle field list, number of [index] parts)
+_RECORDS = {
+    "multi.floor": ("floor_stats", 1),
+    "multi.spawn": ("spawn_tables", 2),
+    "solo.floor": ("floor_stats", 1),
+    "solo.spawn": ("spawn_tables", 2),
+    "mhfdat.counters": ("counters", 0),
+    "mhfdat.monster": ("monster_points", 1),
+    "mhfdat.catshop": ("catshop", 1),
+    "mhfdat.medalshop": ("medalshop", 1),
+}
+
+RE_RECORD = re.compile(r"^([a-z]+\.[a-z]+)((?:\[\d+\])*)$")
+
+
+class DumpParseError(ValueError):
+    """Raised by read_dump() with every bad line (1-based line numbers)."""
+
+    def __init__(self, problems: list[str]):
+        self.problems = problems
+        shown = "\n".join(f"  {p}" for p in problems[:25])
+        more = f"\n  ... and {len(problems) - 25} more" if len(problems) > 25 else ""
+        super().__init__(f"Invalid dump ({len(problems)} problem(s)):\n{shown}{more}")
+
+
+# ----------------------------
+# Write
+# ----------------------------
+
+def _fmt(name: str, v) -> str:
+    if name in MONSTER_FIELDS:
+        return f"{v}:{MONSTERS[v]}" if 0 <= v < len(MONSTERS) else str(v)
+    if isinstance(v, float):
+        return repr(v)
+    return str(v)
+
+
+def _line(kind: str, index: str, section: str, values) -> str:
+    fields = " ".join(f"{n}={_fmt(n, v)}" for n, v in zip(BUNDLE_FIELDS[section], values))
+    return f"{kind}{index} {fields}\n"
+
+
+def iter_dump_lines(bundle: RoadBundle):
+    """Yield the canonical dump, one line at a time."""
+    yield f"{DUMP_MAGIC} {DUMP_VERSION}\n"
+    for mode in ("multi", "solo"):
+        sec = getattr(bundle, mode)
+        if sec is None:
+            continue
+        for i, fs in enumerate(sec.floor_stats):
+            yield _line(f"{mode}.floor", f"[{i}]", "floor_stats", row_values("floor_stats", fs))
+        yield f"# {mode}.spawn {len(sec.spawn_tables)}\n"  # group count: keeps trailing empty groups
+        for g, group in enumerate(sec.spawn_tables):
+            for i, sp in enumerate(group):
+                yield _line(f"{mode}.spawn", f"[{g}][{i}]", "spawn_tables", row_values("spawn_tables", sp))
+    if bundle.counters is not None:
+        yield _line("mhfdat.counters", "", "counters", row_values("counters", bundle.counters))
+    for kind, section, rows in (("mhfdat.monster", "monster_points", bundle.monster_points),
+                                ("mhfdat.catshop", "catshop", bundle.catshop.rows if bundle.catshop else None),
+                                ("mhfdat.medalshop", "medalshop", bundle.medalshop.rows if bundle.medalshop else None)):
+        if rows is None:
+            continue
+        yield f"# {kind} {len(rows)}\n"  # row count marker: keeps an emptied section distinct from a missing one
+        for i, r in enumerate(rows):
+            yield _line(kind, f"[{i}]", section, row_values(section, r))
+
+
+def write_dump(bundle: RoadBundle, dest) -> None:
+    """Write the canonical dump to a path or text file object."""
+    if isinstance(dest, (str, os.PathLike)):
+        with open(dest, "w", encoding="utf-8", newline="\n") as f:
+            write_dump(bundle, f)
+        return
+    dest.writelines(iter_dump_lines(bundle))
+
+
+def dump_files(dest, rengoku_path=None, mhfdat_path=None) -> None:
+    """Dump rengoku_data.bin and/or mhfdat.bin sections to 'dest'."""
+    write_dump(bundle_from_files(rengoku_path, mhfdat_path), dest)
+
+
+# ----------------------------
+# Read
+# ----------------------------
+
+def _parse_value(name: str, text: str):
+    if name in MONSTER_FIELDS:
+        id_part, _, name_part = text.partition(":")
+        if id_part.isdigit():
+            em = int(id_part)
+            if name_part and 0 <= em < len(MONSTERS) and MONSTER_ALIASES.get(monster_key(name_part)) != em:
+                raise ValueError(f"{name}: ID {em} is {MONSTERS[em]}, not {name_part!r} (edit the ID)")
+            return em
+        em = MONSTER_ALIASES.get(monster_key(text))
+        if em is None:
+            raise ValueError(f"{name}: unknown monster {text!r}")
+        return em
+    try:
+        return float(text) if name in ("PointMulti1", "PointMulti2") else int(text)
+    except ValueError:
+        raise ValueError(f"{name}: expected a number, got {text!r}") from None
+
+
+def read_dump(src) -> RoadBundle:
+    """Stream a dump from a path or text file object into a RoadBundle."""
+    if isinstance(src, (str, os.PathLike)):
+        with open(src, "r", encoding="utf-8") as f:
+            return read_dump(f)
+
+    problems: list[str] = []
+    flat: dict[str, dict] = {}          # kind -> {index: row}
+    groups: dict[str, dict] = {}        # mode.spawn -> {g: {i: row}}
+    declared: dict[str, int] = {}       # sections seen in a "# kind N" marker -> N
+    counters = None
+    header_seen = False
+
+    for lineno, raw in enumerate(src, start=1):
+        line = raw.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            if line.startswith(DUMP_MAGIC):
+                header_seen = True
+                ver = line[len(DUMP_MAGIC):].strip()
+                if not ver.isdigit() or int(ver) > DUMP_VERSION:
+                    raise DumpParseError([f"line {lineno}: unsupported dump version {ver!r}"])
+            else:
+                parts = line[1:].split()
+                if len(parts) == 2 and parts[0] in _RECORDS and parts[1].isdigit():
+                    declared[parts[0]] = int(parts[1])
+            continue
+
+        head, *tokens = line.split()
+        m = RE_RECORD.match(head)
+        if not m or m.group(1) not in _RECORDS:
+            problems.append(f"line {lineno}: unknown record {head!r}")
+            continue
+        kind = m.group(1)
+        section, n_idx = _RECORDS[kind]
+        idx = [int(x) for x in re.findall(r"\d+", m.group(2))]
+        if len(idx) != n_idx:
+            problems.append(f"line {lineno}: {kind} needs {n_idx} index(es)")
+            continue
+
+        fields = BUNDLE_FIELDS[section]
+        kv = {}
+        for tok in tokens:
+            k, sep, v = tok.partition("=")
+            if not sep:
+                problems.append(f"line {lineno}: expected key=value, got {tok!r}")
+                break
+            kv[k] = v
+        else:
+            if list(kv) != fields:
+                problems.append(f"line {lineno}: fields must be {' '.join(fields)}")
+                continue
+            try:
+                row = [_parse_value(n, kv[n]) for n in fields]
+            except ValueError as e:
+                problems.append(f"line {lineno}: {e}")
+                continue
+            row_problems: list[str] = []
+            if not check_rows(section, [row], kind, row_problems):
+                problems.extend(f"line {lineno}: {p}" for p in row_problems)
+                continue
+
+            if kind == "mhfdat.counters":
+                counters = row
+            elif n_idx == 2:
+                groups.setdefault(kind, {}).setdefault(idx[0], {})[idx[1]] = row
+            else:
+                flat.setdefault(kind, {})[idx[0]] = row
+
+    if not header_seen:
+        problems.insert(0, f"missing '{DUMP_MAGIC} {DUMP_VERSION}' header line")
+
+    line_problems = bool(problems)  # gaps are usually a side effect of a rejected line
+
+    def ordered(kind, rows: dict):
+        if not line_problems and sorted(rows) != list(range(len(rows))):
+            problems.append(f"{kind}: indexes must run 0..{len(rows) - 1} without gaps")
+        return [rows[i] for i in sorted(rows)]
+
+    bundle = RoadBundle()
+    for mode in ("multi", "solo"):
+        fkey, skey = f"{mode}.floor", f"{mode}.spawn"
+        if fkey not in flat and skey not in groups and skey not in declared:
+            continue
+        floors = [FloorStats(*r) for r in ordered(fkey, flat.get(fkey, {}))]
+        g = groups.get(skey, {})
+        count = max(declared.get(skey, 0), max(g) + 1 if g else 0)
+        tables = [[SpawnTable(*r) for r in ordered(f"{skey}[{gi}]", g.get(gi, {}))]
+                  for gi in range(count)]
+        setattr(bundle, mode, RoadSection(floors, tables))
+
+    if counters is not None:
+        bundle.counters = DataCounters(*counters, offset=-1)
+    if "mhfdat.monster" in flat or "mhfdat.monster" in declared:
+        bundle.monster_points = [MonsterPoints(*r, offset=-1)
+                                 for r in ordered("mhfdat.monster", flat.get("mhfdat.monster", {}))]
+    if "mhfdat.catshop" in flat or "mhfdat.catshop" in declared:
+        bundle.catshop = CatShopParsed(rows=[CatShopItem(item_id=a, item_id2=b)
+                                             for a, b in ordered("mhfdat.catshop", flat.get("mhfdat.catshop", {}))])
+    if "mhfdat.medalshop" in flat or "mhfdat.medalshop" in declared:
+        bundle.medalshop = MedalParsed(rows=[MedalItem(item=a, random=b, quantity=q, price=p)
+                                             for a, b, q, p in ordered("mhfdat.medalshop",
+                                                                       flat.get("mhfdat.medalshop", {}))])
+
+    if problems:
+        raise DumpParseError(problems)
+    return bundle
+
+
+def apply_dump(src, *, rengoku_template=None, rengoku_out=None, mhfdat_template=None, mhfdat_out=None) -> RoadBundle:
+    """Parse a dump and write it onto the template BIN(s). Returns the parsed bundle."""
+    bundle = read_dump(src)
+    apply_bundle(bundle, rengoku_template=rengoku_template, rengoku_out=rengoku_out,
+                 mhfdat_template=mhfdat_template, mhfdat_out=mhfdat_out)
+    return bundle
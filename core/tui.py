@@ -0,0 +1,430 @@
+# core/tui.py
+"""
+Terminal editor for headless servers: python -m core.tui [--rengoku R] [--mhfdat M]
+
+Browses and edits floor stats and spawn tables (multi and solo), monster points,
+the cat shop and the medal shop through core.project.RoadProject. Only the rows
+on screen are formatted, so 20,000-entry spawn tables page instantly. Item names
+(asset/Items.xlsx) are loaded the first time a shop is opened. Qt is never imported.
+
+Keys:
+  Tab / Shift+Tab, 1-7    switch section        Up/Down, PgUp/PgDn, Home/End   move
+  Left/Right              choose column         Enter / e                      edit cell
+  g                       go to row             a / d                          add / delete row (mhfdat tables)
+  s                       save                  q                              quit (asks when unsaved)
+"""
+from __future__ import annotations
+
+import bisect
+import curses
+import itertools
+import math
+import struct
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable
+
+from .constants import MONSTERS, monster_id
+from .json_io import FLOAT32_MAX
+
+U32_MAX = 0xFFFFFFFF
+U16_MAX = 0xFFFF
+MEDAL_FLAG1 = 4   # fixed Medal Shop flags (as MedalShopEditor writes them)
+MEDAL_FLAG2 = 1
+
+
+# ----------------------------
+# Table models
+# ----------------------------
+
+@dataclass
+class Column:
+    name: str
+    width: int
+    get: Callable[[object], object]
+    set: Callable[[object, str], None] | None = None   # parses text, raises ValueError
+
+
+def _int_column(name: str, field: str, maximum: int, width: int = 0) -> Column:
+    def set_(obj, text):
+        v = int(text.strip(), 0)
+        if not 0 <= v <= maximum:
+            raise ValueError(f"{name} must be between 0 and {maximum}")
+        setattr(obj, field, v)
+    return Column(name, width or max(len(name), 6), lambda o: getattr(o, field), set_)
+
+
+def _float_column(name: str, field: str) -> Column:
+    def set_(obj, text):
+        v = float(text)
+        if not math.isfinite(v) or abs(v) > FLOAT32_MAX:
+            raise ValueError(f"{name} must be a finite number that fits in a float32")
+        setattr(obj, field, v)
+    return Column(name, max(len(name), 8), lambda o: f"{getattr(o, field):.4g}", set_)
+
+
+def _monster_name(em: int) -> str:
+    return MONSTERS[em] if 0 <= em < len(MONSTERS) else str(em)
+
+
+def _monster_column(name: str, field: str) -> Column:
+    def set_(obj, text):
+        em = monster_id(text)
+        if not 0 <= em < len(MONSTERS):
+            raise ValueError(f"EM ID must be between 0 and {len(MONSTERS) - 1}")
+        setattr(obj, field, em)
+    return Column(name, 22, lambda o: _monster_name(getattr(o, field)), set_)
+
+
+class Table(ABC):
+    title = ""
+    columns: list[Column] = []
+
+    @abstractmethod
+    def __len__(self) -> int: ...
+
+    @abstractmethod
+    def row(self, index: int): ...
+
+    def label(self, index: int) -> str:
+        return str(index)
+
+    def add(self) -> int:
+        """Append a new row; returns its index."""
+        raise ValueError("rows cannot be added to this table")
+
+    def delete(self, index: int) -> None:
+        raise ValueError("rows cannot be deleted from this table")
+
+
+class FloorTable(Table):
+    def __init__(self, view):
+        self.view = view
+        self.title = f"{view.mode.title()} floor stats"
+        self.columns = [_int_column("FloorNumber", "FloorNumber", U32_MAX),
+                        _int_column("SpawnTableUsed", "SpawnTableUsed", U32_MAX),
+                        _int_column("Unk0", "Unk0", U32_MAX),
+                        _float_column("PointMulti1", "PointMulti1"),
+                        _float_column("PointMulti2", "PointMulti2"),
+                        _int_column("FinalLoop", "FinalLoop", U32_MAX)]
+
+    def __len__(self):
+        return len(self.view.floors)
+
+    def row(self, index):
+        return self.view.floors[index]
+
+
+class SpawnTableView(Table):
+    """Every spawn group flattened into one list; rows are located by bisecting group starts."""
+
+    def __init__(self, view):
+        self.view = view
+        self.title = f"{view.mode.title()} spawn tables"
+        self.starts = list(itertools.accumulate((len(g) for g in view.groups), initial=0))
+        self.columns = [_monster_column("FirstMonster", "FirstMonsterID"),
+                        _int_column("Var1", "FirstMonsterVariant", U32_MAX, 5),
+                        _monster_column("SecondMonster", "SecondMonsterID"),
+                        _int_column("Var2", "SecondMonsterVariant", U32_MAX, 5),
+                        _int_column("StatTable", "MonstersStatTable", U32_MAX),
+                        _int_column("BonusSpawns", "MapZoneOverride", U32_MAX),
+                        _int_column("Weight", "SpawnWeighting", U32_MAX),
+                        _int_column("Flag", "AdditionalFlag", U32_MAX)]
+
+    def __len__(self):
+        return self.starts[-1]
+
+    def _locate(self, index):
+        g = bisect.bisect_right(self.starts, index) - 1
+        return g, index - self.starts[g]
+
+    def row(self, index):
+        g, e = self._locate(index)
+        return self.view.groups[g][e]
+
+    def label(self, index):
+        return "G{}.{}".format(*self._locate(index))
+
+
+class ListTable(Table):
+    def __init__(self, title, rows: list, columns: list[Column], new_row: Callable[[], object]):
+        self.title = title
+        self.rows = rows
+        self.columns = columns
+        self.new_row = new_row
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row(self, index):
+        return self.rows[index]
+
+    def add(self):
+        # appended like the editors do: a blank item ID mid-list would end the shop table on reload
+        self.rows.append(self.new_row())
+        return len(self.rows) - 1
+
+    def delete(self, index):
+        if self.rows:
+            del self.rows[index]
+
+
+class _ItemNames:
+    """Item ID -> name, loaded on first use (only the shop tables need it)."""
+
+    def __init__(self):
+        self._names = None
+
+    def __call__(self, item_id: int) -> str:
+        if self._names is None:
+            from .items import load_item_names
+            self._names = load_item_names()
+        return self._names.get(item_id, "") if item_id else ""
+
+
+def build_tables(project) -> list[Table]:
+    from .catshop_io import CatShopItem
+    from .medalshop_io import MedalItem
+    from .mhfdat_io import MonsterPoints
+
+    tables: list[Table] = []
+    for view in (project.multi, project.solo):
+        if view is not None:
+            tables += [FloorTable(view), SpawnTableView(view)]
+    if project.monsters is not None:
+        names = _ItemNames()
+        point_cols = [_int_column(h, f, U16_MAX) for h, f in (
+            ("Flag", "monster_flag"), ("Base", "base_points"), ("Lv1", "level1_points"), ("Lv2", "level2_points"),
+            ("Lv3", "level3_points"), ("Lv4", "level4_points"), ("Lv5", "level5_points"))]
+        tables.append(ListTable("Monster points", project.monsters,
+                                [_monster_column("Monster", "monster_id")] + point_cols,
+                                lambda: MonsterPoints(1, 0, 0, 0, 0, 0, 0, 0, offset=-1)))
+        tables.append(ListTable("Cat shop", project.catshop,
+                                [_int_column("Item ID", "item_id", U16_MAX),
+                                 Column("Item Name", 24, lambda r: names(r.item_id)),
+                                 _int_column("Item ID 2", "item_id2", U16_MAX),
+                                 Column("Item Name 2", 24, lambda r: names(r.item_id2))],
+                                lambda: CatShopItem(item_id=0, item_id2=0)))
+        tables.append(ListTable("Medal shop", project.medalshop,
+                                [_int_column("Item ID", "item", U16_MAX),
+                                 Column("Item Name", 28, lambda r: names(r.item)),
+                                 _int_column("Price", "price", U16_MAX)],
+                                lambda: MedalItem(item=0, random=MEDAL_FLAG1, quantity=MEDAL_FLAG2, price=1)))
+    return tables
+
+
+# ----------------------------
+# Curses UI
+# ----------------------------
+
+class TuiApp:
+    def __init__(self, stdscr, project):
+        self.scr = stdscr
+        self.project = project
+        self.tables = build_tables(project)
+        self.state = {id(t): [0, 0, 0] for t in self.tables}   # cursor row, top row, column
+        self.current = 0
+        self.message = "Tab: section  Enter: edit  s: save  q: quit"
+        # set on every cell edit / row add / delete; project.dirty (which re-serializes
+        # every record) is only consulted on save and quit
+        self.edited = False
+
+    @property
+    def table(self) -> Table:
+        return self.tables[self.current]
+
+    # ---- drawing ----
+    def _put(self, y, x, text, attr=0):
+        h, w = self.scr.getmaxyx()
+        if 0 <= y < h and x < w:
+            self.scr.addnstr(y, x, text, max(0, w - x - (1 if y == h - 1 else 0)), attr)
+
+    def draw(self):
+        self.scr.erase()
+        h, w = self.scr.getmaxyx()
+        tabs = "  ".join(f"{i + 1}:{t.title}" for i, t in enumerate(self.tables))
+        self._put(0, 0, tabs.ljust(w), curses.A_REVERSE)
+        start = sum(len(f"{i + 1}:{t.title}") + 2 for i, t in enumerate(self.tables[:self.current]))
+        self._put(0, start, f"{self.current + 1}:{self.table.title}", curses.A_BOLD)
+
+        t = self.table
+        cur, top, col = self.state[id(t)]
+        label_w = max(6, len(t.label(max(len(t) - 1, 0))) + 1)
+        x = label_w
+        header = "#".ljust(label_w)
+        for c in t.columns:
+            header += c.name[:c.width].ljust(c.width + 1)
+        self._put(1, 0, header, curses.A_UNDERLINE)
+
+        body = max(1, h - 3)
+        for line in range(body):
+            i = top + line
+            if i >= len(t):
+                break
+            obj = t.row(i)
+            self._put(2 + line, 0, t.label(i).ljust(label_w), curses.A_DIM)
+            x = label_w
+            for ci, c in enumerate(t.columns):
+                attr = curses.A_REVERSE if (i == cur and ci == col) else (curses.A_BOLD if i == cur else 0)
+                self._put(2 + line, x, str(c.get(obj))[:c.width].ljust(c.width), attr)
+                x += c.width + 1
+
+        dirty = " [modified]" if self.edited else ""
+        status = f"{cur + 1}/{len(t)}{dirty}  {self.message}"
+        self._put(h - 1, 0, status.ljust(w), curses.A_REVERSE)
+        self.scr.refresh()
+
+    # ---- input ----
+    def prompt(self, text: str, initial: str = "") -> str | None:
+        h, w = self.scr.getmaxyx()
+        self._put(h - 1, 0, " " * (w - 1))
+        self._put(h - 1, 0, text)
+        curses.echo()
+        curses.curs_set(1)
+        try:
+            self.scr.move(h - 1, min(len(text), w - 2))
+            raw = self.scr.getstr(h - 1, min(len(text), w - 2), 64)
+        except curses.error:
+            return None
+        finally:
+            curses.noecho()
+            curses.curs_set(0)
+        value = raw.decode("utf-8", "replace").strip()
+        return value if value else (initial or None)
+
+    def move(self, delta: int = 0, to: int | None = None):
+        t = self.table
+        st = self.state[id(t)]
+        if len(t) == 0:
+            st[0] = st[1] = 0
+            return
+        st[0] = max(0, min(len(t) - 1, (st[0] + delta) if to is None else to))
+        body = max(1, self.scr.getmaxyx()[0] - 3)
+        if st[0] < st[1]:
+            st[1] = st[0]
+        elif st[0] >= st[1] + body:
+            st[1] = st[0] - body + 1
+
+    def edit_cell(self):
+        t = self.table
+        cur, _top, col = self.state[id(t)]
+        if not len(t):
+            return
+        c = t.columns[col]
+        if c.set is None:
+            self.message = f"{c.name} is read-only"
+            return
+        value = self.prompt(f"{t.label(cur)} {c.name} [{c.get(t.row(cur))}]: ")
+        if value is None:
+            self.message = "unchanged"
+            return
+        try:
+            c.set(t.row(cur), value)
+            self.edited = True
+            self.message = f"{c.name} = {c.get(t.row(cur))}"
+        except ValueError as e:
+            self.message = f"not set: {e}"
+
+    def save(self):
+        try:
+            written = self.project.save()
+        except (OSError, ValueError, struct.error, OverflowError) as e:
+            self.message = f"save failed: {e}"
+            return
+        self.edited = self.project.dirty
+        parts = []
+        if written["records"]:
+            parts.append(f"{written['records']} road record(s)")
+        if written["mhfdat"]:
+            parts.append("mhfdat.bin")
+        self.message = "saved " + ", ".join(parts) if parts else "nothing to save"
+
+    def handle(self, key) -> bool:
+        """Process one key; False quits."""
+        t = self.table
+        st = self.state[id(t)]
+        body = max(1, self.scr.getmaxyx()[0] - 3)
+        if key == ord("q"):
+            if self.edited and self.project.dirty:
+                ans = self.prompt("Unsaved changes. Save before quitting? (y/n/c) ")
+                if ans is None or ans.lower().startswith("c"):
+                    return True
+                if ans.lower().startswith("y"):
+                    self.save()
+                    if self.edited:
+                        return True
+            return False
+        if key in (9, curses.KEY_BTAB):
+            self.current = (self.current + (1 if key == 9 else -1)) % len(self.tables)
+        elif ord("1") <= key < ord("1") + min(9, len(self.tables)):
+            self.current = key - ord("1")
+        elif key in (curses.KEY_DOWN, ord("j")):
+            self.move(1)
+        elif key in (curses.KEY_UP, ord("k")):
+            self.move(-1)
+        elif key == curses.KEY_NPAGE:
+            self.move(body)
+        elif key == curses.KEY_PPAGE:
+            self.move(-body)
+        elif key == curses.KEY_HOME:
+            self.move(to=0)
+        elif key == curses.KEY_END:
+            self.move(to=len(t) - 1)
+        elif key in (curses.KEY_LEFT, ord("h")):
+            st[2] = max(0, st[2] - 1)
+        elif key in (curses.KEY_RIGHT, ord("l")):
+            st[2] = min(len(t.columns) - 1, st[2] + 1)
+        elif key in (10, 13, curses.KEY_ENTER, ord("e")):
+            self.edit_cell()
+        elif key == ord("g"):
+            value = self.prompt("Go to row: ")
+            if value and value.isdigit():
+                self.move(to=int(value) - 1)
+        elif key == ord("a"):
+            try:
+                self.move(to=t.add())
+                self.edited = True
+                self.message = "row added at the end"
+            except ValueError as e:
+                self.message = str(e)
+        elif key == ord("d"):
+            try:
+                t.delete(st[0])
+                self.edited = True
+                self.move(0)
+                self.message = "row deleted"
+            except ValueError as e:
+                self.message = str(e)
+        elif key == ord("s"):
+            self.save()
+        elif key == curses.KEY_RESIZE:
+            self.move(0)
+        return True
+
+    def run(self):
+        curses.curs_set(0)
+        self.scr.keypad(True)
+        while True:
+            self.draw()
+            if not self.handle(self.scr.getch()):
+                break
+
+
+def main(argv=None) -> int:
+    import argparse
+    from .project import RoadProject
+
+    ap = argparse.ArgumentParser(prog="python -m core.tui", description="Terminal road editor")
+    ap.add_argument("--rengoku", help="rengoku_data.bin")
+    ap.add_argument("--mhfdat", help="mhfdat.bin")
+    args = ap.parse_args(argv)
+    if not args.rengoku and not args.mhfdat:
+        ap.error("give --rengoku and/or --mhfdat")
+
+    project = RoadProject(args.rengoku, args.mhfdat)
+    curses.wrapper(lambda scr: TuiApp(scr, project).run())
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,337 @@
+# core/validation.py
+"""
+Pre-import validation for workbooks produced by create_excel_from_bin().
+
+The parsed sheet columns are loaded into NumPy arrays and every rule is checked
+with one vectorized pass per sheet, so a single report lists every bad cell
+(sheet + coordinate) instead of stopping at the first conversion error.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+from openpyxl.utils import get_column_letter
+
+from .constants import MONSTERS, MONSTER_IDS, MAP_ZONE_OVERRIDES, ADDITIONAL_FLAGS, monster_id
+
+U32_MAX = 0xFFFFFFFF
+
+SPAWN_SHEET = "Spawn Table"
+FLOOR_SHEET = "Floor Stats"
+
+# Spawn columns in sheet order. MapZoneOverride is exported as "Bonus Spawns".
+SPAWN_FIELDS = [
+    "FirstMonsterID", "FirstMonsterVariant",
+    "SecondMonsterID", "SecondMonsterVariant",
+    "MonstersStatTable", "MapZoneOverride",
+    "SpawnWeighting", "AdditionalFlag",
+]
+SPAWN_HEADER_ALIASES = {"MapZoneOverride": ("Bonus Spawns", "Bonus Spawn", "MapZoneOverride")}
+MONSTER_FIELDS = ("FirstMonsterID", "SecondMonsterID")
+
+FLOOR_INT_FIELDS = ["FloorNumber", "SpawnTableUsed", "Unk0", "FinalLoop"]
+FLOOR_FLOAT_FIELDS = ["PointMulti1", "PointMulti2"]
+
+
+@dataclass
+class Issue:
+    sheet: str
+    cell: str          # e.g. "C14"; row-only problems use "row 14"
+    field: str
+    value: object
+    message: str
+    level: str = "error"   # "error" blocks the import, "warning" does not
+
+    def __str__(self):
+        return f"{self.sheet}!{self.cell} [{self.field}] {self.message} (got {self.value!r})"
+
+
+@dataclass
+class ValidationReport:
+    issues: list[Issue] = field(default_factory=list)
+
+    @property
+    def errors(self) -> list[Issue]:
+        return [i for i in self.issues if i.level == "error"]
+
+    @property
+    def warnings(self) -> list[Issue]:
+        return [i for i in self.issues if i.level == "warning"]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def format(self, limit: int = 50) -> str:
+        lines = [f"{len(self.errors)} error(s), {len(self.warnings)} warning(s)"]
+        for issue in self.issues[:limit]:
+            lines.append(f"  {issue.level.upper():7} {issue}")
+        if len(self.issues) > limit:
+            lines.append(f"  ... and {len(self.issues) - limit} more")
+        return "\n".join(lines)
+
+    def todict(self):
+        return [
+            {"level": i.level, "sheet": i.sheet, "cell": i.cell, "field": i.field,
+             "value": i.value if isinstance(i.value, (int, float, str, type(None))) else str(i.value),
+             "message": i.message}
+            for i in self.issues
+        ]
+
+
+class WorkbookValidationError(ValueError):
+    """Raised by export_excel_to_bin() when the workbook fails validation."""
+
+    def __init__(self, report: ValidationReport):
+        self.report = report
+        super().__init__(report.format(limit=25))
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+def _to_number(v) -> float:
+    """Cell value -> float; NaN for blanks and anything non-numeric."""
+    if v is None or isinstance(v, bool):
+        return math.nan
+    if isinstance(v, (int, float)):
+        return float(v)
+    if isinstance(v, str):
+        try:
+            return float(v.strip())
+        except ValueError:
+            return math.nan
+    return math.nan
+
+
+def _is_blank(v) -> bool:
+    return v is None or (isinstance(v, str) and not v.strip())
+
+
+def _monster_to_number(v) -> float:
+    """Monster cell -> EM ID as float; NaN when blank or unresolvable."""
+    if isinstance(v, str):
+        em = MONSTER_IDS.get(v)
+        if em is not None:
+            return float(em)
+    try:
+        return float(monster_id(v))
+    except ValueError:
+        return math.nan
+
+
+def _header_for(columns: dict, name: str):
+    for h in SPAWN_HEADER_ALIASES.get(name, (name,)):
+        if h in columns:
+            return h
+    return None
+
+
+def _load_columns(rows, fields, convert_monsters=()):
+    """
+    Build (values[n, f], raw[n][f], headers[f]) for a list of SheetRows.
+    All rows of one spawn group share a header map, but groups may differ, so the
+    header is resolved per row.
+    """
+    n, f = len(rows), len(fields)
+    values = np.full((n, f), np.nan, dtype=np.float64)
+    raw = [[None] * f for _ in range(n)]
+    cols = np.zeros((n, f), dtype=np.int32)
+    for ri, sr in enumerate(rows):
+        for fi, name in enumerate(fields):
+            h = _header_for(sr.columns, name)
+            if h is None:
+                continue
+            v = sr.values.get(h)
+            raw[ri][fi] = v
+            cols[ri, fi] = sr.columns[h]
+            values[ri, fi] = _monster_to_number(v) if name in convert_monsters else _to_number(v)
+    return values, raw, cols
+
+
+def _emit(report, sheet, mask, rows, raw, cols, fields, message_for):
+    """Turn a boolean [n, f] mask into Issues (one per flagged cell)."""
+    for ri, fi in zip(*np.nonzero(mask)):
+        col = int(cols[ri, fi])
+        cell = f"{get_column_letter(col)}{rows[ri].row}" if col else f"row {rows[ri].row}"
+        name = fields[fi]
+        value = raw[ri][fi]
+        report.issues.append(Issue(sheet, cell, name, value, message_for(name, value)))
+
+
+# ----------------------------
+# Validation
+# ----------------------------
+
+def validate_spawn_rows(groups, *, template_tables=None, report: ValidationReport | None = None) -> ValidationReport:
+    """
+    Validate parsed spawn groups (list[list[SheetRow]]) in one vectorized pass.
+    With template_tables, rows outside the template's groups are only reported as
+    warnings: apply_spawn_rows() never writes them, so their values are not checked.
+    """
+    report = report or ValidationReport()
+
+    # structural warnings against the template (those rows are ignored on import)
+    if template_tables is not None:
+        if len(groups) != len(template_tables):
+            report.issues.append(Issue(
+                SPAWN_SHEET, "A1", "groups", len(groups),
+                f"workbook has {len(groups)} groups, template has {len(template_tables)}; "
+                f"extra groups are ignored and missing ones keep template values", "warning"))
+        for gi, (group, table) in enumerate(zip(groups, template_tables)):
+            for sr in group[len(table):]:
+                report.issues.append(Issue(
+                    SPAWN_SHEET, f"row {sr.row}", f"group {gi}", None,
+                    f"group {gi} only has {len(table)} entries in the template; row is ignored", "warning"))
+        groups = [group[:len(table)] for group, table in zip(groups, template_tables)]
+    rows = [sr for g in groups for sr in g]
+
+    # header rows missing a required column (MapZoneOverride defaults to 0 on import)
+    for gi, group in enumerate(groups):
+        if not group:
+            continue
+        for name in SPAWN_FIELDS:
+            if name != "MapZoneOverride" and _header_for(group[0].columns, name) is None:
+                report.issues.append(Issue(
+                    SPAWN_SHEET, f"row {group[0].row - 1}", name, None,
+                    f"group {gi} header row has no {name} column"))
+
+    if not rows:
+        return report
+
+    values, raw, cols = _load_columns(rows, SPAWN_FIELDS, convert_monsters=MONSTER_FIELDS)
+    idx = {name: i for i, name in enumerate(SPAWN_FIELDS)}
+    missing_col = cols == 0
+    blank = np.array([[_is_blank(v) for v in r] for r in raw], dtype=bool) & ~missing_col
+    nan = np.isnan(values)
+
+    # 1) blanks / unreadable values
+    _emit(report, SPAWN_SHEET, blank, rows, raw, cols, SPAWN_FIELDS, lambda n, v: "cell is blank")
+    monster_cols = [idx[m] for m in MONSTER_FIELDS]
+    other_cols = [i for i in range(len(SPAWN_FIELDS)) if i not in monster_cols]
+
+    bad_monster = np.zeros_like(nan)
+    bad_monster[:, monster_cols] = nan[:, monster_cols] & ~blank[:, monster_cols] & ~missing_col[:, monster_cols]
+
+    def _monster_msg(_name, v):
+        try:
+            monster_id(v)
+        except ValueError as e:
+            return str(e)
+        return "not a monster name or EM ID"
+    _emit(report, SPAWN_SHEET, bad_monster, rows, raw, cols, SPAWN_FIELDS, _monster_msg)
+
+    not_number = np.zeros_like(nan)
+    not_number[:, other_cols] = nan[:, other_cols] & ~blank[:, other_cols] & ~missing_col[:, other_cols]
+    _emit(report, SPAWN_SHEET, not_number, rows, raw, cols, SPAWN_FIELDS, lambda n, v: "not a number")
+
+    # 2) range / enum rules on the numeric cells (NaN compares False everywhere)
+    ok = ~nan
+    with np.errstate(invalid="ignore"):
+        not_int = ok & (values != np.floor(values))
+        out_u32 = ok & ~not_int & ((values < 0) | (values > U32_MAX))
+
+        rule = np.zeros_like(nan)
+        for m in monster_cols:
+            rule[:, m] = ok[:, m] & ((values[:, m] < 0) | (values[:, m] >= len(MONSTERS)))
+        mzo = idx["MapZoneOverride"]
+        rule[:, mzo] = ok[:, mzo] & ~np.isin(values[:, mzo], MAP_ZONE_OVERRIDES)
+        flag = idx["AdditionalFlag"]
+        rule[:, flag] = ok[:, flag] & ~np.isin(values[:, flag], ADDITIONAL_FLAGS)
+        rule &= ~not_int
+
+    _emit(report, SPAWN_SHEET, not_int, rows, raw, cols, SPAWN_FIELDS, lambda n, v: "must be a whole number")
+    _emit(report, SPAWN_SHEET, out_u32 & ~rule, rows, raw, cols, SPAWN_FIELDS,
+          lambda n, v: f"must be between 0 and {U32_MAX}")
+
+    def _rule_msg(name, _v):
+        if name in MONSTER_FIELDS:
+            return f"EM ID must be between 0 and {len(MONSTERS) - 1}"
+        if name == "MapZoneOverride":
+            return f"Bonus Spawns must be one of {', '.join(map(str, MAP_ZONE_OVERRIDES))}"
+        return f"AdditionalFlag must be one of {', '.join(map(str, ADDITIONAL_FLAGS))}"
+    _emit(report, SPAWN_SHEET, rule, rows, raw, cols, SPAWN_FIELDS, _rule_msg)
+    return report
+
+
+def validate_floor_rows(stats, *, group_count: int | None = None, template_floors=None,
+                        report: ValidationReport | None = None) -> ValidationReport:
+    """
+    Validate parsed floor rows (list[SheetRow]); SpawnTableUsed must be < group_count.
+    Rows past the template's floor count are only warned about (apply_floor_rows() skips them).
+    """
+    report = report or ValidationReport()
+    if template_floors is not None and len(stats) > len(template_floors):
+        for sr in stats[len(template_floors):]:
+            report.issues.append(Issue(
+                FLOOR_SHEET, f"row {sr.row}", "FloorNumber", None,
+                f"template only has {len(template_floors)} floors; row is ignored", "warning"))
+        stats = stats[:len(template_floors)]
+    if not stats:
+        return report
+
+    fields = FLOOR_INT_FIELDS + FLOOR_FLOAT_FIELDS
+    values, raw, cols = _load_columns(stats, fields)
+    missing_col = cols == 0
+    blank = np.array([[_is_blank(v) for v in r] for r in raw], dtype=bool) & ~missing_col
+    nan = np.isnan(values)
+    ok = ~nan
+    n_int = len(FLOOR_INT_FIELDS)
+
+    _emit(report, FLOOR_SHEET, blank, stats, raw, cols, fields, lambda n, v: "cell is blank")
+    _emit(report, FLOOR_SHEET, nan & ~blank & ~missing_col, stats, raw, cols, fields, lambda n, v: "not a number")
+
+    with np.errstate(invalid="ignore"):
+        ints = values[:, :n_int]
+        not_int = np.zeros_like(nan)
+        not_int[:, :n_int] = ok[:, :n_int] & (ints != np.floor(ints))
+        out_u32 = np.zeros_like(nan)
+        out_u32[:, :n_int] = ok[:, :n_int] & ~not_int[:, :n_int] & ((ints < 0) | (ints > U32_MAX))
+        floats = values[:, n_int:]
+        bad_float = np.zeros_like(nan)
+        bad_float[:, n_int:] = ok[:, n_int:] & (~np.isfinite(floats) | (np.abs(floats) > np.finfo(np.float32).max))
+        table_ref = np.zeros_like(nan)
+        if group_count is not None:
+            st = FLOOR_INT_FIELDS.index("SpawnTableUsed")
+            table_ref[:, st] = ok[:, st] & ~not_int[:, st] & ~out_u32[:, st] & (values[:, st] >= group_count)
+
+    _emit(report, FLOOR_SHEET, not_int, stats, raw, cols, fields, lambda n, v: "must be a whole number")
+    _emit(report, FLOOR_SHEET, out_u32, stats, raw, cols, fields, lambda n, v: f"must be between 0 and {U32_MAX}")
+    _emit(report, FLOOR_SHEET, bad_float, stats, raw, cols, fields, lambda n, v: "must fit a 32-bit float")
+    _emit(report, FLOOR_SHEET, table_ref, stats, raw, cols, fields,
+          lambda n, v: f"SpawnTableUsed must be below the group count ({group_count})")
+    return report
+
+
+def validate_rows(groups, stats, template_structs=None) -> ValidationReport:
+    """Validate both parsed sheets; template_structs is parse_rengoku_data() output (optional)."""
+    template_tables = template_structs[0] if template_structs else None
+    template_floors = template_structs[1] if template_structs else None
+    group_count = len(template_tables) if template_tables is not None else len(groups)
+    report = ValidationReport()
+    validate_spawn_rows(groups, template_tables=template_tables, report=report)
+    validate_floor_rows(stats, group_count=group_count, template_floors=template_floors, report=report)
+    return report
+
+
+def validate_workbook(excel_file, template_file=None) -> ValidationReport:
+    """Load a workbook (and optional template BIN) and return the full validation report."""
+    import openpyxl
+    from .excel import read_spawn_sheet, read_floor_sheet
+
+    wb = openpyxl.load_workbook(excel_file, data_only=True)
+    report = ValidationReport()
+    for sheet in (SPAWN_SHEET, FLOOR_SHEET):
+        if sheet not in wb.sheetnames:
+            report.issues.append(Issue(sheet, "-", "sheet", None, "sheet is missing"))
+    if report.errors:
+        return report
+
+    structs = None
+    if template_file:
+        from .io import parse_rengoku_data
+        structs = parse_rengoku_data(template_file)
+    return validate_rows(read_spawn_sheet(wb[SPAWN_SHEET]), read_floor_sheet(wb[FLOOR_SHEET]), structs)
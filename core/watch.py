@@ -0,0 +1,457 @@
+# core/watch.py
+"""
+Watch mode: rebuild a BIN whenever its source workbook / bundle / text dump is saved.
+
+  python -m core watch road.xlsx --template rengoku_data.bin -o server/rengoku_data.bin
+  python -m core watch --manifest watch.json        # {"watch": [{"source", "template", "output"}, ...]}
+
+  - Changes are picked up with inotify on Linux (via libc, no extra dependency) and
+    by polling mtime/size elsewhere or when inotify is unavailable.
+  - Saves are debounced: a rebuild starts once the source has been quiet for
+    'debounce' seconds (Excel and LibreOffice write in several steps).
+  - Workbooks are re-imported per sheet: each sheet's digest is the CRC-32/size of
+    its XML part (plus the shared-strings part) read from the .xlsx zip directory,
+    so unchanged sheets are neither parsed nor validated again.
+  - The target is written to a temp file next to it and swapped in with os.replace(),
+    so a server reading the BIN never sees a half-written file.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+from xml.etree import ElementTree
+
+from .bininfo import MHFDAT, RENGOKU, detect_file_kind
+
+DEFAULT_DEBOUNCE = 0.25
+DEFAULT_POLL_INTERVAL = 0.2
+DEFAULT_BUDGET = 1.0
+
+WORKBOOK_SUFFIXES = (".xlsx", ".xlsm")
+BUNDLE_SUFFIXES = (".json",)
+DUMP_SUFFIXES = (".txt", ".dump")
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+@dataclass
+class WatchRule:
+    source: str
+    template: str
+    output: str
+
+
+@dataclass
+class BuildResult:
+    rule: WatchRule
+    ok: bool
+    seconds: float
+    sections: list[str] = field(default_factory=list)   # sheets / sections re-imported ([] = nothing changed)
+    error: str = ""
+
+
+# ----------------------------
+# Helpers
+# ----------------------------
+
+@contextmanager
+def atomic_output(path):
+    """Yield a temp path next to 'path'; on success it replaces 'path' in one rename."""
+    path = os.fspath(path)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def sheet_digests(xlsx_path) -> dict[str, str]:
+    """Sheet name -> content digest, read from the zip directory without inflating any part."""
+    with zipfile.ZipFile(xlsx_path) as zf:
+        names = set(zf.namelist())
+        wb = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+        rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+        targets = {r.get("Id"): r.get("Target") for r in rels}
+        shared = ""
+        if "xl/sharedStrings.xml" in names:
+            info = zf.getinfo("xl/sharedStrings.xml")
+            shared = f"{info.CRC:08x}:{info.file_size}"
+        out = {}
+        for sheet in wb.iter(f"{_NS_MAIN}sheet"):
+            target = targets.get(sheet.get(f"{_NS_REL}id"), "")
+            member = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+            if member in names:
+                info = zf.getinfo(member)
+                out[sheet.get("name")] = f"{info.CRC:08x}:{info.file_size}:{shared}"
+        return out
+
+
+def _file_digest(path) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+# ----------------------------
+# Builders (one per source type, keeping state between rebuilds)
+# ----------------------------
+
+class _RengokuWorkbookBuilder:
+    """Spawn Table / Floor Stats sheets -> rengoku_data.bin (multi road, as export_excel_to_bin)."""
+
+    def __init__(self, rule: WatchRule):
+        from .validation import SPAWN_SHEET, FLOOR_SHEET
+        self.rule = rule
+        self.sheets = (SPAWN_SHEET, FLOOR_SHEET)
+        self.template = Path(rule.template).read_bytes()
+        self.data = bytearray(self.template)
+        self.digests: dict[str, str] = {}
+
+    def build(self) -> list[str]:
+        import openpyxl
+        from .excel import read_spawn_sheet, read_floor_sheet, apply_spawn_rows, apply_floor_rows
+        from .io import parse_rengoku_data
+        from .validation import ValidationReport, WorkbookValidationError, validate_spawn_rows, validate_floor_rows
+
+        digests = sheet_digests(self.rule.source)
+        changed = [s for s in self.sheets if digests.get(s) != self.digests.get(s)]
+        if not changed:
+            return []
+        missing = [s for s in changed if s not in digests]
+        if missing:
+            raise ValueError(f"workbook has no {', '.join(repr(s) for s in missing)} sheet")
+
+        # fresh template structs: rows the sheet no longer has fall back to the template
+        structs = parse_rengoku_data(self.rule.template)
+        wb = openpyxl.load_workbook(self.rule.source, read_only=True, data_only=True)
+        try:
+            report = ValidationReport()
+            data = bytearray(self.data)
+            spawn_sheet, floor_sheet = self.sheets
+            if spawn_sheet in changed:
+                tables = read_spawn_sheet(wb[spawn_sheet])
+                validate_spawn_rows(tables, template_tables=structs[0], report=report)
+                for group in structs[0]:
+                    for sp in group:
+                        data[sp.offset:sp.offset + 32] = self.template[sp.offset:sp.offset + 32]
+                apply_spawn_rows(structs[0], tables, data)
+            if floor_sheet in changed:
+                stats = read_floor_sheet(wb[floor_sheet])
+                validate_floor_rows(stats, group_count=len(structs[0]), template_floors=structs[1], report=report)
+                for fs in structs[1]:
+                    data[fs.offset:fs.offset + 24] = self.template[fs.offset:fs.offset + 24]
+                apply_floor_rows(structs[1], stats, data)
+        finally:
+            wb.close()
+        if report.errors:
+            raise WorkbookValidationError(report)
+
+        with atomic_output(self.rule.output) as tmp:
+            Path(tmp).write_bytes(data)
+        self.data = data
+        self.digests.update({s: digests[s] for s in changed})
+        return changed
+
+
+class _MhfdatWorkbookBuilder:
+    """Monster Points / Cat Shop / Medal Shop sheets -> mhfdat.bin."""
+
+    def __init__(self, rule: WatchRule):
+        from .json_io import bundle_from_files
+        from .mhfdat_excel import MONSTER_SHEET, CATSHOP_SHEET, MEDAL_SHEET
+        self.rule = rule
+        self.sheets = (MONSTER_SHEET, CATSHOP_SHEET, MEDAL_SHEET)
+        self.template_bundle = bundle_from_files(mhfdat_path=rule.template)
+        self.bundle = bundle_from_files(mhfdat_path=rule.template)
+        self.digests: dict[str, str] = {}
+        self._by_name = None
+
+    def build(self) -> list[str]:
+        import copy
+        import openpyxl
+        from .items import load_item_names, item_ids_by_name
+        from .json_io import apply_bundle
+        from .mhfdat_excel import read_mhfdat_sheet
+        from .validation import ValidationReport, WorkbookValidationError
+
+        digests = sheet_digests(self.rule.source)
+        changed = [s for s in self.sheets if digests.get(s) != self.digests.get(s)]
+        if not changed:
+            return []
+
+        monster_sheet, catshop_sheet, medal_sheet = self.sheets
+        bundle = copy.copy(self.bundle)
+        report = ValidationReport()
+        wb = openpyxl.load_workbook(self.rule.source, read_only=True, data_only=True)
+        try:
+            if self._by_name is None and ({catshop_sheet, medal_sheet} & set(changed)):
+                self._by_name = item_ids_by_name(load_item_names())
+            for sheet in changed:
+                # a deleted sheet leaves that section as it is in the template
+                present = sheet in digests
+                section = read_mhfdat_sheet(wb, sheet, report, self._by_name) if present else None
+                if sheet == monster_sheet:
+                    bundle.monster_points = section if present else self.template_bundle.monster_points
+                elif sheet == catshop_sheet:
+                    bundle.catshop = section if present else self.template_bundle.catshop
+                else:
+                    bundle.medalshop = section if present else self.template_bundle.medalshop
+        finally:
+            wb.close()
+        if report.errors:
+            raise WorkbookValidationError(report)
+
+        with atomic_output(self.rule.output) as tmp:
+            apply_bundle(bundle, mhfdat_template=self.rule.template, mhfdat_out=tmp)
+        self.bundle = bundle
+        self.digests.update({s: digests.get(s) for s in changed})
+        return changed
+
+
+class _BundleBuilder:
+    """JSON bundle or text dump -> the BIN kind of the template (written through apply_bundle)."""
+
+    def __init__(self, rule: WatchRule, kind: str):
+        self.rule = rule
+        self.kind = kind
+        self.digest = None
+
+    def build(self) -> list[str]:
+        from .json_io import read_bundle, apply_bundle
+
+        digest = _file_digest(self.rule.source)
+        if digest == self.digest:
+            return []
+        if self.rule.source.lower().endswith(BUNDLE_SUFFIXES):
+            bundle = read_bundle(self.rule.source)
+        else:
+            from .text_dump import read_dump
+            bundle = read_dump(self.rule.source)
+        with atomic_output(self.rule.output) as tmp:
+            if self.kind == RENGOKU:
+                apply_bundle(bundle, rengoku_template=self.rule.template, rengoku_out=tmp)
+            else:
+                apply_bundle(bundle, mhfdat_template=self.rule.template, mhfdat_out=tmp)
+            if not os.path.exists(tmp):   # the bundle had no section for this file
+                Path(tmp).write_bytes(Path(self.rule.template).read_bytes())
+        self.digest = digest
+        return [Path(self.rule.source).name]
+
+
+def make_builder(rule: WatchRule):
+    kind = detect_file_kind(rule.template)
+    if kind not in (RENGOKU, MHFDAT):
+        raise ValueError(f"{rule.template}: not a rengoku_data.bin or mhfdat.bin")
+    suffix = Path(rule.source).suffix.lower()
+    if suffix in WORKBOOK_SUFFIXES:
+        return _RengokuWorkbookBuilder(rule) if kind == RENGOKU else _MhfdatWorkbookBuilder(rule)
+    if suffix in BUNDLE_SUFFIXES + DUMP_SUFFIXES:
+        return _BundleBuilder(rule, kind)
+    raise ValueError(f"{rule.source}: unsupported source type (expected .xlsx, .json or .txt)")
+
+
+def build_once(builder) -> BuildResult:
+    start = time.perf_counter()
+    try:
+        sections = builder.build()
+    except Exception as e:
+        return BuildResult(builder.rule, False, time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+    return BuildResult(builder.rule, True, time.perf_counter() - start, sections)
+
+
+# ----------------------------
+# Change notification
+# ----------------------------
+
+class _InotifyBackend:
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = {}
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        for d in directories:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(d), mask)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {d}")
+            self.dirs[wd] = d
+
+    def wait(self, timeout: float) -> set[str]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        buf = os.read(self.fd, 64 * 1024)
+        paths, off = set(), 0
+        while off + self.EVENT.size <= len(buf):
+            wd, _mask, _cookie, length = self.EVENT.unpack_from(buf, off)
+            name = buf[off + self.EVENT.size:off + self.EVENT.size + length].rstrip(b"\0")
+            if wd in self.dirs and name:
+                paths.add(os.path.join(self.dirs[wd], os.fsdecode(name)))
+            off += self.EVENT.size + length
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _PollBackend:
+    def __init__(self, paths, interval: float):
+        self.paths = list(paths)
+        self.interval = interval
+        self.stamps = {p: self._stamp(p) for p in self.paths}
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = os.stat(path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def wait(self, timeout: float) -> set[str]:
+        time.sleep(min(timeout, self.interval))
+        changed = set()
+        for p in self.paths:
+            stamp = self._stamp(p)
+            if stamp != self.stamps[p]:
+                self.stamps[p] = stamp
+                changed.add(p)
+        return changed
+
+    def close(self):
+        pass
+
+
+def _backend(sources, poll: bool, interval: float):
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return _InotifyBackend(sorted({os.path.dirname(s) for s in sources}))
+        except (OSError, AttributeError):
+            pass
+    return _PollBackend(sources, interval)
+
+
+# ----------------------------
+# Watch loop
+# ----------------------------
+
+def watch(
+    rules: list[WatchRule],
+    *,
+    debounce: float = DEFAULT_DEBOUNCE,
+    poll: bool = False,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    on_result: Callable[[BuildResult, float | None], None] | None = None,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Build every rule once, then rebuild a rule whenever its source changes.
+    on_result(result, latency) gets each build; latency is seconds from the first
+    change notification to the swapped-in output (None for the initial builds).
+    Runs until 'stop' is set (or KeyboardInterrupt).
+    """
+    rules = [WatchRule(os.path.abspath(r.source), os.path.abspath(r.template), os.path.abspath(r.output))
+             for r in rules]
+    builders = {r.source: make_builder(r) for r in rules}
+    report = on_result or (lambda res, lat: None)
+    for b in builders.values():
+        res = build_once(b)
+        report(res, None)
+
+    backend = _backend(list(builders), poll, poll_interval)
+    first_seen: dict[str, float] = {}   # source -> time of first event in the burst
+    deadline: dict[str, float] = {}     # source -> rebuild time (pushed back by each event)
+    try:
+        while not (stop and stop.is_set()):
+            now = time.monotonic()
+            timeout = min([d - now for d in deadline.values()] + [poll_interval])
+            for path in backend.wait(max(timeout, 0.0)):
+                path = os.path.abspath(path)
+                if path in builders:
+                    now = time.monotonic()
+                    first_seen.setdefault(path, now)
+                    deadline[path] = now + debounce
+            now = time.monotonic()
+            for src in [s for s, d in deadline.items() if d <= now]:
+                del deadline[src]
+                res = build_once(builders[src])
+                report(res, time.monotonic() - first_seen.pop(src))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        backend.close()
+
+
+def load_watch_manifest(path) -> list[WatchRule]:
+    base = Path(path).resolve().parent
+    obj = json.loads(Path(path).read_text(encoding="utf-8"))
+    rules = []
+    for i, e in enumerate(obj.get("watch", [])):
+        try:
+            rules.append(WatchRule(*(str(base / e[k]) for k in ("source", "template", "output"))))
+        except KeyError as ke:
+            raise ValueError(f"Manifest watch entry {i}: missing {ke}") from None
+    return rules
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m core.watch", description="Rebuild BINs when sources change")
+    ap.add_argument("source", nargs="?", help=".xlsx / bundle .json / dump .txt to watch")
+    ap.add_argument("--template", help="template BIN for SOURCE")
+    ap.add_argument("-o", "--output", help="BIN to (re)write for SOURCE")
+    ap.add_argument("--manifest", help='JSON {"watch": [{"source", "template", "output"}, ...]}')
+    ap.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE, help="quiet time before a rebuild (s)")
+    ap.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="warn when change-to-output exceeds this (s)")
+    ap.add_argument("--poll", action="store_true", help="poll mtimes instead of using inotify")
+    args = ap.parse_args(argv)
+
+    rules = load_watch_manifest(args.manifest) if args.manifest else []
+    if args.source:
+        if not args.template or not args.output:
+            ap.error("SOURCE needs --template and --output")
+        rules.append(WatchRule(args.source, args.template, args.output))
+    if not rules:
+        ap.error("give SOURCE --template --output and/or --manifest")
+
+    def _print(res: BuildResult, latency: float | None):
+        name = os.path.basename(res.rule.source)
+        if not res.ok:
+            print(f"[FAIL] {name}: {res.error}", flush=True)
+        elif res.sections:
+            after = ""
+            if latency is not None:
+                late = f" (over the {args.budget:.2f}s budget)" if latency > args.budget else ""
+                after = f", {latency * 1000:.0f} ms after save{late}"
+            print(f"[ok  ] {name}: {', '.join(res.sections)} -> {res.rule.output} "
+                  f"in {res.seconds * 1000:.0f} ms{after}", flush=True)
+
+    print(f"watching {len(rules)} source(s); Ctrl+C to stop", flush=True)
+    watch(rules, debounce=args.debounce, poll=args.poll, on_result=_print)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,23 +1,20 @@
 import os, sys
 from PySide6.QtCore import Qt
-from PySide6.QtGui import (
-    QPixmap, QPainter, QPalette, QBrush, QIcon,
-    QFontDatabase, QFont, QColor,
-)
+from PySide6.QtGui import QFont, QColor
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QHBoxLayout, QVBoxLayout, QGridLayout,
     QLabel, QPushButton, QMessageBox, QFileDialog,
     QGraphicsDropShadowEffect, QSizePolicy, QSpacerItem,
 )
-from core.paths import ROOTDIR, resource_path
+from core.paths import resource_path
 from core.io import parse_rengoku_data
-from core.excel import create_excel_from_bin, export_excel_to_bin
 from core.mhfdat_io import parse_mhfdat
-from ui.medalshop_editor import MedalShopEditor
-from ui.monster_points_editor import MonsterPointsEditor
+from ui import assets
 from ui.styles import app_stylesheet
-from ui.dialogs import InAppEditor, ModeChooser
+
+# Editors and the Excel subsystem (openpyxl) are imported on first use so the
+# main window comes up with Qt alone; 'python -m src.startup' checks the budget.
 
 
 class RengokuWindow(QMainWindow):
@@ -30,7 +27,7 @@ class RengokuWindow(QMainWindow):
             Qt.WindowMinimizeButtonHint | Qt.WindowTitleHint
         )
         # ✅ Set the window icon here
-        self.setWindowIcon(QIcon(str(ROOTDIR / "./asset/icon.png")))
+        self.setWindowIcon(assets.icon())
 
         self._initUI()
 
@@ -38,12 +35,7 @@ class RengokuWindow(QMainWindow):
         central = QWidget(self)
         self.setCentralWidget(central)
 
-        bg = QPixmap(str(ROOTDIR / "./asset/bg6.png"))
-        if not bg.isNull():
-            bg = bg.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-            tmp = QPixmap(bg.size()); tmp.fill(Qt.transparent)
-            p = QPainter(tmp); p.setOpacity(0.25); p.drawPixmap(0, 0, bg); p.end()
-            pal = self.palette(); pal.setBrush(QPalette.ColorRole.Window, QBrush(tmp)); self.setPalette(pal)
+        assets.set_background(self, "bg6.png", 0.25)
 
         outer = QHBoxLayout(central)
         outer.addStretch(1)
@@ -51,15 +43,10 @@ class RengokuWindow(QMainWindow):
         outer.addLayout(column)
         outer.addStretch(1)
 
-        from PySide6.QtGui import QFontDatabase, QFont
-        from core.paths import resource_path
-
         column.addStretch(1)
 
-        # Robust font load
-        font_path = str(resource_path("asset", "Monster_hunter_frontier.ttf"))
-        font_id = QFontDatabase.addApplicationFont(font_path)
-        families = QFontDatabase.applicationFontFamilies(font_id) if font_id != -1 else []
+        # Robust font load (bytes already read by the asset preloader)
+        family = assets.font_family()
 
         header = QLabel("Blaze Road Editor", self)
         header.setAlignment(Qt.AlignCenter)
@@ -73,10 +60,10 @@ class RengokuWindow(QMainWindow):
         glow.setOffset(0, 0)
         header.setGraphicsEffect(glow)
 
-        if families:
-            header.setFont(QFont(families[0], 22))
+        if family:
+            header.setFont(QFont(family, 22))
         else:
-            print(f"[WARN] Could not load font at: {font_path}")
+            print(f"[WARN] Could not load font at: {resource_path('asset', assets.FONT)}")
             header.setFont(QFont("Segoe UI", 22))
 
         column.addWidget(header)
@@ -166,6 +153,7 @@ class RengokuWindow(QMainWindow):
         if not hasattr(self, "mhfdat_parsed"):
             QMessageBox.warning(self, "Error", "No mhfdat data loaded!")
             return
+        from ui.monster_points_editor import MonsterPointsEditor
         dlg = MonsterPointsEditor(self.mhfdat_path, self.mhfdat_parsed, self)
         dlg.exec()
 
@@ -239,6 +227,7 @@ class RengokuWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "No mhfdat data loaded!")
             return
 
+        from ui.medalshop_editor import MedalShopEditor
         dlg = MedalShopEditor(
             mhfdat_path=self.mhfdat_path,
             mhfdat_parsed=self.mhfdat_parsed
@@ -281,6 +270,7 @@ class RengokuWindow(QMainWindow):
         if not hasattr(self, "structs"):
             QMessageBox.warning(self, "Error", "No Rengoku data loaded!")
             return
+        from ui.dialogs import InAppEditor, ModeChooser
         chooser = ModeChooser(self)
         if chooser.exec() != QMessageBox.Accepted or chooser.choice is None:
             return
@@ -294,6 +284,7 @@ class RengokuWindow(QMainWindow):
         out_path, _ = QFileDialog.getSaveFileName(self, "Save Excel File", "", "Excel Files (*.xlsx)")
         if not out_path: return
         try:
+            from core.excel import create_excel_from_bin
             create_excel_from_bin(self.structs, out_path)
             QMessageBox.information(self, "Success", "Exported to Excel")
         except Exception as e:
@@ -312,6 +303,7 @@ class RengokuWindow(QMainWindow):
             template_file, _ = QFileDialog.getOpenFileName(self, "Open Rengoku Template File", "", "Binary Files (*.bin)")
             if not template_file: return
         try:
+            from core.excel import export_excel_to_bin
             export_excel_to_bin(excel_file, out_path, template_file)
             QMessageBox.information(self, "Success", "Imported from Excel and saved BIN.")
         except Exception as e:
@@ -321,6 +313,7 @@ class RengokuWindow(QMainWindow):
 def main():
     app = QApplication(sys.argv)
     app.setStyleSheet(app_stylesheet())
+    assets.preload()
     win = RengokuWindow()
     win.show()
     sys.exit(app.exec())
@@ -0,0 +1,354 @@
+# src/bench.py
+"""
+GUI benchmark under the offscreen Qt platform:
+
+  python -m src.bench [-o bench.json] [--groups 23 --per-group 20 --floors 50] [--repeat 5]
+  python -m src.bench --compare before.json after.json [--threshold 20]
+
+Builds a synthetic rengoku_data.bin / mhfdat.bin of the requested size (or uses
+--rengoku / --mhfdat), then times, on the GUI thread:
+  window           RengokuWindow() until shown
+  in_app_open      InAppEditor until 'loaded' (edit baseline taken) and shown
+  group_switch     one _load_group (Group combo change)
+  set_data         one spawn-table setData edit (scripted, cycling cells)
+  scroll           one page of the spawn table scrolled and repainted
+  in_app_save      InAppEditor.save_to_bin
+  monster_open / catshop_open / medalshop_open   each mhfdat editor until loaded and shown
+  monster_save / catshop_save / medalshop_save   each editor's Save
+
+File and message dialogs are answered by the script. Results are written as JSON
+({"results": {name: {"median_ms", "min_ms", "runs_ms"}}, plus sizes, commit and
+versions) so runs on different commits can be compared with --compare, which exits
+1 when a median got slower by more than --threshold percent.
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import random
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parent.parent
+BENCH_FORMAT = "rengoku-gui-bench"
+BENCH_VERSION = 1
+
+
+# ----------------------------
+# Synthetic files
+# ----------------------------
+
+def synthetic_rengoku(path, *, groups: int = 23, per_group: int = 20, floors: int = 50, seed: int = 1) -> None:
+    """A rengoku_data.bin with both road modes of the given size (random but valid records)."""
+    from core.models import FloorStats, RoadMode, SpawnTable
+
+    r = random.Random(seed)
+    buf = bytearray(0x14 + 2 * 24)
+    buf[0:4] = b"refr"
+    for mode_offset in (0x14, 0x2C):
+        floor_ptr = len(buf)
+        for i in range(floors):
+            buf += FloorStats(i + 1, r.randrange(groups), 0, r.choice([1.0, 1.5, 2.0]),
+                              r.choice([1.0, 1.25]), 40).serialize()
+        table_ptrs = []
+        for _ in range(groups):
+            table_ptrs.append(len(buf))
+            for _ in range(per_group):
+                buf += SpawnTable(r.randrange(1, 170), r.randrange(16), r.randrange(1, 170), 0, r.randrange(50),
+                                  r.choice([0xFFFFFFFF, 0, 1]), r.randrange(100), r.choice([0, 2, 4])).serialize()
+        tables = len(buf)
+        buf += struct.pack(f"<{groups}I", *table_ptrs)
+        counts = len(buf)
+        buf += struct.pack(f"<{groups}I", *([per_group] * groups))
+        buf[mode_offset:mode_offset + 24] = RoadMode(floors, groups, groups, floor_ptr, tables, counts).serialize()
+    buf += bytes(max(0, 10 * 1024 - len(buf)))   # the GUI refuses smaller files as compressed
+    Path(path).write_bytes(buf)
+
+
+def synthetic_mhfdat(path, *, monsters: int = 60, catshop: int = 30, medals: int = 25, seed: int = 2) -> None:
+    """An mhfdat.bin with just the sections the editors use."""
+    from core.catshop_io import ENTRY_PACK, POINTER_OFFSET_B10, SENTINEL
+    from core.medalshop_io import EXTRA_POINTER_OFFSET, POINTER_OFFSET_MEDAL, TOWER_PACK
+    from core.mhfdat_io import DataCounters, MonsterPoints, PTR_COUNTERS, PTR_MONSTER_DATA
+
+    r = random.Random(seed)
+    buf = bytearray(0x1000)
+    struct.pack_into("<II4xI", buf, 0, 0x1A66686D, 0x59, 0xBC8)
+    counters = len(buf)
+    buf += DataCounters(1, 2, catshop * 2, 4, monsters, counters).to_bytes() + bytes(6)
+    extra = len(buf)
+    buf += struct.pack("<16H", *([0] * 7 + [medals] + [0] * 8))
+    monster_ptr = len(buf)
+    for i in range(monsters):
+        buf += MonsterPoints(i + 1, 0, r.randrange(10, 200), 1, 2, 3, 4, 5, 0).to_bytes()
+    buf += bytes(16)
+    catshop_ptr = len(buf)
+    for _ in range(catshop):
+        buf += struct.pack(ENTRY_PACK, r.randrange(1, 9000), SENTINEL, 0, r.randrange(1, 9000), SENTINEL, 0)
+    buf += bytes(16)
+    medal_ptr = len(buf)
+    for _ in range(medals):
+        buf += struct.pack(TOWER_PACK, r.randrange(1, 9000), 4, 1, 0, 0, 0, r.randrange(1, 500), 0)
+    buf += bytes(12)
+    for off, ptr in ((PTR_MONSTER_DATA, monster_ptr), (PTR_COUNTERS, counters), (POINTER_OFFSET_B10, catshop_ptr),
+                     (POINTER_OFFSET_MEDAL, medal_ptr), (EXTRA_POINTER_OFFSET, extra)):
+        struct.pack_into("<I", buf, off, ptr)
+    Path(path).write_bytes(buf)
+
+
+# ----------------------------
+# Harness
+# ----------------------------
+
+@contextmanager
+def scripted_dialogs(save_path: str):
+    """Answer file dialogs with `save_path` and swallow message boxes while benchmarking."""
+    from PySide6.QtWidgets import QFileDialog, QMessageBox
+
+    saved = {n: getattr(QFileDialog, n) for n in ("getSaveFileName", "getOpenFileName")}
+    saved.update({n: getattr(QMessageBox, n) for n in ("information", "warning", "critical", "question")})
+    QFileDialog.getSaveFileName = staticmethod(lambda *a, **k: (save_path, ""))
+    QFileDialog.getOpenFileName = staticmethod(lambda *a, **k: ("", ""))
+    for n in ("information", "warning", "critical"):
+        setattr(QMessageBox, n, staticmethod(lambda *a, **k: QMessageBox.Ok))
+    QMessageBox.question = staticmethod(lambda *a, **k: QMessageBox.Yes)
+    try:
+        yield
+    finally:
+        for n, fn in saved.items():
+            setattr(QFileDialog if n.startswith("get") else QMessageBox, n, fn)
+
+
+def _wait_loaded(dialog, timeout_ms: int = 30000) -> None:
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    if getattr(dialog, "recorder", None) is not None or not hasattr(dialog, "loaded"):
+        return
+    loop = QEventLoop()
+    dialog.loaded.connect(loop.quit)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+
+
+def _open(app, make):
+    dlg = make()
+    _wait_loaded(dlg)
+    dlg.show()
+    app.processEvents()
+    return dlg
+
+
+def _close(app, dlg) -> None:
+    dlg.close()
+    dlg.deleteLater()
+    app.processEvents()
+
+
+class Bench:
+    def __init__(self, repeat: int):
+        self.repeat = repeat
+        self.results: dict[str, list[float]] = {}
+
+    def time(self, name: str, fn, *, repeat: int | None = None, per: int = 1):
+        """Run fn() `repeat` times; record ms per call (divided by `per` for batched steps)."""
+        runs = self.results.setdefault(name, [])
+        out = None
+        for _ in range(repeat or self.repeat):
+            t = time.perf_counter()
+            out = fn()
+            runs.append((time.perf_counter() - t) * 1000 / per)
+        return out
+
+    def summary(self) -> dict:
+        return {name: {"median_ms": round(statistics.median(runs), 3), "min_ms": round(min(runs), 3),
+                       "runs_ms": [round(x, 3) for x in runs]} for name, runs in self.results.items()}
+
+
+def run(rengoku: str, mhfdat: str, out_dir: str, *, repeat: int = 5, edits: int = 200) -> dict:
+    """Time every step; saves are written to out_dir."""
+    from PySide6.QtWidgets import QApplication
+
+    from core.io import parse_rengoku_data
+    from core.mhfdat_io import parse_mhfdat
+    from src.app import RengokuWindow
+    from ui import assets
+    from ui.styles import app_stylesheet
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setStyleSheet(app_stylesheet())
+    assets.preload().join()
+    bench = Bench(repeat)
+
+    def window():
+        w = RengokuWindow()
+        w.show()
+        app.processEvents()
+        return w
+
+    _close(app, bench.time("window", window))
+
+    # ---- road editor ----
+    from ui.dialogs import InAppEditor
+
+    structs = parse_rengoku_data(rengoku)
+    for i in range(repeat):
+        dlg = bench.time("in_app_open", lambda: _open(app, lambda: InAppEditor(structs, rengoku, "multi")), repeat=1)
+        if i != repeat - 1:
+            _close(app, dlg)
+
+    groups = dlg.group_combo.count()
+    steps = min(groups, 20)
+
+    def switch():
+        for i in range(1, steps + 1):
+            dlg.group_combo.setCurrentIndex(i % groups)
+            app.processEvents()
+
+    bench.time("group_switch", switch, per=steps)
+
+    def set_data():
+        model = dlg.spawn_model
+        rows = model.rowCount()
+        for i in range(edits):
+            col = (1, 3, 4, 6)[i % 4]
+            idx = model.index(i % rows, col)
+            model.setData(idx, (int(model.data(idx)) + 1) % 10)
+        app.processEvents()
+
+    bench.time("set_data", set_data, per=edits)
+
+    def scroll():
+        bar = dlg.tv_spawn.verticalScrollBar()
+        pages = 0
+        bar.setValue(bar.minimum())
+        while True:
+            dlg.tv_spawn.viewport().repaint()
+            pages += 1
+            if bar.value() >= bar.maximum():
+                return pages
+            bar.setValue(bar.value() + max(1, bar.pageStep()))
+
+    for _ in range(repeat):
+        t = time.perf_counter()
+        pages = scroll()
+        bench.results.setdefault("scroll", []).append((time.perf_counter() - t) * 1000 / pages)
+
+    with scripted_dialogs(os.path.join(out_dir, "rengoku_data.bin")):
+        bench.time("in_app_save", dlg.save_to_bin)
+    _close(app, dlg)
+
+    # ---- mhfdat editors ----
+    from ui.catshop_editor import CatShopEditor
+    from ui.medalshop_editor import MedalShopEditor
+    from ui.monster_points_editor import MonsterPointsEditor
+
+    parsed = parse_mhfdat(mhfdat)
+    editors = (("monster", lambda: MonsterPointsEditor(mhfdat, parsed)),
+               ("catshop", lambda: CatShopEditor(mhfdat, parsed)),
+               ("medalshop", lambda: MedalShopEditor(mhfdat, parsed)))
+    for name, make in editors:
+        for i in range(repeat):
+            dlg = bench.time(f"{name}_open", lambda: _open(app, make), repeat=1)
+            if i != repeat - 1:
+                _close(app, dlg)
+        with scripted_dialogs(os.path.join(out_dir, f"{name}_mhfdat.bin")):
+            bench.time(f"{name}_save", dlg._save)
+        _close(app, dlg)
+
+    return bench.summary()
+
+
+def git_commit() -> str | None:
+    try:
+        proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+    return proc.stdout.strip() + ("-dirty" if dirty else "") if proc.returncode == 0 else None
+
+
+def compare(before: dict, after: dict, threshold: float) -> int:
+    """Print per-metric deltas; 1 if any median regressed by more than `threshold` percent."""
+    worse = []
+    print(f"{'metric':<16}{'before':>12}{'after':>12}{'change':>10}")
+    for name, a in after["results"].items():
+        b = before["results"].get(name)
+        if b is None:
+            print(f"{name:<16}{'-':>12}{a['median_ms']:>10.3f}ms{'new':>10}")
+            continue
+        change = (a["median_ms"] - b["median_ms"]) / b["median_ms"] * 100 if b["median_ms"] else 0.0
+        flag = " !" if change > threshold else ""
+        if flag:
+            worse.append(name)
+        print(f"{name:<16}{b['median_ms']:>10.3f}ms{a['median_ms']:>10.3f}ms{change:>+9.1f}%{flag}")
+    if before.get("sizes") != after.get("sizes"):
+        print("note: the two runs used different file sizes")
+    if worse:
+        print(f"FAIL: slower by more than {threshold:g}%: {', '.join(worse)}")
+    return 1 if worse else 0
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m src.bench", description="Offscreen GUI benchmark")
+    ap.add_argument("-o", "--output", help="write results JSON here")
+    ap.add_argument("--rengoku", help="use this rengoku_data.bin instead of a synthetic one")
+    ap.add_argument("--mhfdat", help="use this mhfdat.bin instead of a synthetic one")
+    ap.add_argument("--groups", type=int, default=23)
+    ap.add_argument("--per-group", type=int, default=20)
+    ap.add_argument("--floors", type=int, default=50)
+    ap.add_argument("--monsters", type=int, default=60)
+    ap.add_argument("--catshop", type=int, default=30)
+    ap.add_argument("--medals", type=int, default=25)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--edits", type=int, default=200, help="scripted setData edits per run")
+    ap.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files")
+    ap.add_argument("--threshold", type=float, default=20.0, help="--compare: allowed slowdown in percent")
+    args = ap.parse_args(argv)
+
+    if args.compare:
+        before, after = (json.loads(Path(p).read_text(encoding="utf-8")) for p in args.compare)
+        return compare(before, after, args.threshold)
+
+    sizes = {k: getattr(args, k) for k in ("groups", "per_group", "floors", "monsters", "catshop", "medals")}
+    sizes.update({k: os.path.abspath(v) for k, v in (("rengoku", args.rengoku), ("mhfdat", args.mhfdat)) if v})
+    with tempfile.TemporaryDirectory(prefix="rengoku-bench-") as tmp:
+        rengoku = args.rengoku or os.path.join(tmp, "rengoku_data.bin")
+        mhfdat = args.mhfdat or os.path.join(tmp, "mhfdat.bin")
+        if not args.rengoku:
+            synthetic_rengoku(rengoku, groups=args.groups, per_group=args.per_group, floors=args.floors)
+        if not args.mhfdat:
+            synthetic_mhfdat(mhfdat, monsters=args.monsters, catshop=args.catshop, medals=args.medals)
+        results = run(rengoku, mhfdat, tmp, repeat=max(1, args.repeat), edits=max(1, args.edits))
+
+    from PySide6 import __version__ as pyside_version
+
+    doc = {
+        "format": BENCH_FORMAT, "version": BENCH_VERSION,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": git_commit(),
+        "python": platform.python_version(), "pyside6": pyside_version, "platform": platform.platform(),
+        "qpa": os.environ.get("QT_QPA_PLATFORM"),
+        "sizes": sizes,
+        "results": results,
+    }
+    for name, r in results.items():
+        print(f"{name:<16}{r['median_ms']:>10.3f} ms  (min {r['min_ms']:.3f})")
+    if args.output:
+        Path(args.output).write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        print(f"-> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
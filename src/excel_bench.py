@@ -0,0 +1,171 @@
+# src/excel_bench.py
+"""
+Excel export benchmark (no Qt):
+
+  python -m src.excel_bench [-o excel_bench.json] [--groups 200 --per-group 100 --floors 50] [--repeat 3]
+
+Builds a synthetic rengoku_data.bin (src.bench.synthetic_rengoku, or --rengoku) and
+times create_excel_from_bin() twice per run:
+  named    header/group rows reference the workbook's named styles (current export)
+  inline   the same rows get Font/Fill/Alignment/Border assigned cell by cell
+
+For each mode it reports the whole export, the wb.save() part of it and the .xlsx
+size, so the effect of the named styles on large spawn sheets can be re-measured
+on any commit.
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .bench import git_commit, synthetic_rengoku
+
+BENCH_FORMAT = "rengoku-excel-bench"
+BENCH_VERSION = 1
+MODES = ("named", "inline")
+
+
+# ----------------------------
+# Styling modes
+# ----------------------------
+
+def _inline_header_row(ws, row_idx: int, bold=True, center=True):
+    from core.excel import CENTER, HEADER_FILL, THIN_BORDER, WHITE_FONT
+    from openpyxl.styles import Font
+
+    for col in range(1, ws.max_column + 1):
+        c = ws.cell(row=row_idx, column=col)
+        c.font = WHITE_FONT if bold else Font(bold=True)
+        c.fill = HEADER_FILL
+        if center:
+            c.alignment = CENTER
+        c.border = THIN_BORDER
+
+
+def _inline_group_header(ws, row_idx: int):
+    from core.excel import GROUP_FILL, LEFT, THIN_BORDER, WHITE_FONT
+
+    for col in range(1, max(1, ws.max_column) + 1):
+        c = ws.cell(row=row_idx, column=col)
+        if col == 1:
+            c.alignment = LEFT
+            c.font = WHITE_FONT
+        else:
+            c.value = None
+        c.fill = GROUP_FILL
+        c.border = THIN_BORDER
+
+
+@contextmanager
+def styling(mode: str):
+    """Run create_excel_from_bin with the given MODES styling and record wb.save() times."""
+    import openpyxl
+    from core import excel
+
+    saves: list[float] = []
+    real_save = openpyxl.Workbook.save
+
+    def timed_save(wb, filename):
+        start = time.perf_counter()
+        real_save(wb, filename)
+        saves.append(time.perf_counter() - start)
+
+    patched = {}
+    if mode == "inline":
+        patched = {"_style_header_row": _inline_header_row, "_style_group_header": _inline_group_header,
+                   "register_named_styles": lambda wb: wb}
+    originals = {name: getattr(excel, name) for name in patched}
+    openpyxl.Workbook.save = timed_save
+    for name, fn in patched.items():
+        setattr(excel, name, fn)
+    try:
+        yield saves
+    finally:
+        openpyxl.Workbook.save = real_save
+        for name, fn in originals.items():
+            setattr(excel, name, fn)
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+
+def _stats(runs: list[float]) -> dict:
+    ms = [round(r * 1000, 3) for r in runs]
+    return {"median_ms": statistics.median(ms), "min_ms": min(ms), "runs_ms": ms}
+
+
+def run(rengoku: str, out_dir: str, *, repeat: int = 3) -> dict:
+    """{mode: {"export": stats, "save": stats, "size_bytes": n}} for every mode in MODES."""
+    from core.excel import create_excel_from_bin
+    from core.io import parse_rengoku_data
+
+    structs = parse_rengoku_data(rengoku)
+    if not structs:
+        raise ValueError(f"Failed to parse Rengoku data: {rengoku}")
+    create_excel_from_bin(structs, os.path.join(out_dir, "warmup.xlsx"))   # imports and caches
+
+    totals = {mode: [] for mode in MODES}
+    saves = {mode: [] for mode in MODES}
+    sizes = {}
+    for _ in range(repeat):
+        for mode in MODES:     # interleaved so drift hits both modes alike
+            out = os.path.join(out_dir, f"{mode}.xlsx")
+            with styling(mode) as save_times:
+                start = time.perf_counter()
+                create_excel_from_bin(structs, out)
+                totals[mode].append(time.perf_counter() - start)
+            saves[mode].extend(save_times)
+            sizes[mode] = os.path.getsize(out)
+    return {mode: {"export": _stats(totals[mode]), "save": _stats(saves[mode]), "size_bytes": sizes[mode]}
+            for mode in MODES}
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m src.excel_bench", description="Excel export benchmark")
+    ap.add_argument("-o", "--output", help="write results JSON here")
+    ap.add_argument("--rengoku", help="use this rengoku_data.bin instead of a synthetic one")
+    ap.add_argument("--groups", type=int, default=200)
+    ap.add_argument("--per-group", type=int, default=100)
+    ap.add_argument("--floors", type=int, default=50)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    sizes = {k: getattr(args, k) for k in ("groups", "per_group", "floors")}
+    if args.rengoku:
+        sizes = {"rengoku": os.path.abspath(args.rengoku)}
+    with tempfile.TemporaryDirectory(prefix="rengoku-excel-bench-") as tmp:
+        rengoku = args.rengoku or os.path.join(tmp, "rengoku_data.bin")
+        if not args.rengoku:
+            synthetic_rengoku(rengoku, groups=args.groups, per_group=args.per_group, floors=args.floors)
+        results = run(rengoku, tmp, repeat=max(1, args.repeat))
+
+    import openpyxl
+
+    doc = {
+        "format": BENCH_FORMAT, "version": BENCH_VERSION,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": git_commit(),
+        "python": platform.python_version(), "openpyxl": openpyxl.__version__, "platform": platform.platform(),
+        "sizes": sizes,
+        "results": results,
+    }
+    print(f"{'mode':<8}{'export':>12}{'save':>12}{'size':>12}")
+    for mode, r in results.items():
+        print(f"{mode:<8}{r['export']['median_ms']:>10.1f}ms{r['save']['median_ms']:>10.1f}ms"
+              f"{r['size_bytes'] / 1024:>9.0f}KiB")
+    if args.output:
+        Path(args.output).write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        print(f"-> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+# src/startup.py
+"""
+Startup import budget for the GUI: python -m src.startup [--budget-ms 400] [--runs 5]
+
+Imports src.app in fresh interpreters (python -X importtime), reports the median
+cumulative import time and the slowest top-level imports, and exits 1 when
+  - the median exceeds the budget, or
+  - a module that must load lazily (editors, openpyxl, numpy) was imported at startup.
+Run it in CI or before a release; it needs PySide6 but no display.
+"""
+from __future__ import annotations
+
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 400
+DEFAULT_RUNS = 5
+
+# loaded on first use by RengokuWindow; importing any of these at startup is a regression
+LAZY_MODULES = (
+    "openpyxl", "numpy", "core.excel", "ui.dialogs", "ui.monster_points_editor",
+    "ui.medalshop_editor", "ui.catshop_editor",
+)
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(module: str = "src.app") -> tuple[float, dict[str, float], set[str]]:
+    """One fresh import: (total ms, {top-level import: cumulative ms}, every module imported)."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    total, top, seen = 0.0, {}, set()
+    children: dict[str, float] = {}   # importtime lists children before their parent
+    for m in _LINE.finditer(proc.stderr):
+        cumulative, depth, name = int(m.group(2)) / 1000, len(m.group(3)), m.group(4)
+        seen.add(name)
+        if depth == 3:
+            children[name] = cumulative
+        elif depth == 1:
+            if name == module:
+                total, top = cumulative, children
+            children = {}
+    return total, top, seen
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="python -m src.startup", description="GUI startup import budget")
+    ap.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    ap.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = ap.parse_args(argv)
+
+    measure()   # warm the OS file cache so the first run is not an outlier
+    runs = [measure() for _ in range(max(1, args.runs))]
+    median = statistics.median(r[0] for r in runs)
+    top, seen = runs[0][1], set().union(*(r[2] for r in runs))
+    eager = sorted(m for m in LAZY_MODULES if m in seen)
+
+    print(f"import src.app: median {median:.0f} ms over {len(runs)} run(s) (budget {args.budget_ms:.0f} ms)")
+    for name, ms in sorted(top.items(), key=lambda kv: -kv[1])[:8]:
+        print(f"  {ms:7.1f} ms  {name}")
+    ok = median <= args.budget_ms and not eager
+    if median > args.budget_ms:
+        print(f"FAIL: over budget by {median - args.budget_ms:.0f} ms")
+    if eager:
+        print(f"FAIL: imported at startup but should load on first use: {', '.join(eager)}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+# ui/assets.py
+"""
+Process-wide cache for the GUI's bundled assets (backgrounds, icon, header font).
+
+  from ui import assets
+  assets.preload()                                  # once, right after QApplication()
+  assets.set_background(widget, "bg2.jpg", 0.65)    # composited pixmap, cached per size/opacity
+  family = assets.font_family()                     # Monster_hunter_frontier.ttf, or None
+
+preload() decodes the images (QImage, which is safe off the GUI thread) and reads
+the font file on a worker thread, so the first dialog does not block on JPEG
+decoding. Anything requested before the worker gets to it is decoded on the spot.
+
+Opacity is applied once per (image, opacity) at full resolution, so producing a
+background for a new size is a single scale. Smooth-scaled results are kept in an
+LRU of CACHE_SIZE entries keyed by (image, size, opacity); fast (nearest-neighbour)
+scales for live resizing are not cached.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QBrush, QFontDatabase, QIcon, QImage, QPainter, QPalette, QPixmap
+
+from core.paths import resource_path
+
+BACKGROUNDS = ("bg6.png", "bg2.jpg", "bg3.jpg")
+ICON = "icon.png"
+FONT = "Monster_hunter_frontier.ttf"
+CACHE_SIZE = 24
+
+_lock = threading.Lock()
+_images: dict[str, QImage] = {}
+_pending: dict[str, threading.Event] = {}
+_font_data: bytes | None = None
+_font_family: str | None = None
+_font_loaded = False
+_faded: dict[tuple, QImage] = {}
+_scaled: OrderedDict[tuple, QPixmap] = OrderedDict()
+
+
+def _decode(name: str) -> QImage:
+    img = QImage(str(resource_path("asset", name)))
+    if not img.isNull():
+        # premultiplied ARGB is what QPixmap converts to anyway; do it off the GUI thread
+        img = img.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    return img
+
+
+def _worker(names: tuple[str, ...]) -> None:
+    global _font_data
+    for name in names:
+        img = _decode(name)
+        with _lock:
+            _images.setdefault(name, img)
+            done = _pending.pop(name, None)
+        if done:
+            done.set()
+    try:
+        _font_data = resource_path("asset", FONT).read_bytes()
+    except OSError:
+        _font_data = b""
+
+
+def preload(names: tuple[str, ...] = BACKGROUNDS + (ICON,)) -> threading.Thread:
+    """Start decoding the assets on a daemon thread; returns the thread."""
+    with _lock:
+        todo = tuple(n for n in names if n not in _images and n not in _pending)
+        for n in todo:
+            _pending[n] = threading.Event()
+    t = threading.Thread(target=_worker, args=(todo,), name="asset-preload", daemon=True)
+    t.start()
+    return t
+
+
+def image(name: str) -> QImage:
+    """Decoded image (null QImage if the file is missing); waits for the preloader if it is on it."""
+    with _lock:
+        img = _images.get(name)
+        pending = _pending.get(name)
+    if img is not None:
+        return img
+    if pending is not None:
+        pending.wait()
+        return _images[name]
+    img = _decode(name)
+    with _lock:
+        return _images.setdefault(name, img)
+
+
+def icon(name: str = ICON) -> QIcon:
+    return QIcon(QPixmap.fromImage(image(name)))
+
+
+def _faded_image(name: str, opacity: float) -> QImage | None:
+    key = (name, opacity)
+    img = _faded.get(key)
+    if img is None:
+        src = image(name)
+        if src.isNull():
+            return None
+        img = src
+        if 0.0 <= opacity < 1.0:
+            img = QImage(src.size(), QImage.Format_ARGB32_Premultiplied)
+            img.fill(Qt.transparent)
+            p = QPainter(img)
+            p.setOpacity(opacity)
+            p.drawImage(0, 0, src)
+            p.end()
+        _faded[key] = img
+    return img
+
+
+def background(name: str, size: QSize, opacity: float = 1.0, *, smooth: bool = True) -> QPixmap | None:
+    """
+    `name` scaled to cover `size` at `opacity`; None if the image is missing.
+    smooth=False returns a cached smooth result if there is one, else a fast uncached scale.
+    """
+    opacity = round(opacity, 3)
+    key = (name, size.width(), size.height(), opacity)
+    pix = _scaled.get(key)
+    if pix is not None:
+        _scaled.move_to_end(key)
+        return pix
+    img = _faded_image(name, opacity)
+    if img is None:
+        return None
+    mode = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+    pix = QPixmap.fromImage(img.scaled(size, Qt.KeepAspectRatioByExpanding, mode))
+    if smooth:
+        _scaled[key] = pix
+        while len(_scaled) > CACHE_SIZE:
+            _scaled.popitem(last=False)
+    return pix
+
+
+def set_background(widget, name: str, opacity: float = 1.0, *, smooth: bool = True) -> bool:
+    """Paint `name` behind `widget` at its current size (no resize tracking); False if missing."""
+    pix = background(name, widget.size(), opacity, smooth=smooth)
+    if pix is None:
+        return False
+    widget.setAutoFillBackground(True)
+    pal = widget.palette()
+    pal.setBrush(QPalette.ColorRole.Window, QBrush(pix))
+    widget.setPalette(pal)
+    return True
+
+
+def font_family() -> str | None:
+    """Register the header font once (GUI thread) and return its family name."""
+    global _font_family, _font_loaded
+    if not _font_loaded:
+        data = _font_data
+        if data is None:
+            try:
+                data = resource_path("asset", FONT).read_bytes()
+            except OSError:
+                data = b""
+        font_id = QFontDatabase.addApplicationFontFromData(data) if data else -1
+        families = QFontDatabase.applicationFontFamilies(font_id) if font_id != -1 else []
+        _font_family = families[0] if families else None
+        _font_loaded = True
+    return _font_family
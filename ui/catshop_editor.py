@@ -1,69 +1,25 @@
 # ui/catshop_editor.py
 from __future__ import annotations
 
-from pathlib import Path
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal, QSortFilterProxyModel
-from PySide6.QtGui import QPixmap, QPainter, QPalette, QBrush, QColor, QFont
+from PySide6.QtGui import QColor, QFont
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QGroupBox, QFormLayout, QSpinBox,
     QTableView, QHeaderView, QAbstractItemView, QHBoxLayout,
     QPushButton, QFileDialog, QMessageBox, QLineEdit, QGraphicsDropShadowEffect
 )
 
-from core.paths import ROOTDIR, resource_path
+import copy
+
+from core.items import load_item_names
+from ui.loader import load_in_background, set_loading
 from ui.utils import apply_dialog_background
 from core.catshop_io import parse_catshop, save_catshop, CatShopItem, CatShopParsed
+from core.semantic_patch import CATSHOP, SectionRecorder, write_edits
 from core.json_io import catshop_to_json, catshop_from_json
 from .models import IntDelegate
 from .models import EDITOR_TEXT_STYLE
 
-# ---------- helpers ----------
-def load_item_names() -> dict[int, str]:
-    """
-    Load item ID -> name from asset/Items.xlsx (first sheet).
-    Expected headers include: ID (or ItemID), Name (or ItemName).
-    """
-    try:
-        from openpyxl import load_workbook
-    except Exception:
-        return {}
-
-    xlsx_path = resource_path("asset", "Items.xlsx")
-    p = Path(xlsx_path)
-    if not p.exists():
-        p = Path("asset/Items.xlsx")
-        if not p.exists():
-            return {}
-
-    try:
-        wb = load_workbook(str(p), read_only=True, data_only=True)
-        ws = wb[wb.sheetnames[0]]
-        headers = { (c.value or "").strip().lower(): idx
-                    for idx, c in enumerate(next(ws.iter_rows(min_row=1, max_row=1))[0:]) }
-        id_idx = None
-        name_idx = None
-        for key, idx in headers.items():
-            if key in ("id", "itemid", "item_id"):
-                id_idx = idx
-            if key in ("name", "itemname", "item_name"):
-                name_idx = idx
-        if id_idx is None or name_idx is None:
-            id_idx, name_idx = 0, 1
-
-        mapping: dict[int, str] = {}
-        for row in ws.iter_rows(min_row=2):
-            try:
-                rid = row[id_idx].value
-                rname = row[name_idx].value
-                if rid is None or rname is None:
-                    continue
-                mapping[int(rid)] = str(rname)
-            except Exception:
-                continue
-        return mapping
-    except Exception:
-        return {}
-
 class ItemListModel(QAbstractTableModel):
     COLS = ["id", "name"]
     HEADERS = ["ID", "Name"]
@@ -232,25 +188,26 @@ class CatShopModel(QAbstractTableModel):
     def end_full_reset(self):
         self.endResetModel()
 
+def _load_catshop(mhfdat_path: str) -> dict:
+    """Loader thread: item names, parsed shop and the edit-recorder baseline."""
+    parsed = parse_catshop(mhfdat_path) or CatShopParsed(rows=[])
+    return {"names": load_item_names(), "parsed": parsed, "baseline": copy.deepcopy(parsed.rows)}
+
+
 class CatShopEditor(QDialog):
     """
     Road Cat Item Shop editor:
+    opens immediately; item names and the shop are loaded on the thread pool.
     """
+    loaded = Signal()
+
     def __init__(self, mhfdat_path: str, mhfdat_parsed: dict, parent=None):
         super().__init__(parent)
         self.setModal(True)
         self.setWindowTitle("Road Cat Item Shop")
         self.resize(1000, 640)
 
-        try:
-            apply_dialog_background(self, image_name="bg2.jpg", opacity=0.65)
-        except Exception:
-            bg = QPixmap(str(ROOTDIR / "asset/bg2.jpg"))
-            if not bg.isNull():
-                bg = bg.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-                tmp = QPixmap(bg.size()); tmp.fill(Qt.transparent)
-                p = QPainter(tmp); p.setOpacity(0.65); p.drawPixmap(0, 0, bg); p.end()
-                pal = self.palette(); pal.setBrush(QPalette.ColorRole.Window, QBrush(tmp)); self.setPalette(pal)
+        apply_dialog_background(self, image_name="bg2.jpg", opacity=0.65)
 
         self.setWindowFlags(
             Qt.Window | Qt.WindowCloseButtonHint | Qt.WindowMinimizeButtonHint |
@@ -261,10 +218,9 @@ class CatShopEditor(QDialog):
         self.mhfdat_parsed = mhfdat_parsed or {}
         self.counters = self.mhfdat_parsed.get("counters")
 
-        self.id_to_name = load_item_names()
-
-        parsed = parse_catshop(mhfdat_path) or CatShopParsed(rows=[])
-        self.parsed = parsed
+        self.id_to_name: dict[int, str] = {}
+        self.parsed = CatShopParsed(rows=[])
+        self.recorder = None
 
         root = QVBoxLayout(self)
 
@@ -295,9 +251,7 @@ class CatShopEditor(QDialog):
         self._style_table(self.table)
         root.addWidget(self.table, 1)
 
-        self.model = CatShopModel(self.parsed.rows, self.id_to_name, self)
-        self.model.idsChanged.connect(self._update_counter_from_rows)
-        self.table.setModel(self.model)
+        self.model = None
         self.table.setItemDelegateForColumn(0, IntDelegate(0, 65535, self.table))
         self.table.setItemDelegateForColumn(2, IntDelegate(0, 65535, self.table))
 
@@ -328,6 +282,10 @@ class CatShopEditor(QDialog):
         self.btn_import_json.clicked.connect(self._import_json)
         row.addWidget(self.btn_import_json)
 
+        self.btn_export_edits = QPushButton("Export Edits", self)
+        self.btn_export_edits.clicked.connect(self._export_edits)
+        row.addWidget(self.btn_export_edits)
+
         self.btn_save = QPushButton("Save", self)
         self.btn_save.clicked.connect(self._save)
         row.addWidget(self.btn_save)
@@ -340,7 +298,25 @@ class CatShopEditor(QDialog):
         row.addStretch(1)
         root.addLayout(row)
 
+        self.lbl_count.setText("…")
+        set_loading(self, True)
+        self._job = load_in_background(self, lambda: _load_catshop(mhfdat_path),
+                                       self._on_loaded, self._on_load_failed)
+
+    def _on_loaded(self, data: dict):
+        self.id_to_name = data["names"]
+        self.parsed = data["parsed"]
+        self.recorder = SectionRecorder(CATSHOP, lambda: self.parsed.rows, baseline=data["baseline"])
+        self.model = CatShopModel(self.parsed.rows, self.id_to_name, self)
+        self.model.idsChanged.connect(self._update_counter_from_rows)
+        self.table.setModel(self.model)
         self._update_counter_from_rows()
+        set_loading(self, False)
+        self.loaded.emit()
+
+    def _on_load_failed(self, message: str):
+        QMessageBox.critical(self, "Error", f"Failed to load the Cat Shop:\n{message}")
+        self.reject()
 
     def _style_table(self, tv: QTableView):
         tv.setAlternatingRowColors(True)
@@ -444,6 +420,20 @@ class CatShopEditor(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to import JSON:\n{e}")
 
+    def _export_edits(self):
+        edits = self.recorder.edits()
+        if not edits:
+            QMessageBox.information(self, "No Edits", "Nothing has been changed since this editor was opened.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Edits", "catshop_edits.json", "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            write_edits(edits, path)
+            QMessageBox.information(self, "Exported", f"Exported {len(edits)} edit(s) to {path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export edits:\n{e}")
+
     def _save(self):
         for i, row in enumerate(self.parsed.rows):
             if i < len(self.parsed.rows) - 1:
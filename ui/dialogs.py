@@ -1,20 +1,40 @@
 
+import copy
 import os
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QHBoxLayout, QPushButton, QTableView,
                                QGroupBox, QAbstractItemView, QHeaderView, QFileDialog,
                                QMessageBox, QTextEdit, QTableWidget, QTableWidgetItem, QComboBox)
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QPainter, QPalette, QBrush, QColor, QFont
-import openpyxl
-from numpy.distutils.misc_util import cyan_text
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QColor, QFont
 
-from core.paths import ROOTDIR
 from core.constants import DETAILS_XLSX_DEFAULT, NOTES_TEXT
 from core.io import save_structs_to_bin
+from core.json_io import RoadSection
+from core.semantic_patch import SectionRecorder, write_edits
+from . import assets
+from .loader import load_in_background, set_loading
 from .models import (FloorStatsModel, SpawnTableModel, MonsterDelegate, IntDelegate, FloatDelegate, EnumDelegate,
                      DROPDOWN_STYLE)
 
+# spawn table columns with a fixed width: FirstMonsterID, SecondMonsterID, Bonus Spawns
+WIDE_SPAWN_COLUMNS = {0: 220, 2: 220, 5: 260}
+
+
+def _longest_spawn_cells(rows) -> dict[int, str]:
+    """Longest display text of each spawn column that is sized to its contents."""
+    return {col: max((str(getattr(r, name)) for r in rows), key=len, default="")
+            for col, name in enumerate(SpawnTableModel.COLS) if col not in WIDE_SPAWN_COLUMNS}
+
+
+def _load_road(floors, spawn_tables) -> dict:
+    """Loader thread: edit-recorder baseline and the first group's column text."""
+    return {"baseline": copy.deepcopy(RoadSection(floors, spawn_tables)),
+            "first_group": _longest_spawn_cells(spawn_tables[0] if spawn_tables else [])}
+
+
 class InAppEditor(QDialog):
+    loaded = Signal()   # edit-recorder baseline taken; tables are editable
+
     def __init__(self, structs, rengoku_path, mode:str, parent=None):
         super().__init__(parent)
         self.setModal(True)
@@ -32,18 +52,7 @@ class InAppEditor(QDialog):
         self.mode = mode
 
         # Background with lower opacity so tables are readable
-        self.bakimg = QPixmap(str(ROOTDIR / "./asset/bg2.jpg"))
-        if not self.bakimg.isNull():
-            self.bakimg = self.bakimg.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-            tmp = QPixmap(self.bakimg.size())
-            tmp.fill(Qt.transparent)
-            p = QPainter(tmp)
-            p.setOpacity(0.55)
-            p.drawPixmap(0, 0, self.bakimg)
-            p.end()
-            pal = self.palette()
-            pal.setBrush(QPalette.ColorRole.Window, QBrush(tmp))
-            self.setPalette(pal)
+        assets.set_background(self, "bg2.jpg", 0.55)
 
         layout = QVBoxLayout(self)
 
@@ -61,6 +70,11 @@ class InAppEditor(QDialog):
         self.save_btn.clicked.connect(self.save_to_bin)
         tools.addWidget(self.save_btn)
 
+        self.edits_btn = QPushButton("Export Edits", self)
+        self.edits_btn.setToolTip("Save every change made in this editor as a replayable edits file.")
+        self.edits_btn.clicked.connect(self.export_edits)
+        tools.addWidget(self.edits_btn)
+
         self.notes_btn = QPushButton("Variant Flags", self)  # renamed from "Notes"
         self.notes_btn.clicked.connect(self.show_notes)
         tools.addWidget(self.notes_btn)
@@ -120,12 +134,20 @@ class InAppEditor(QDialog):
     def _wire_models(self):
         spawn_tables, floor_stats, _multi_def, spawn_tables_solo, floor_stats_solo, _solo_def = self.structs
         if self.mode == "multi":
-            self.floor_model = FloorStatsModel(floor_stats, self)
-            self.spawn_tables = spawn_tables
+            self.floors, self.spawn_tables = floor_stats, spawn_tables
         else:
-            self.floor_model = FloorStatsModel(floor_stats_solo, self)
-            self.spawn_tables = spawn_tables_solo
-
+            self.floors, self.spawn_tables = floor_stats_solo, spawn_tables_solo
+        # the recorder baseline and the first group's column text are built on the pool;
+        # models, delegates and the group list are created once they are back
+        self.recorder = self.floor_model = self.spawn_model = None
+        floors, tables = self.floors, self.spawn_tables
+        set_loading(self, True)
+        self._job = load_in_background(self, lambda: _load_road(floors, tables), self._on_loaded)
+
+    def _on_loaded(self, data: dict):
+        self.recorder = SectionRecorder(self.mode, lambda: RoadSection(self.floors, self.spawn_tables),
+                                        baseline=data["baseline"])
+        self.floor_model = FloorStatsModel(self.floors, self)
         self.tv_floor.setModel(self.floor_model)
         # floor delegates
         self.tv_floor.setItemDelegateForColumn(0, IntDelegate(0, 99999, self.tv_floor))
@@ -136,10 +158,14 @@ class InAppEditor(QDialog):
         self.tv_floor.setItemDelegateForColumn(5, IntDelegate(0, 99999, self.tv_floor))
 
         # group combo + spawn table view
+        self.group_combo.blockSignals(True)
         self.group_combo.clear()
         self.group_combo.addItems([str(i) for i in range(len(self.spawn_tables))])
+        self.group_combo.blockSignals(False)
         self.group_combo.currentIndexChanged.connect(self._load_group)
-        self._load_group(0)
+        self._load_group(0, data["first_group"])
+        set_loading(self, False)
+        self.loaded.emit()
 
     def _install_spawn_delegates(self, table:QTableView):
         map_items = [
@@ -168,17 +194,26 @@ class InAppEditor(QDialog):
         table.setItemDelegateForColumn(6, IntDelegate(0, 999999, table))
         table.setItemDelegateForColumn(7, EnumDelegate(flag_items, parent=table))
 
-    def _load_group(self, idx:int):
+    def _load_group(self, idx:int, longest: dict[int, str] | None = None):
         if idx < 0 or idx >= len(self.spawn_tables): return
-        self.spawn_model = SpawnTableModel(self.spawn_tables[idx], self)
+        rows = self.spawn_tables[idx]
+        self.spawn_model = SpawnTableModel(rows, self)
         self.tv_spawn.setModel(self.spawn_model)
         self._install_spawn_delegates(self.tv_spawn)
 
-        # Make columns wider: FirstMonsterID (0), SecondMonsterID (2), Bonus Spawns (5)
+        # Make columns wider: FirstMonsterID (0), SecondMonsterID (2), Bonus Spawns (5).
+        # The others are sized from their longest text instead of measuring every row
+        # (resizeColumnToContents); the first group's text comes from the loader.
         hv = self.tv_spawn.horizontalHeader()
-        for col, width in ((0, 220), (2, 220), (5, 260)):
-            hv.setSectionResizeMode(col, QHeaderView.Interactive)
-            self.tv_spawn.setColumnWidth(col, width)
+        hv.setSectionResizeMode(QHeaderView.Interactive)
+        if longest is None:
+            longest = _longest_spawn_cells(rows)
+        fm = self.tv_spawn.fontMetrics()
+        for col in range(self.spawn_model.columnCount()):
+            if col in WIDE_SPAWN_COLUMNS:
+                self.tv_spawn.setColumnWidth(col, WIDE_SPAWN_COLUMNS[col])
+            else:
+                self.tv_spawn.setColumnWidth(col, max(hv.sectionSizeHint(col), fm.horizontalAdvance(longest[col]) + 16))
 
     def save_to_bin(self):
         out_path, _ = QFileDialog.getSaveFileName(self, "Save Rengoku Data File", "", "Binary Files (*.bin)")
@@ -189,6 +224,20 @@ class InAppEditor(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Saving failed:\n{e}")
 
+    def export_edits(self):
+        edits = self.recorder.edits()
+        if not edits:
+            QMessageBox.information(self, "No Edits", "Nothing has been changed since this editor was opened.")
+            return
+        out_path, _ = QFileDialog.getSaveFileName(self, "Export Edits", f"{self.mode}_road_edits.json",
+                                                  "JSON Files (*.json)")
+        if not out_path: return
+        try:
+            write_edits(edits, out_path)
+            QMessageBox.information(self, "Exported", f"Exported {len(edits)} edit(s) to {out_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export edits:\n{e}")
+
     def show_notes(self):
         dlg = QDialog(self)
         dlg.setWindowTitle("Variant Flags")
@@ -348,12 +397,7 @@ class ModeChooser(QDialog):
         self.setWindowTitle("Choose Road Type")
         self.setFixedSize(420, 400)
 
-        bg = QPixmap(str(ROOTDIR / "./asset/bg2.jpg"))
-        if not bg.isNull():
-            bg = bg.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-            tmp = QPixmap(bg.size()); tmp.fill(Qt.transparent)
-            p = QPainter(tmp); p.setOpacity(0.50); p.drawPixmap(0, 0, bg); p.end()
-            pal = self.palette(); pal.setBrush(QPalette.ColorRole.Window, QBrush(tmp)); self.setPalette(pal)
+        assets.set_background(self, "bg2.jpg", 0.50)
 
         v = QVBoxLayout(self)
         label = QLabel("Road Mode Selection", self)
@@ -0,0 +1,95 @@
+# ui/loader.py
+"""
+Background loading for the editors: run a function on QThreadPool.globalInstance()
+and get its result back on the GUI thread.
+
+  self._job = load_in_background(self, lambda: parse_catshop(path), self._on_loaded, self._on_load_failed)
+
+on_done(result) / on_error(message) are called on the GUI thread (queued through
+a signal). When `owner` finishes (QDialog.finished) or is destroyed first the job
+is cancelled: it is taken off the pool queue if it has not started, and its result
+is dropped if it has. Only plain data should be built in the function; Qt models
+and widgets belong to the GUI thread and are created in on_done.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtWidgets import QAbstractButton, QAbstractItemView
+
+# jobs between start() and the GUI-thread delivery of their result
+_running: set[BackgroundJob] = set()
+
+
+class _Signals(QObject):
+    finished = Signal(object, str)   # result, error ("" on success)
+
+
+class BackgroundJob(QRunnable):
+    def __init__(self, fn: Callable[[], object]):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.signals = _Signals()   # created on the GUI thread, so delivery is queued there
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+        if QThreadPool.globalInstance().tryTake(self):
+            _running.discard(self)   # never started, so finished will not be emitted
+
+    def run(self) -> None:
+        result, error = None, ""
+        if not self.cancelled:
+            try:
+                result = self.fn()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        self.signals.finished.emit(None if self.cancelled else result, error)
+
+
+def load_in_background(
+    owner: QObject,
+    fn: Callable[[], object],
+    on_done: Callable[[object], None],
+    on_error: Callable[[str], None] | None = None,
+) -> BackgroundJob:
+    """Start `fn` on the global thread pool; see the module docstring."""
+    job = BackgroundJob(fn)
+
+    def deliver(result, error):
+        _running.discard(job)
+        if job.cancelled:
+            return
+        if error:
+            if on_error:
+                on_error(error)
+        else:
+            on_done(result)
+
+    job.signals.finished.connect(deliver, Qt.QueuedConnection)
+    if hasattr(owner, "finished"):
+        owner.finished.connect(job.cancel)
+    owner.destroyed.connect(job.cancel)
+    _running.add(job)
+    QThreadPool.globalInstance().start(job)
+    return job
+
+
+def set_loading(widget, loading: bool) -> None:
+    """Grey out the buttons and tables of `widget`, with a busy cursor and title, while its data loads."""
+    for child in widget.findChildren(QAbstractButton) + widget.findChildren(QAbstractItemView):
+        child.setEnabled(not loading)
+    if loading:
+        widget._title_before_loading = widget.windowTitle()
+        widget.setCursor(Qt.BusyCursor)
+        widget.setWindowTitle(f"{widget._title_before_loading} — loading…")
+    else:
+        widget.unsetCursor()
+        widget.setWindowTitle(getattr(widget, "_title_before_loading", widget.windowTitle()))
@@ -7,13 +7,16 @@ from PySide6.QtWidgets import (
     QTableView, QHeaderView, QAbstractItemView, QHBoxLayout,
     QPushButton, QFileDialog, QMessageBox, QGraphicsDropShadowEffect
 )
-from PySide6.QtGui import QPixmap, QPainter, QPalette, QBrush, QColor
+from PySide6.QtGui import QColor
 
-from core.paths import ROOTDIR
+import copy
+
+from ui.loader import load_in_background, set_loading
 from ui.utils import apply_dialog_background
 from core.medalshop_io import parse_medal_shop, save_medal_shop, MedalItem
 from .models import IntDelegate
 from ui.catshop_editor import ItemListDialog, load_item_names
+from core.semantic_patch import MEDALSHOP, SectionRecorder, write_edits
 from core.json_io import medalshop_to_json, medalshop_from_json
 
 
@@ -114,37 +117,31 @@ class MedalShopModel(QAbstractTableModel):
         self.counter_changed.emit()
 
 
+def _load_medal_shop(mhfdat_path: str) -> dict:
+    """Loader thread: item names, parsed shop and the edit-recorder baseline."""
+    parsed = parse_medal_shop(mhfdat_path)
+    return {"names": load_item_names(), "parsed": parsed,
+            "baseline": copy.deepcopy(parsed.rows) if parsed is not None else None}
+
+
 class MedalShopEditor(QDialog):
+    """Tower Medal Shop editor: opens immediately; the shop and item names load on the thread pool."""
+    loaded = Signal()
+
     def __init__(self, mhfdat_path: str, mhfdat_parsed: dict, *, parent=None):
         super().__init__(parent=parent)
         self.setModal(True)
         self.setWindowTitle("Tower Medal Shop Editor")
         self.resize(900, 650)
 
-        try:
-            apply_dialog_background(self, image_name="bg2.jpg", opacity=0.65)
-        except Exception:
-            bg = QPixmap(str(ROOTDIR / "asset" / "bg2.jpg"))
-            if not bg.isNull():
-                bg = bg.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-                tmp = QPixmap(bg.size())
-                tmp.fill(Qt.transparent)
-                p = QPainter(tmp)
-                p.setOpacity(0.65)
-                p.drawPixmap(0, 0, bg)
-                p.end()
-                pal = self.palette()
-                pal.setBrush(QPalette.ColorRole.Window, QBrush(tmp))
-                self.setPalette(pal)
+        apply_dialog_background(self, image_name="bg2.jpg", opacity=0.65)
 
         self.mhfdat_path = mhfdat_path
-        self.parsed = parse_medal_shop(mhfdat_path)
-        if self.parsed is None:
-            QMessageBox.critical(self, "Error", "Failed to parse Medal Shop data.")
-            self.close()
-            return
+        self.parsed = None
+        self.recorder = None
+        self.id_to_name: dict[int, str] = {}
+        self.model = None
 
-        self.id_to_name = load_item_names()
         main = QVBoxLayout(self)
 
         # Header
@@ -179,10 +176,6 @@ class MedalShopEditor(QDialog):
         self._style_table(self.table)
         main.addWidget(self.table, 1)
 
-        self.model = MedalShopModel(self.parsed.rows, self.id_to_name, self)
-        self.table.setModel(self.model)
-        self.model.counter_changed.connect(self._refresh_counter)
-
         # Delegates
         self.table.setItemDelegateForColumn(0, IntDelegate(0, 0xFFFF, self.table))  # Item
         self.table.setItemDelegateForColumn(4, IntDelegate(0, 0xFFFF, self.table))  # Price
@@ -215,6 +208,10 @@ class MedalShopEditor(QDialog):
         self.btn_import_json.clicked.connect(self._import_json)
         btn_row.addWidget(self.btn_import_json)
 
+        self.btn_export_edits = QPushButton("Export Edits", self)
+        self.btn_export_edits.clicked.connect(self._export_edits)
+        btn_row.addWidget(self.btn_export_edits)
+
         self.btn_save = QPushButton("Save", self)
         self.btn_save.clicked.connect(self._save)
         btn_row.addWidget(self.btn_save)
@@ -222,7 +219,28 @@ class MedalShopEditor(QDialog):
         btn_row.addStretch(1)
         main.addLayout(btn_row)
 
+        self.spn_counter.setText("…")
+        set_loading(self, True)
+        self._job = load_in_background(self, lambda: _load_medal_shop(mhfdat_path),
+                                       self._on_loaded, self._on_load_failed)
+
+    def _on_loaded(self, data: dict):
+        if data["parsed"] is None:
+            self._on_load_failed("Failed to parse Medal Shop data.")
+            return
+        self.id_to_name = data["names"]
+        self.parsed = data["parsed"]
+        self.recorder = SectionRecorder(MEDALSHOP, lambda: self.parsed.rows, baseline=data["baseline"])
+        self.model = MedalShopModel(self.parsed.rows, self.id_to_name, self)
+        self.table.setModel(self.model)
+        self.model.counter_changed.connect(self._refresh_counter)
         self._refresh_counter()
+        set_loading(self, False)
+        self.loaded.emit()
+
+    def _on_load_failed(self, message: str):
+        QMessageBox.critical(self, "Error", message)
+        self.reject()
 
     def _style_table(self, tv: QTableView):
         tv.setAlternatingRowColors(True)
@@ -307,6 +325,20 @@ class MedalShopEditor(QDialog):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to import JSON:\n{e}")
 
+    def _export_edits(self):
+        edits = self.recorder.edits()
+        if not edits:
+            QMessageBox.information(self, "No Edits", "Nothing has been changed since this editor was opened.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Edits", "medalshop_edits.json", "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            write_edits(edits, path)
+            QMessageBox.information(self, "Exported", f"Exported {len(edits)} edit(s) to {path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export edits:\n{e}")
+
     def _save(self):
         for mi in self.parsed.rows:
             if mi.price <= 0:
@@ -5,11 +5,11 @@ from PySide6.QtGui import QPainter
 from .styles import app_stylesheet  # just to ensure module is imported when needed
 # ---- import fallback so this module also works if run outside project root ----
 try:
-    from core.constants import MONSTERS  # normal import when run from project root
+    from core.constants import MONSTERS, MONSTER_IDS, monster_id  # normal import when run from project root
 except Exception:  # pragma: no cover
     import sys, pathlib
     sys.path.append(str(pathlib.Path(__file__).resolve().parents[1]))  # add project root
-    from core.constants import MONSTERS
+    from core.constants import MONSTERS, MONSTER_IDS, monster_id
 # ----------------------------------------------------------------------------
 
 DROPDOWN_STYLE = """
@@ -134,8 +134,7 @@ class SpawnTableModel(QAbstractTableModel):
         obj = self.rows[index.row()]; col = self.COLS[index.column()]
         try:
             if col in ("FirstMonsterID","SecondMonsterID"):
-                if isinstance(value, str):
-                    value = MONSTERS.index(value) if not value.isdigit() else int(value)
+                value = monster_id(value)
             else:
                 value = int(value)
             setattr(obj, col, value)
@@ -158,7 +157,7 @@ class MonsterDelegate(QStyledItemDelegate):
             if isinstance(current, int):
                 editor.setCurrentIndex(current if 0 <= current < len(MONSTERS) else 0)
             else:
-                editor.setCurrentIndex(MONSTERS.index(str(current)))
+                editor.setCurrentIndex(MONSTER_IDS.get(str(current), 0))
         except Exception:
             editor.setCurrentIndex(0)
     def setModelData(self, editor, model, index):
@@ -1,12 +1,13 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QHBoxLayout, QPushButton,
                                QTableView, QGroupBox, QAbstractItemView, QHeaderView,
-                               QFileDialog,QGraphicsDropShadowEffect, QSpinBox, QWidget, QFormLayout)
+                               QFileDialog,QGraphicsDropShadowEffect, QSpinBox, QWidget, QFormLayout,
+                               QMessageBox)
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap, QPainter, QPalette, QBrush, QColor
+from PySide6.QtGui import QColor
 from ui.utils import apply_dialog_background
-from core.paths import ROOTDIR
-from core.constants import MONSTERS
+from core.constants import MONSTERS, monster_id
 from core.mhfdat_io import parse_mhfdat, save_mhfdat, MonsterPoints
+from core.semantic_patch import MONSTER, SectionRecorder, write_edits
 from .models import SpawnTableModel, IntDelegate, FloatDelegate, MonsterDelegate  # reuse delegates
 from .models import EDITOR_TEXT_STYLE  # cyan editing
 
@@ -56,8 +57,7 @@ class MonsterPointsModel(SpawnTableModel):
         coln = self.COLS[index.column()]
         try:
             if coln == "monster_id":
-                if isinstance(value, str):
-                    value = MONSTERS.index(value) if not value.isdigit() else int(value)
+                value = monster_id(value)
             else:
                 value = int(value)
             setattr(obj, coln, value)
@@ -79,16 +79,9 @@ class MonsterPointsEditor(QDialog):
         self.setWindowFlags(Qt.Window | Qt.WindowCloseButtonHint | Qt.WindowMinimizeButtonHint |
                             Qt.WindowMaximizeButtonHint | Qt.WindowTitleHint)
 
-        # background
-        bg = QPixmap(str(ROOTDIR / "asset" / "bg2.jpg"))
-        if not bg.isNull():
-            bg = bg.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-            tmp = QPixmap(bg.size()); tmp.fill(Qt.transparent)
-            p = QPainter(tmp); p.setOpacity(0.65); p.drawPixmap(0, 0, bg); p.end()
-            pal = self.palette(); pal.setBrush(QPalette.ColorRole.Window, QBrush(tmp)); self.setPalette(pal)
-
         self.mhfdat_path = mhfdat_path
         self.parsed = parsed
+        self.recorder = SectionRecorder(MONSTER, lambda: self.parsed['monster_rows'])
 
         layout = QVBoxLayout(self)
         header = QLabel("Monster Points Editor", self)
@@ -133,6 +126,9 @@ class MonsterPointsEditor(QDialog):
         self.btn_delete = QPushButton("Delete Selected", self)
         self.btn_delete.clicked.connect(self._delete_selected)
         btns.addWidget(self.btn_delete)
+        self.btn_edits = QPushButton("Export Edits", self)
+        self.btn_edits.clicked.connect(self._export_edits)
+        btns.addWidget(self.btn_edits)
         self.btn_save = QPushButton("Save", self)
         self.btn_save.clicked.connect(self._save)
         btns.addWidget(self.btn_save)
@@ -205,6 +201,21 @@ class MonsterPointsEditor(QDialog):
             self._refresh_model()
             self._update_road_entries_label()  # ← add this
 
+    def _export_edits(self):
+        edits = self.recorder.edits()
+        if not edits:
+            QMessageBox.information(self, "No Edits", "Nothing has been changed since this editor was opened.")
+            return
+        out_path, _ = QFileDialog.getSaveFileName(self, "Export Edits", "monster_points_edits.json",
+                                                  "JSON Files (*.json)")
+        if not out_path:
+            return
+        try:
+            write_edits(edits, out_path)
+            QMessageBox.information(self, "Exported", f"Exported {len(edits)} edit(s) to {out_path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export edits:\n{e}")
+
     def _save(self):
         # sync in-memory counters before writing
         self.parsed['counters'].RoadEntries = self._computed_road_entries()
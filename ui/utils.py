@@ -1,41 +1,29 @@
 # ui/utils.py
-from PySide6.QtCore import Qt, QSize
-from PySide6.QtGui import QPixmap, QPalette, QBrush
-from core.paths import resource_path
+from PySide6.QtCore import QTimer
+from ui import assets
+
+RESIZE_SETTLE_MS = 120   # smooth rescale once a drag has paused this long
 
 def apply_dialog_background(dialog, image_name="bg3.jpg", opacity=0.65):
     """
     Paint a scaled background image on a QDialog (resizes with the dialog).
+    While the dialog is being resized the background is fast-scaled; the smooth
+    version is rendered once the size settles and cached per size (ui/assets.py).
     """
-    dialog.setAutoFillBackground(True)
-
-    # load & scale
-    pix = QPixmap(str(resource_path("asset", image_name)))
-    if pix.isNull():
+    if not assets.set_background(dialog, image_name, opacity):
         return  # silently skip if missing
 
-    scaled = pix.scaled(dialog.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
-
-    if 0.0 <= opacity < 1.0:
-        tmp = QPixmap(scaled.size())
-        tmp.fill(Qt.transparent)
-        from PySide6.QtGui import QPainter
-        p = QPainter(tmp)
-        p.setOpacity(opacity)
-        p.drawPixmap(0, 0, scaled)
-        p.end()
-        scaled = tmp
-
-    pal = dialog.palette()
-    pal.setBrush(QPalette.Window, QBrush(scaled))
-    dialog.setPalette(pal)
-
     # attach a lightweight resize handler so it keeps fitting
     if not hasattr(dialog, "_bg_resize_installed"):
         dialog._bg_resize_installed = True
+        settle = QTimer(dialog)
+        settle.setSingleShot(True)
+        settle.setInterval(RESIZE_SETTLE_MS)
+        settle.timeout.connect(lambda: assets.set_background(dialog, image_name, opacity))
         orig_resize = dialog.resizeEvent
         def _resizeEvent(e):
-            apply_dialog_background(dialog, image_name=image_name, opacity=opacity)
+            assets.set_background(dialog, image_name, opacity, smooth=False)
+            settle.start()
             if callable(orig_resize):
                 orig_resize(e)
         dialog.resizeEvent = _resizeEvent